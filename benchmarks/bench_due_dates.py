@@ -0,0 +1,119 @@
+# bench_due_dates.py
+#
+# مقایسه هزینه هر ردیف برای محاسبه وضعیت سررسید:
+#   legacy: روش قبلی (تجزیه دوباره due_date و فراخوانی datetime.now در هر متد)
+#   per-task: متدهای فعلی Task بدون تاریخ مرجع مشترک
+#   batch: classify_due_dates با یک تاریخ مرجع برای کل لیست
+#
+# اجرا:  python benchmarks/bench_due_dates.py --tasks 100000
+
+import argparse
+import os
+import random
+import sys
+import time
+from datetime import date, datetime, timedelta
+
+sys.path.insert(0, os.path.dirname(os.path.dirname(os.path.abspath(__file__))))
+
+from todo_app.logic import Task, classify_due_dates  # noqa: E402
+
+
+def legacy_row(task):
+    """شبیه‌سازی محاسبات هر ردیف در TaskListFrame.refresh پیش از کش تاریخ‌ها."""
+
+    def parse_due():
+        return datetime.fromisoformat(task.due_date).date()
+
+    def is_overdue():
+        if not task.due_date or task.is_completed():
+            return False
+        try:
+            return parse_due() < datetime.now().date()
+        except (ValueError, TypeError):
+            return False
+
+    def is_due_today():
+        if not task.due_date or task.is_completed():
+            return False
+        try:
+            return parse_due() == datetime.now().date()
+        except (ValueError, TypeError):
+            return False
+
+    def formatted():
+        if not task.due_date:
+            return ""
+        try:
+            delta = (parse_due() - datetime.now().date()).days
+        except (ValueError, TypeError):
+            return task.due_date
+        if delta == 0:
+            return "امروز"
+        if delta == 1:
+            return "فردا"
+        if delta == -1:
+            return "دیروز"
+        if 0 < delta <= 7:
+            return f"{delta} روز دیگر"
+        if -7 <= delta < 0:
+            return f"{abs(delta)} روز پیش"
+        return task.due_date
+
+    def due_status():
+        if not task.due_date or task.is_completed():
+            return "-"
+        if is_overdue():
+            return "دیرکرد"
+        if is_due_today():
+            return "امروز"
+        return ""
+
+    label = formatted()
+    status = due_status()
+    return is_overdue(), (not is_overdue() and is_due_today()), label, status
+
+
+def per_task_row(task):
+    return task.is_overdue(), task.is_due_today(), task.get_formatted_due_date(), task.get_due_status()
+
+
+def make_tasks(count, seed=42):
+    rng = random.Random(seed)
+    today = date.today()
+    tasks = []
+    for i in range(count):
+        due = today + timedelta(days=rng.randint(-30, 30)) if rng.random() < 0.8 else None
+        tasks.append(Task(
+            name=f"کار {i}",
+            description="",
+            priority="متوسط",
+            status="انجام شده" if rng.random() < 0.3 else "انجام نشده",
+            due_date=due.isoformat() if due else None,
+        ))
+    return tasks
+
+
+def measure(label, func, count):
+    start = time.perf_counter()
+    func()
+    elapsed = time.perf_counter() - start
+    print(f"{label:<10} {elapsed * 1000:10.1f} ms   {elapsed / count * 1e6:8.2f} µs/row")
+    return elapsed
+
+
+def main():
+    parser = argparse.ArgumentParser(description="بنچمارک محاسبه وضعیت سررسید")
+    parser.add_argument("--tasks", type=int, default=100_000)
+    args = parser.parse_args()
+
+    tasks = make_tasks(args.tasks)
+    print(f"{args.tasks} کار")
+    legacy = measure("legacy", lambda: [legacy_row(t) for t in tasks], args.tasks)
+    measure("per-task", lambda: [per_task_row(t) for t in tasks], args.tasks)
+    batch = measure("batch", lambda: classify_due_dates(tasks), args.tasks)
+    print(f"speedup    {legacy / batch:10.1f}x")
+
+
+if __name__ == "__main__":
+    main()
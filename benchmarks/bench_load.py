@@ -0,0 +1,101 @@
+# bench_load.py
+#
+# زمان بارگذاری ToDoList از یک فایل CSV بزرگ (پیش‌فرض ۱۰۰ هزار کار).
+# ردیف‌ها با RowDecoder (نگاشت ستون‌ها از روی هدر) تبدیل می‌شوند و
+# یادداشت‌ها و الگوی تکرار تا اولین دسترسی رمزگشایی نمی‌شوند؛ زمان دسترسی
+# به همه یادداشت‌ها هم جداگانه گزارش می‌شود.
+#
+# اجرا:  python benchmarks/bench_load.py --tasks 100000 --output results.jsonl
+
+import argparse
+import base64
+import csv
+import json
+import os
+import random
+import sys
+import tempfile
+import time
+from datetime import date, timedelta
+
+sys.path.insert(0, os.path.dirname(os.path.dirname(os.path.abspath(__file__))))
+
+from todo_app.logic import ToDoList  # noqa: E402
+from todo_app.storage import CSV_HEADER  # noqa: E402
+
+PRIORITIES = ["پایین", "متوسط", "بالا"]
+STATUSES = ["انجام نشده", "انجام شده"]
+CATEGORIES = ["بدون دسته", "کاری", "شخصی", "خانه", "خرید", "مطالعه"]
+
+
+def write_file(path, count, seed=3):
+    """یک فایل CSV با count کار در فرمت کامل می‌نویسد."""
+    rng = random.Random(seed)
+    today = date.today()
+    with open(path, mode="w", newline="", encoding="utf-8-sig") as file:
+        writer = csv.writer(file)
+        writer.writerow(CSV_HEADER)
+        for i in range(count):
+            due = today + timedelta(days=rng.randint(-30, 30))
+            recurring = rng.random() < 0.1
+            notes = f"یادداشت کار {i}\nخط دوم" if rng.random() < 0.5 else ""
+            writer.writerow([
+                f"{1700000000000 + i}_{rng.getrandbits(32):08x}",
+                f"کار شماره {i}",
+                "توضیحات کوتاه",
+                rng.choice(PRIORITIES),
+                rng.choice(STATUSES),
+                "",
+                due.isoformat() if rng.random() < 0.7 else "",
+                rng.choice(CATEGORIES),
+                "",
+                "",
+                "True" if recurring else "False",
+                "weekly" if recurring else "",
+                "1" if recurring else "",
+                "0,2,4" if recurring else "",
+                "",
+                base64.b64encode(notes.encode("utf-8")).decode("utf-8") if notes else "",
+            ])
+
+
+def main():
+    parser = argparse.ArgumentParser(description="بنچمارک بارگذاری فایل کارها")
+    parser.add_argument("--tasks", type=int, default=100_000)
+    parser.add_argument("--repeat", type=int, default=3)
+    parser.add_argument("--output", help="افزودن نتیجه (JSON) به انتهای این فایل")
+    args = parser.parse_args()
+
+    with tempfile.TemporaryDirectory() as directory:
+        path = os.path.join(directory, "tasks.csv")
+        write_file(path, args.tasks)
+
+        load_times = []
+        for _ in range(args.repeat):
+            start = time.perf_counter()
+            todo_list = ToDoList(path)
+            load_times.append(time.perf_counter() - start)
+        assert len(todo_list.tasks) == args.tasks
+
+        start = time.perf_counter()
+        for task in todo_list.tasks:
+            task.notes
+            task.recurrence_pattern
+        decode_time = time.perf_counter() - start
+
+    best = min(load_times)
+    result = {
+        "benchmark": "load",
+        "tasks": args.tasks,
+        "load_seconds": round(best, 4),
+        "us_per_row": round(best / args.tasks * 1e6, 2),
+        "lazy_decode_seconds": round(decode_time, 4),
+    }
+    print(json.dumps(result, ensure_ascii=False))
+    if args.output:
+        with open(args.output, mode="a", encoding="utf-8") as file:
+            file.write(json.dumps(result, ensure_ascii=False) + "\n")
+
+
+if __name__ == "__main__":
+    main()
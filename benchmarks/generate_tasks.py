@@ -0,0 +1,150 @@
+# generate_tasks.py
+#
+# تولید قطعی (با seed ثابت) فایل‌های tasks.csv واقعی‌نما برای بنچمارک‌ها:
+# نام و توضیحات فارسی، سلسله‌مراتب عمیق زیرکارها، کارهای تکرارشونده،
+# یادداشت‌های base64 و درصدی ردیف قدیمی ۴ و ۵ ستونی در میان ردیف‌ها.
+#
+# اجرا:  python benchmarks/generate_tasks.py --tasks 100000 --output tasks.csv
+
+import argparse
+import base64
+import csv
+import os
+import random
+import sys
+from datetime import date, datetime, timedelta
+
+sys.path.insert(0, os.path.dirname(os.path.dirname(os.path.abspath(__file__))))
+
+from todo_app.storage import CSV_HEADER  # noqa: E402
+
+# تاریخ مرجع ثابت تا خروجی به روز اجرا وابسته نباشد
+REFERENCE_DATE = date(2025, 6, 1)
+
+PRIORITIES = ["پایین", "متوسط", "بالا"]
+STATUSES = ["انجام نشده", "انجام شده"]
+CATEGORIES = ["بدون دسته", "کاری", "شخصی", "خانه", "خرید", "مطالعه"]
+VERBS = ["خرید", "نوشتن", "بررسی", "تماس با", "پرداخت", "مطالعه", "تمیز کردن", "ارسال", "آماده‌سازی", "پیگیری"]
+OBJECTS = [
+    "گزارش ماهانه", "نان و شیر", "قبض برق", "کتاب تاریخ", "ایمیل مدیر", "اتاق نشیمن",
+    "جلسه تیم", "بلیت قطار", "پروژه نهایی", "دکتر", "هدیه تولد", "مقاله پژوهشی",
+]
+DESCRIPTION_WORDS = [
+    "قبل", "از", "جلسه", "فردا", "حتماً", "با", "دقت", "انجام", "شود", "و", "نتیجه",
+    "به", "تیم", "اطلاع", "داده", "شود", "در", "صورت", "نیاز", "هماهنگ", "کنید",
+]
+NOTE_LINES = [
+    "# یادداشت", "- مورد اول", "- مورد دوم", "**مهم:** تا آخر هفته", "شماره تماس: ۰۹۱۲۰۰۰۰۰۰۰",
+]
+RECURRENCE_TYPES = ["daily", "weekly", "monthly"]
+TAGS = ["فوری", "مهم", "بعدا", "پیگیری", "تلفنی", "بیرون", "منتظر", "ایده"]
+
+
+def generate_rows(count, seed=1, legacy_ratio=0.05, subtask_ratio=0.3, max_depth=6):
+    """count ردیف CSV تولید می‌کند؛ با seed یکسان خروجی همیشه یکسان است.
+
+    legacy_ratio: سهم ردیف‌های قدیمی ۴ و ۵ ستونی (بدون شناسه و زیرکار)
+    subtask_ratio: سهم کارهایی که زیرکار یک کار قبلی هستند
+    max_depth: بیشترین عمق زنجیره زیرکارها
+    """
+    rng = random.Random(seed)
+    # (شناسه، عمق، تعداد زیرکارها) برای کارهایی که می‌توانند والد باشند
+    parents = []
+    for i in range(count):
+        name = f"{rng.choice(VERBS)} {rng.choice(OBJECTS)} {i}"
+        description = " ".join(rng.choices(DESCRIPTION_WORDS, k=rng.randint(0, 12)))
+        priority = rng.choice(PRIORITIES)
+        status = STATUSES[1] if rng.random() < 0.4 else STATUSES[0]
+        completion_date = ""
+        if status == STATUSES[1]:
+            completed_at = datetime.combine(REFERENCE_DATE, datetime.min.time()) - timedelta(
+                minutes=rng.randint(0, 60 * 24 * 90)
+            )
+            completion_date = completed_at.isoformat()
+
+        if rng.random() < legacy_ratio:
+            row = [name, description, priority, status]
+            if rng.random() < 0.5:
+                row.append(completion_date)
+            yield row
+            continue
+
+        task_id = f"{1700000000000 + i}_{i:08x}"
+        due_date = ""
+        if rng.random() < 0.6:
+            due_date = (REFERENCE_DATE + timedelta(days=rng.randint(-60, 60))).isoformat()
+
+        parent_id = ""
+        subtask_order = ""
+        depth = 0
+        if parents and rng.random() < subtask_ratio:
+            # والدهای اخیر را ترجیح می‌دهد تا زنجیره‌های عمیق ساخته شوند
+            slot = len(parents) - 1 - min(int(rng.expovariate(0.5)), len(parents) - 1)
+            parent_id, parent_depth, children = parents[slot]
+            parents[slot] = (parent_id, parent_depth, children + 1)
+            subtask_order = str(children)
+            depth = parent_depth + 1
+        if depth < max_depth:
+            parents.append((task_id, depth, 0))
+            if len(parents) > 1000:
+                del parents[:500]
+
+        is_recurring = not parent_id and rng.random() < 0.1
+        recurrence = ["", "", "", ""]
+        if is_recurring:
+            recurrence_type = rng.choice(RECURRENCE_TYPES)
+            recurrence = [
+                recurrence_type,
+                str(rng.randint(1, 3)),
+                ",".join(str(d) for d in sorted(rng.sample(range(7), 2))) if recurrence_type == "weekly" else "",
+                (REFERENCE_DATE + timedelta(days=365)).isoformat() if rng.random() < 0.3 else "",
+            ]
+
+        notes = ""
+        if rng.random() < 0.25:
+            text = "\n".join(rng.choices(NOTE_LINES, k=rng.randint(1, 5)))
+            notes = base64.b64encode(text.encode("utf-8")).decode("utf-8")
+
+        tags = ",".join(rng.sample(TAGS, min(int(rng.expovariate(1.2)), 3)))
+
+        yield [
+            task_id,
+            name,
+            description,
+            priority,
+            status,
+            completion_date,
+            due_date,
+            rng.choice(CATEGORIES),
+            parent_id,
+            subtask_order,
+            "True" if is_recurring else "False",
+            *recurrence,
+            notes,
+            tags,
+        ]
+
+
+def write_tasks_csv(path, count, seed=1, **options):
+    """فایل tasks.csv با count کار (همراه با هدر و BOM) می‌نویسد."""
+    with open(path, mode="w", newline="", encoding="utf-8-sig") as file:
+        writer = csv.writer(file)
+        writer.writerow(CSV_HEADER)
+        writer.writerows(generate_rows(count, seed, **options))
+    return path
+
+
+def main():
+    parser = argparse.ArgumentParser(description="تولید فایل کارهای آزمایشی")
+    parser.add_argument("--tasks", type=int, default=10_000)
+    parser.add_argument("--seed", type=int, default=1)
+    parser.add_argument("--legacy-ratio", type=float, default=0.05)
+    parser.add_argument("--output", default="tasks.csv")
+    args = parser.parse_args()
+
+    write_tasks_csv(args.output, args.tasks, args.seed, legacy_ratio=args.legacy_ratio)
+    print(f"{args.tasks} کار در {args.output} نوشته شد.")
+
+
+if __name__ == "__main__":
+    main()
@@ -0,0 +1,81 @@
+# memory_report.py
+#
+# گزارش حافظه مصرفی به ازای هر کار برای لیست‌های بزرگ.
+# برای مقایسه، همان داده‌ها با یک کلاس ساده مبتنی بر __dict__ (مانند Task قبلی
+# با لیست زیرکار جداگانه و رشته‌های غیرمشترک) هم اندازه‌گیری می‌شوند.
+#
+# اجرا:  python benchmarks/memory_report.py --sizes 10000 100000 1000000
+
+import argparse
+import gc
+import os
+import random
+import sys
+import tracemalloc
+
+sys.path.insert(0, os.path.dirname(os.path.dirname(os.path.abspath(__file__))))
+
+from todo_app.logic import Task  # noqa: E402
+
+PRIORITIES = ["پایین", "متوسط", "بالا"]
+STATUSES = ["انجام نشده", "انجام شده"]
+CATEGORIES = ["بدون دسته", "کاری", "شخصی", "خانه", "خرید", "مطالعه"]
+
+
+class DictTask:
+    """کار مبتنی بر __dict__ با همان فیلدها (مبنای مقایسه)."""
+
+    def __init__(self, **fields):
+        self.__dict__.update(fields)
+        self.subtasks = []
+
+
+def _fresh(value):
+    # شبیه‌سازی رشته‌ای که از فایل CSV خوانده شده است (نمونه جدید برای هر ردیف)
+    return "".join(list(value))
+
+
+def make_fields(count, seed=7):
+    rng = random.Random(seed)
+    for i in range(count):
+        yield dict(
+            task_id=f"{1700000000000 + i}_{rng.getrandbits(32):08x}",
+            name=f"کار شماره {i}",
+            description="توضیحات کوتاه",
+            priority=_fresh(rng.choice(PRIORITIES)),
+            status=_fresh(rng.choice(STATUSES)),
+            category=_fresh(rng.choice(CATEGORIES)),
+            due_date=None,
+            completion_date=None,
+        )
+
+
+def measure(factory, count):
+    """حافظه مصرفی ساخت count کار با factory را برمی‌گرداند (بایت)."""
+    gc.collect()
+    tracemalloc.start()
+    tasks = [factory(fields) for fields in make_fields(count)]
+    current, _ = tracemalloc.get_traced_memory()
+    tracemalloc.stop()
+    del tasks
+    gc.collect()
+    return current
+
+
+def main():
+    parser = argparse.ArgumentParser(description="گزارش حافظه به ازای هر کار")
+    parser.add_argument("--sizes", type=int, nargs="+", default=[10_000, 100_000, 1_000_000])
+    args = parser.parse_args()
+
+    print(f"{'tasks':>10} {'dict B/task':>12} {'slots B/task':>13} {'saving':>8}")
+    for size in args.sizes:
+        dict_bytes = measure(lambda fields: DictTask(**fields), size)
+        slots_bytes = measure(lambda fields: Task(**fields), size)
+        print(
+            f"{size:>10} {dict_bytes / size:>12.0f} {slots_bytes / size:>13.0f} "
+            f"{1 - slots_bytes / dict_bytes:>7.0%}"
+        )
+
+
+if __name__ == "__main__":
+    main()
@@ -0,0 +1,273 @@
+# run_suite.py
+#
+# مجموعه بنچمارک عملیات اصلی ToDoList (و ساخت ردیف‌های TaskListFrame) بدون
+# نیاز به نمایشگر. برای هر اندازه یک فایل قطعی با generate_tasks ساخته می‌شود
+# و نتایج به صورت JSON ذخیره می‌شوند تا اجراهای مختلف قابل مقایسه باشند.
+#
+# اجرا:
+#   python benchmarks/run_suite.py --sizes 1000 10000 100000 1000000 --output results.json
+#   python benchmarks/run_suite.py --sizes 10000 --compare results.json
+
+import argparse
+import gc
+import importlib.util
+import json
+import os
+import platform
+import random
+import shutil
+import subprocess
+import sys
+import tempfile
+import time
+from datetime import datetime, timedelta
+
+sys.path.insert(0, os.path.dirname(os.path.dirname(os.path.abspath(__file__))))
+
+from generate_tasks import REFERENCE_DATE, write_tasks_csv  # noqa: E402
+from todo_app.charts import dashboard_data  # noqa: E402
+from todo_app.logic import ToDoList  # noqa: E402
+from todo_app.notes import NotesRenderer  # noqa: E402
+from todo_app.storage import create_storage  # noqa: E402
+
+
+def _timed(func):
+    gc.collect()
+    start = time.perf_counter()
+    func()
+    return time.perf_counter() - start
+
+
+def _row_builder():
+    """TaskListFrame._build_rows بدون ساخت ویجت؛ اگر رابط کاربری در دسترس نباشد None."""
+    try:
+        from todo_app.app import TaskListFrame
+    except ImportError:
+        return None
+    frame = TaskListFrame.__new__(TaskListFrame)
+    frame.colored_tags = frozenset(("فوری", "مهم"))
+    return frame._build_rows
+
+
+class Suite:
+    """اجرای عملیات روی یک فایل تولید شده در یک پوشه موقت."""
+
+    def __init__(self, directory, size, seed, storage_kind, ops):
+        self.directory = directory
+        self.size = size
+        self.storage_kind = storage_kind
+        self.ops = ops
+        self.rng = random.Random(seed)
+        self.source = write_tasks_csv(os.path.join(directory, "source.csv"), size, seed)
+        self.results = []
+
+    def _fresh_list(self, load=True):
+        """یک کپی تازه از فایل تولید شده را بارگذاری می‌کند (بدون زمان‌گیری)."""
+        path = os.path.join(self.directory, "tasks.csv")
+        for name in os.listdir(self.directory):
+            if name.startswith("tasks."):
+                os.remove(os.path.join(self.directory, name))
+        shutil.copyfile(self.source, path)
+        return ToDoList(path, storage=create_storage(path, self.storage_kind, save_delay=0), load=load)
+
+    def record(self, operation, seconds, ops=1):
+        result = {
+            "operation": operation,
+            "tasks": self.size,
+            "ops": ops,
+            "seconds": round(seconds, 6),
+            "ms_per_op": round(seconds / ops * 1000, 4),
+        }
+        self.results.append(result)
+        print(f"{self.size:>9} {operation:<32} {result['ms_per_op']:>12.3f} ms/op  ({ops} ops)")
+
+    def run(self):
+        # بارگذاری تدریجی هنگام راه‌اندازی: طولانی‌ترین مرحله، بیشترین توقف رابط کاربری است
+        todo_list = self._fresh_list(load=False)
+        steps = []
+        loader = todo_list.load_steps()
+        finished = False
+        while not finished:
+            start = time.perf_counter()
+            finished = next(loader, None) is None
+            steps.append(time.perf_counter() - start)
+        todo_list.close()
+        self.record("load_steps (slowest step)", max(steps))
+
+        holder = {}
+
+        self.record("_load_tasks", _timed(lambda: holder.setdefault("list", self._fresh_list())))
+        todo_list = holder["list"]
+
+        build_rows = _row_builder()
+        if build_rows is not None:
+            self.record("TaskListFrame._build_rows", _timed(lambda: build_rows(todo_list.tasks)))
+
+        self.record("_save_tasks", _timed(todo_list._save_tasks))
+
+        self.record("search_index build", _timed(lambda: todo_list.search_index.build_step(len(todo_list.tasks))))
+        queries = ["ب", "بر", "برر", "بررسی", "بررسی گ", "بررسی گزارش", "۱", "۱۲"]
+        self.record(
+            "search (per keystroke)",
+            _timed(lambda: [todo_list.search(query) for query in queries]),
+            len(queries),
+        )
+
+        self.record("indexes build", _timed(lambda: todo_list.indexes))
+        week = (REFERENCE_DATE, REFERENCE_DATE + timedelta(days=6))
+        self.record(
+            "filter_tasks (high, work, week)",
+            _timed(lambda: todo_list.filter_tasks(
+                priority="بالا", category="کاری", due_from=week[0], due_to=week[1]
+            )),
+        )
+
+        self.record("tag_index build", _timed(lambda: todo_list.tag_index))
+        self.record(
+            "filter_tasks (tags)",
+            _timed(lambda: todo_list.filter_tasks(tags="(فوری | مهم) & !بعدا")),
+        )
+
+        self.record("smart_lists build", _timed(lambda: todo_list.smart_lists))
+        self.record(
+            "filter_tasks (smart list)",
+            _timed(lambda: todo_list.filter_tasks(smart_list="گذشته از موعد")),
+        )
+
+        horizon = (REFERENCE_DATE, REFERENCE_DATE + timedelta(days=365))
+        self.record(
+            "recurring_occurrences (1 year)",
+            _timed(lambda: sum(1 for _ in todo_list.recurring_occurrences(*horizon))),
+        )
+        self.record("reminder_queue build", _timed(lambda: todo_list.reminder_queue))
+        self.record("reminder pop_due", _timed(todo_list.reminder_queue.pop_due))
+        self.record("stats build", _timed(lambda: todo_list.stats))
+        self.record(
+            "dashboard_data",
+            _timed(lambda: dashboard_data(todo_list.stats, REFERENCE_DATE + timedelta(days=30))),
+        )
+
+        # پیش‌نمایش یادداشت‌ها: اولین تبدیل (markdown2) در برابر خواندن از cache
+        if importlib.util.find_spec("markdown2") is not None:
+            notes = [task.notes for task in todo_list.tasks[:1000] if task.notes]
+            renderer = NotesRenderer(maxsize=len(notes) or 1)
+
+            def render_all():
+                for text in notes:
+                    renderer.render(text)
+
+            self.record("notes render (miss)", _timed(render_all), len(notes) or 1)
+            self.record("notes render (hit)", _timed(render_all), len(notes) or 1)
+
+        indices = [self.rng.randrange(len(todo_list.tasks)) for _ in range(self.ops)]
+
+        def toggle():
+            for index in indices:
+                todo_list.toggle_task_status(index)
+            todo_list.storage.flush()
+
+        self.record("toggle_task_status", _timed(toggle), len(indices))
+
+        count = min(100, len(todo_list.tasks) // 2)
+        victims = self.rng.sample(range(len(todo_list.tasks)), count)
+
+        def delete():
+            todo_list.delete_multiple_tasks(victims)
+            todo_list.storage.flush()
+
+        self.record("delete_multiple_tasks", _timed(delete))
+        todo_list.close()
+
+        todo_list = self._fresh_list()
+
+        def cleanup():
+            todo_list._cleanup_old_tasks()
+            todo_list.storage.flush()
+
+        self.record("_cleanup_old_tasks", _timed(cleanup))
+        # صف پاکسازی ساخته شده است؛ اجرای دوره‌ای بعدی فقط کارهای منقضی را می‌بیند
+        self.record("run_cleanup (steady state)", _timed(todo_list.run_cleanup))
+        self.record(
+            "materialize_recurring",
+            _timed(lambda: todo_list.materialize_recurring(today=REFERENCE_DATE + timedelta(days=30))),
+        )
+        todo_list.close()
+
+        target_path = os.path.join(self.directory, "import_target.csv")
+        todo_list = ToDoList(target_path, storage=create_storage(target_path, self.storage_kind, save_delay=0))
+        self.record("import_from_csv", _timed(lambda: todo_list.import_from_csv(self.source)))
+
+        # خروجی و ورودی اکسل فقط اگر openpyxl نصب باشد
+        if importlib.util.find_spec("openpyxl") is not None:
+            xlsx_path = os.path.join(self.directory, "export.xlsx")
+            self.record("export_to_xlsx", _timed(lambda: todo_list.export_to_xlsx(xlsx_path)))
+            todo_list.close()
+            target_path = os.path.join(self.directory, "import_target.xlsx.csv")
+            todo_list = ToDoList(target_path, storage=create_storage(target_path, self.storage_kind, save_delay=0))
+            self.record("import_from_xlsx", _timed(lambda: todo_list.import_from_xlsx(xlsx_path)))
+        todo_list.close()
+        return self.results
+
+
+def metadata(args):
+    try:
+        commit = subprocess.run(
+            ["git", "rev-parse", "--short", "HEAD"],
+            capture_output=True, text=True, check=True,
+            cwd=os.path.dirname(os.path.abspath(__file__)),
+        ).stdout.strip()
+    except (OSError, subprocess.CalledProcessError):
+        commit = None
+    return {
+        "timestamp": datetime.now().isoformat(timespec="seconds"),
+        "commit": commit,
+        "python": platform.python_version(),
+        "platform": platform.platform(),
+        "seed": args.seed,
+        "storage": args.storage or os.environ.get("TODO_STORAGE", "csv"),
+        "ops": args.ops,
+    }
+
+
+def compare(results, baseline_path):
+    """نسبت زمان هر عملیات به اجرای مبنا را چاپ می‌کند."""
+    with open(baseline_path, encoding="utf-8") as file:
+        baseline = {
+            (item["operation"], item["tasks"]): item for item in json.load(file)["results"]
+        }
+    print(f"\n{'tasks':>9} {'operation':<32} {'baseline':>10} {'current':>10} {'ratio':>7}")
+    for item in results:
+        old = baseline.get((item["operation"], item["tasks"]))
+        if old is None or not old["ms_per_op"]:
+            continue
+        print(
+            f"{item['tasks']:>9} {item['operation']:<32} {old['ms_per_op']:>10.3f} "
+            f"{item['ms_per_op']:>10.3f} {item['ms_per_op'] / old['ms_per_op']:>6.2f}x"
+        )
+
+
+def main():
+    parser = argparse.ArgumentParser(description="مجموعه بنچمارک ToDoList")
+    parser.add_argument("--sizes", type=int, nargs="+", default=[1_000, 10_000, 100_000, 1_000_000])
+    parser.add_argument("--seed", type=int, default=1)
+    parser.add_argument("--ops", type=int, default=20, help="تعداد تغییر وضعیت‌های زمان‌گیری شده")
+    parser.add_argument("--storage", choices=["csv", "journal", "sqlite"])
+    parser.add_argument("--output", help="ذخیره نتایج در این فایل JSON")
+    parser.add_argument("--compare", help="مقایسه با فایل نتایج یک اجرای قبلی")
+    args = parser.parse_args()
+
+    results = []
+    for size in args.sizes:
+        with tempfile.TemporaryDirectory() as directory:
+            results.extend(Suite(directory, size, args.seed, args.storage, args.ops).run())
+
+    report = {"meta": metadata(args), "results": results}
+    if args.output:
+        with open(args.output, mode="w", encoding="utf-8") as file:
+            json.dump(report, file, ensure_ascii=False, indent=2)
+    if args.compare:
+        compare(results, args.compare)
+
+
+if __name__ == "__main__":
+    main()
@@ -0,0 +1,55 @@
+# test_cleanup.py
+
+import os
+import tempfile
+import time
+import unittest
+
+from todo_app.cleanup import DEFAULT_CONFIG
+from todo_app.logic import Task, ToDoList
+from todo_app.storage import CsvStorage
+
+LONG_AGO = "2024-01-01T10:00:00"
+
+
+class CleanupDeferTest(unittest.TestCase):
+    def setUp(self):
+        self.directory = tempfile.TemporaryDirectory()
+        filename = os.path.join(self.directory.name, "tasks.csv")
+        self.todo_list = ToDoList(filename, storage=CsvStorage(filename))
+        self.todo_list.set_cleanup_config(dict(DEFAULT_CONFIG, enabled=True, days_old=1))
+
+        self.parent = Task("والد", "", "متوسط", status="انجام شده", completion_date=LONG_AGO)
+        self.child = Task("زیرکار", "", "متوسط", parent_id=self.parent.task_id, subtask_order=0)
+        self.todo_list.add_tasks([self.parent, self.child])
+
+    def tearDown(self):
+        self.directory.cleanup()
+
+    def test_parent_with_open_subtask_is_deferred(self):
+        self.assertEqual(self.todo_list.run_cleanup(), [])
+        self.assertIsNotNone(self.todo_list.get_task(self.parent.task_id))
+        index = self.todo_list.cleanup_index
+        # مدخل به تعویق افتاده در heap نیست و اجرای بعدی را فوری نمی‌کند
+        self.assertIsNone(index.next_expiry())
+        self.assertEqual(len(index), 1)
+
+        # پس از انجام زیرکار، والد همراه زیرکارش در اجرای بعد حذف می‌شود
+        self.todo_list.toggle_task(self.child.task_id)
+        removed = self.todo_list.run_cleanup()
+        self.assertEqual({task.task_id for task in removed}, {self.parent.task_id, self.child.task_id})
+        self.assertEqual(self.todo_list.tasks, [])
+
+    def test_deferred_entry_dropped_when_parent_completed_again(self):
+        self.todo_list.run_cleanup()
+        # باز و دوباره انجام کردن والد زمان انجامش را تازه می‌کند
+        self.todo_list.toggle_task(self.parent.task_id)
+        self.todo_list.toggle_task(self.parent.task_id)
+        self.todo_list.toggle_task(self.child.task_id)
+        self.assertEqual(self.todo_list.run_cleanup(time.time() + 3600), [])
+        self.assertEqual(len(self.todo_list.tasks), 2)
+        self.assertGreater(self.todo_list.cleanup_index.next_expiry(), time.time())
+
+
+if __name__ == "__main__":
+    unittest.main()
@@ -0,0 +1,112 @@
+# test_excel.py
+
+import os
+import tempfile
+import unittest
+from datetime import datetime
+
+from todo_app.excel import ExportJob, XlsxImportJob
+from todo_app.logic import Task, ToDoList
+from todo_app.storage import CSV_HEADER, CsvStorage
+
+try:
+    import openpyxl
+except ImportError:
+    openpyxl = None
+
+
+@unittest.skipUnless(openpyxl, "openpyxl نصب نیست")
+class XlsxRoundTripTest(unittest.TestCase):
+    def setUp(self):
+        self.directory = tempfile.TemporaryDirectory()
+        self.filename = os.path.join(self.directory.name, "tasks.csv")
+        self.xlsx = os.path.join(self.directory.name, "tasks.xlsx")
+        self.todo_list = ToDoList(self.filename, storage=CsvStorage(self.filename))
+
+        self.parent = Task("پروژه", "گزارش سالانه", "بالا", due_date="2024-03-31",
+                           category="کاری", notes="خط اول\nخط دوم، با ویرگول", tags="فوری")
+        self.todo_list.add_task(self.parent)
+        self.child = Task("بخش اول", "", "متوسط", parent_id=self.parent.task_id, subtask_order=0)
+        self.todo_list.add_task(self.child)
+        self.grandchild = Task("پیش‌نویس", "", "پایین", due_date="2024-03-15",
+                               parent_id=self.child.task_id, subtask_order=0)
+        self.todo_list.add_task(self.grandchild)
+        self.recurring = Task("جلسه", "", "متوسط", due_date="2024-03-04", is_recurring=True,
+                              recurrence_pattern={"type": "weekly", "interval": 2, "weekdays": [0, 3]})
+        self.todo_list.add_task(self.recurring)
+
+    def tearDown(self):
+        self.directory.cleanup()
+
+    def _sheet_rows(self):
+        workbook = openpyxl.load_workbook(self.xlsx)
+        try:
+            return [list(row) for row in workbook.active.iter_rows(values_only=True)]
+        finally:
+            workbook.close()
+
+    def test_export_cells(self):
+        success, _ = self.todo_list.export_to_xlsx(self.xlsx)
+        self.assertTrue(success)
+        header, *rows = self._sheet_rows()
+        self.assertEqual(header, CSV_HEADER + ["Level"])
+        by_name = {row[1]: dict(zip(header, row)) for row in rows}
+
+        self.assertEqual([row[1] for row in rows], ["پروژه", "بخش اول", "پیش‌نویس", "جلسه"])
+        self.assertEqual([by_name[name]["Level"] for name in ("پروژه", "بخش اول", "پیش‌نویس", "جلسه")],
+                         [0, 1, 2, 0])
+        self.assertEqual(by_name["پروژه"]["Notes"], "خط اول\nخط دوم، با ویرگول")
+        self.assertEqual(by_name["پروژه"]["DueDate"], datetime(2024, 3, 31))
+        self.assertIsNone(by_name["بخش اول"]["DueDate"])
+        self.assertEqual(by_name["بخش اول"]["SubtaskOrder"], 0)
+        self.assertIs(by_name["جلسه"]["IsRecurring"], True)
+        self.assertEqual(by_name["جلسه"]["RecurrenceInterval"], 2)
+
+    def test_export_uses_rows_taken_at_creation(self):
+        job = ExportJob(self.todo_list, self.xlsx)
+        self.todo_list.update_notes(self.parent.task_id, "بعد از شروع")
+        self.todo_list.delete_tasks([self.recurring.task_id])
+        job.run()
+        self.assertTrue(job.success)
+        self.assertEqual(job.rows_read, 4)
+        rows = self._sheet_rows()
+        self.assertEqual(rows[1][CSV_HEADER.index("Notes")], "خط اول\nخط دوم، با ویرگول")
+        self.assertEqual(rows[-1][1], "جلسه")
+
+    def test_round_trip_with_bad_rows(self):
+        self.todo_list.export_to_xlsx(self.xlsx)
+        workbook = openpyxl.load_workbook(self.xlsx)
+        sheet = workbook.active
+        bad_priority = ["", "بد", "", "خیلی زیاد", "انجام نشده"] + [None] * (len(CSV_HEADER) - 5) + [0]
+        bad_date = ["", "تاریخ بد", "", "متوسط", "انجام نشده", None, "31/03/2024"]
+        sheet.append(bad_priority)
+        sheet.append(bad_date)
+        workbook.save(self.xlsx)
+        workbook.close()
+
+        filename = os.path.join(self.directory.name, "imported.csv")
+        target = ToDoList(filename, storage=CsvStorage(filename))
+        job = XlsxImportJob(target, self.xlsx)
+        job.run()
+        self.assertTrue(job.success, job.summary())
+        self.assertEqual(job.bad_row_count, 2)
+        self.assertEqual([line for line, _ in job.bad_rows], [6, 7])
+
+        tasks = {task.name: task for task in target.tasks}
+        self.assertEqual(sorted(tasks), sorted(["پروژه", "بخش اول", "پیش‌نویس", "جلسه"]))
+        parent = tasks["پروژه"]
+        self.assertEqual(parent.notes, "خط اول\nخط دوم، با ویرگول")
+        self.assertEqual(parent.due_date, "2024-03-31")
+        self.assertEqual(parent.tags, self.parent.tags)
+        self.assertEqual([task.name for task in parent.subtasks], ["بخش اول"])
+        self.assertEqual([task.name for task in tasks["بخش اول"].subtasks], ["پیش‌نویس"])
+        self.assertEqual(tasks["پیش‌نویس"].due_date, "2024-03-15")
+        recurring = tasks["جلسه"]
+        self.assertTrue(recurring.is_recurring)
+        self.assertEqual(recurring.recurrence_pattern["interval"], 2)
+        self.assertEqual(recurring.recurrence_pattern["weekdays"], [0, 3])
+        target.close()
+
+
+if __name__ == "__main__":
+    unittest.main()
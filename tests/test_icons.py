@@ -0,0 +1,97 @@
+# test_icons.py
+
+import os
+import tempfile
+import unittest
+
+from todo_app.icons import INDEX_FILE, IconCache
+
+PLAIN_SVG = b'<svg xmlns="http://www.w3.org/2000/svg"><path fill="#000"/></svg>'
+THEMED_SVG = b'<svg xmlns="http://www.w3.org/2000/svg"><path fill="currentColor"/></svg>'
+
+
+class IconCacheTest(unittest.TestCase):
+    def setUp(self):
+        self.directory = tempfile.TemporaryDirectory()
+        self.icons_path = os.path.join(self.directory.name, "icons")
+        self.cache_path = os.path.join(self.directory.name, "cache")
+        os.makedirs(self.icons_path)
+        self._write_svg("plain.svg", PLAIN_SVG)
+        self._write_svg("themed.svg", THEMED_SVG)
+
+    def tearDown(self):
+        self.directory.cleanup()
+
+    def _write_svg(self, name, data, mtime=None):
+        path = os.path.join(self.icons_path, name)
+        with open(path, "wb") as file:
+            file.write(data)
+        if mtime is not None:
+            os.utime(path, ns=(mtime, mtime))
+
+    def _writer(self, label):
+        def write(path):
+            with open(path, "wb") as file:
+                file.write(label.encode("utf-8"))
+        return write
+
+    def _pngs(self):
+        return sorted(name for name in os.listdir(self.cache_path) if name.endswith(".png"))
+
+    def test_hit_from_disk_in_new_session(self):
+        cache = IconCache(self.icons_path, self.cache_path)
+        self.assertIsNone(cache.bitmap("plain.svg", 20))
+        self.assertEqual(cache.store("plain.svg", 20, None, self._writer("p20")), b"p20")
+        self.assertTrue(os.path.exists(os.path.join(self.cache_path, INDEX_FILE)))
+
+        reopened = IconCache(self.icons_path, self.cache_path)
+        self.assertEqual(reopened.bitmap("plain.svg", 20), b"p20")
+        self.assertIsNone(reopened.bitmap("missing.svg", 20))
+
+    def test_size_and_colour_are_part_of_key(self):
+        cache = IconCache(self.icons_path, self.cache_path)
+        cache.store("plain.svg", 20, "#000000", self._writer("p20"))
+        cache.store("themed.svg", 20, "#FFFFFF", self._writer("t20-white"))
+
+        self.assertIsNone(cache.bitmap("plain.svg", 30))
+        # رنگ فقط برای SVGهای currentColor در کلید است
+        self.assertEqual(cache.bitmap("plain.svg", 20, "#ffffff"), b"p20")
+        self.assertEqual(cache.bitmap("themed.svg", 20, "#ffffff"), b"t20-white")
+        self.assertIsNone(cache.bitmap("themed.svg", 20, "#000000"))
+        self.assertTrue(cache.themed("themed.svg"))
+        self.assertFalse(cache.themed("plain.svg"))
+
+    def test_content_change_misses_and_prunes_old_bitmaps(self):
+        cache = IconCache(self.icons_path, self.cache_path)
+        cache.store("plain.svg", 20, None, self._writer("old-20"))
+        cache.store("plain.svg", 30, None, self._writer("old-30"))
+        cache.store("themed.svg", 20, "#000000", self._writer("themed"))
+        self.assertEqual(len(self._pngs()), 3)
+
+        stat = os.stat(os.path.join(self.icons_path, "plain.svg"))
+        self._write_svg("plain.svg", PLAIN_SVG.replace(b"#000", b"#123"), stat.st_mtime_ns + 10**9)
+        reopened = IconCache(self.icons_path, self.cache_path)
+        self.assertIsNone(reopened.bitmap("plain.svg", 20))
+        self.assertEqual(reopened.store("plain.svg", 20, None, self._writer("new-20")), b"new-20")
+
+        # بیت‌مپ‌های نسخه قدیمی plain.svg حذف و بقیه نگه داشته می‌شوند
+        reopened._prune()
+        self.assertEqual(len(self._pngs()), 2)
+        self.assertEqual(reopened.bitmap("themed.svg", 20, "#000000"), b"themed")
+        self.assertEqual(IconCache(self.icons_path, self.cache_path).bitmap("plain.svg", 20), b"new-20")
+
+    def test_failed_write_is_not_cached(self):
+        cache = IconCache(self.icons_path, self.cache_path)
+
+        def write(path):
+            with open(path, "wb") as file:
+                file.write(b"partial")
+            raise OSError("disk full")
+
+        self.assertIsNone(cache.store("plain.svg", 20, None, write))
+        self.assertEqual(os.listdir(self.cache_path), [])
+        self.assertIsNone(cache.bitmap("plain.svg", 20))
+
+
+if __name__ == "__main__":
+    unittest.main()
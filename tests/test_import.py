@@ -0,0 +1,159 @@
+# test_import.py
+
+import csv
+import os
+import shutil
+import tempfile
+import time
+import unittest
+
+from todo_app.importer import ImportJob
+from todo_app.logic import Task, ToDoList
+from todo_app.storage import CsvStorage
+
+
+class ReimportTest(unittest.TestCase):
+    def setUp(self):
+        self.directory = tempfile.TemporaryDirectory()
+        self.filename = os.path.join(self.directory.name, "tasks.csv")
+
+    def tearDown(self):
+        self.directory.cleanup()
+
+    def test_reimport_keeps_hierarchy_of_copies(self):
+        todo_list = ToDoList(self.filename, storage=CsvStorage(self.filename))
+        parent = Task("والد", "", "متوسط")
+        todo_list.add_tasks([parent])
+        children = [
+            Task(f"زیرکار {i}", "", "متوسط", parent_id=parent.task_id, subtask_order=i)
+            for i in range(2)
+        ]
+        todo_list.add_tasks(children)
+        exported = os.path.join(self.directory.name, "export.csv")
+        shutil.copyfile(self.filename, exported)
+
+        success, _ = todo_list.import_from_csv(exported)
+
+        self.assertTrue(success)
+        self.assertEqual(len(todo_list.tasks), 6)
+        self.assertEqual(list(parent.subtasks), children)
+        copies = [task for task in todo_list.tasks if task.name == "والد" and task is not parent]
+        self.assertEqual(len(copies), 1)
+        copy = copies[0]
+        self.assertNotEqual(copy.task_id, parent.task_id)
+        self.assertEqual([task.name for task in copy.subtasks], ["زیرکار 0", "زیرکار 1"])
+        self.assertTrue(all(task.parent_id == copy.task_id for task in copy.subtasks))
+        todo_list.close()
+
+
+class ImportJobTest(unittest.TestCase):
+    def setUp(self):
+        self.directory = tempfile.TemporaryDirectory()
+        self.filename = os.path.join(self.directory.name, "tasks.csv")
+        self.source = os.path.join(self.directory.name, "source.csv")
+        self.todo_list = ToDoList(self.filename, storage=CsvStorage(self.filename))
+
+    def tearDown(self):
+        self.directory.cleanup()
+
+    def _write_source(self, count, bad_rows=()):
+        CsvStorage(self.source).save(
+            [Task(f"کار {i}", "", "متوسط").to_list() for i in range(count)]
+        )
+        with open(self.source, mode="a", newline="", encoding="utf-8") as file:
+            csv.writer(file).writerows(bad_rows)
+
+    def _poll_until_done(self, job, max_batches=4):
+        deadline = time.monotonic() + 10
+        while not job.poll(max_batches):
+            self.assertLess(time.monotonic(), deadline, "وارد کردن تمام نشد")
+            time.sleep(0.001)
+
+    def test_bad_rows_reported(self):
+        valid = Task("نمونه", "", "متوسط").to_list()
+        bad_rows = [
+            ["فقط", "دو ستون"],
+            valid[:3] + ["فوری"] + valid[4:],
+            valid[:1] + ["  "] + valid[2:],
+            valid[:6] + ["2025-13-40"] + valid[7:],
+        ]
+        self._write_source(3, bad_rows)
+
+        job = ImportJob(self.todo_list, self.source)
+        job.run()
+
+        self.assertTrue(job.success)
+        self.assertEqual(job.imported_count, 3)
+        self.assertEqual(job.bad_row_count, 4)
+        self.assertEqual([line for line, _ in job.bad_rows], [5, 6, 7, 8])
+        reasons = [reason for _, reason in job.bad_rows]
+        self.assertIn("تعداد ستون‌ها کافی نیست", reasons[0])
+        self.assertIn("اولویت نامعتبر", reasons[1])
+        self.assertIn("نام کار خالی است", reasons[2])
+        self.assertIn("تاریخ سررسید نامعتبر", reasons[3])
+        self.assertIn("4 ردیف نامعتبر", job.summary())
+        self.assertEqual(sorted(task.name for task in self.todo_list.tasks), ["کار 0", "کار 1", "کار 2"])
+
+    def test_reported_errors_capped(self):
+        self._write_source(1, [["خراب"]] * 10)
+        job = ImportJob(self.todo_list, self.source, max_reported_errors=3)
+        job.run()
+        self.assertEqual(job.bad_row_count, 10)
+        self.assertEqual(len(job.bad_rows), 3)
+        self.assertEqual(job.imported_count, 1)
+
+    def test_cancel_keeps_committed_batches(self):
+        self._write_source(200)
+        job = ImportJob(self.todo_list, self.source, batch_size=10, max_pending_batches=1)
+        job.start()
+        deadline = time.monotonic() + 10
+        while job.imported_count < 10:
+            self.assertLess(time.monotonic(), deadline)
+            job.poll(max_batches=1)
+            time.sleep(0.001)
+        job.cancel()
+        self._poll_until_done(job)
+        job._thread.join(5)
+
+        self.assertFalse(job._thread.is_alive())
+        self.assertTrue(job.cancelled)
+        self.assertEqual(job.imported_count % 10, 0)
+        self.assertLess(job.imported_count, 200)
+        self.assertEqual(
+            [task.name for task in self.todo_list.tasks],
+            [f"کار {i}" for i in range(job.imported_count)],
+        )
+        self.assertIn("لغو شد", job.summary())
+
+    def test_bounded_queue_applies_backpressure(self):
+        self._write_source(500)
+        job = ImportJob(self.todo_list, self.source, batch_size=10, max_pending_batches=2)
+        job.start()
+        time.sleep(0.2)
+        # بدون poll رشته خواننده پشت صف پر منتظر می‌ماند
+        self.assertLessEqual(job._queue.qsize(), 2)
+        self.assertLess(job.rows_read, 500)
+        self.assertEqual(self.todo_list.tasks, [])
+
+        self._poll_until_done(job)
+        job._thread.join(5)
+        self.assertFalse(job._thread.is_alive())
+        self.assertEqual(job.imported_count, 500)
+        self.assertEqual(len(self.todo_list.tasks), 500)
+
+    def test_cancel_with_full_queue_ends_worker(self):
+        self._write_source(500)
+        job = ImportJob(self.todo_list, self.source, batch_size=10, max_pending_batches=1)
+        job.start()
+        time.sleep(0.1)
+        job.cancel()
+        # رشته خواننده صف پر را خالی کرده و نشانه پایان را می‌گذارد
+        job._thread.join(5)
+        self.assertFalse(job._thread.is_alive())
+        self._poll_until_done(job)
+        self.assertEqual(job.imported_count, 0)
+        self.assertEqual(self.todo_list.tasks, [])
+
+
+if __name__ == "__main__":
+    unittest.main()
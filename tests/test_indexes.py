@@ -0,0 +1,141 @@
+# test_indexes.py
+
+import os
+import random
+import tempfile
+import unittest
+from datetime import date, timedelta
+
+from todo_app.indexes import TaskIndexes
+from todo_app.logic import Task, ToDoList
+from todo_app.storage import CsvStorage
+
+CATEGORIES = ["کاری", "شخصی", "خرید"]
+PRIORITIES = ["پایین", "متوسط", "بالا"]
+START = date(2024, 3, 1)
+
+
+def random_due(rng):
+    if rng.random() < 0.25:
+        return None
+    return (START + timedelta(days=rng.randint(0, 30))).isoformat()
+
+
+def brute_force(tasks, category=None, priority=None, status=None,
+                due_from=None, due_to=None, has_due=None):
+    def allowed(value, values):
+        if values is None:
+            return True
+        return value == values if isinstance(values, str) else value in values
+
+    result = []
+    for task in tasks:
+        if not (allowed(task.category, category) and allowed(task.priority, priority)
+                and allowed(task.status, status)):
+            continue
+        if has_due is False and task.due is not None:
+            continue
+        if due_from is not None or due_to is not None or has_due:
+            if task.due is None:
+                continue
+            if (due_from is not None and task.due < due_from) or (due_to is not None and task.due > due_to):
+                continue
+        result.append(task.task_id)
+    return result
+
+
+class TaskIndexesTest(unittest.TestCase):
+    def test_update_after_in_place_change(self):
+        task = Task("گزارش", "", "متوسط", due_date="2024-03-05", category="کاری")
+        index = TaskIndexes([task])
+        task.status = "انجام شده"
+        task.due_date = None
+        index.update(task, task)
+        self.assertEqual(index.query(status="انجام نشده"), set())
+        self.assertEqual(index.query(status="انجام شده", has_due=False), {task.task_id})
+        self.assertEqual(index.ids_due_between(), set())
+        self.assertEqual(index.values("status"), {"انجام شده": 1})
+
+    def test_remove_cleans_empty_buckets(self):
+        first = Task("الف", "", "بالا", category="کاری")
+        second = Task("ب", "", "پایین", category="کاری")
+        index = TaskIndexes([first, second])
+        index.remove(first)
+        self.assertNotIn("بالا", index.values("priority"))
+        self.assertEqual(index.query(category="کاری"), {second.task_id})
+        self.assertIsNone(index.remove(first))
+        self.assertEqual(len(index), 1)
+
+
+class FilterTasksTest(unittest.TestCase):
+    def setUp(self):
+        self.directory = tempfile.TemporaryDirectory()
+        filename = os.path.join(self.directory.name, "tasks.csv")
+        self.todo_list = ToDoList(filename, storage=CsvStorage(filename))
+
+    def tearDown(self):
+        self.directory.cleanup()
+
+    def _random_task(self, rng, parent_id=None):
+        return Task(
+            f"کار {rng.randint(0, 999)}", "", rng.choice(PRIORITIES),
+            due_date=random_due(rng), category=rng.choice(CATEGORIES), parent_id=parent_id,
+        )
+
+    def _random_criteria(self, rng):
+        criteria = {}
+        if rng.random() < 0.5:
+            criteria["category"] = rng.choice([rng.choice(CATEGORIES), CATEGORIES[:2]])
+        if rng.random() < 0.5:
+            criteria["priority"] = rng.choice(PRIORITIES)
+        if rng.random() < 0.5:
+            criteria["status"] = rng.choice(["انجام شده", "انجام نشده"])
+        choice = rng.random()
+        if choice < 0.2:
+            criteria["has_due"] = False
+        elif choice < 0.4:
+            criteria["has_due"] = True
+        elif choice < 0.7:
+            low = START + timedelta(days=rng.randint(0, 30))
+            criteria["due_from"] = low
+            criteria["due_to"] = low + timedelta(days=rng.randint(0, 10))
+        return criteria
+
+    def test_matches_brute_force_after_changes(self):
+        rng = random.Random(5)
+        todo_list = self.todo_list
+        # ساختن ایندکس پیش از تغییرات تا نگهداری افزایشی آزموده شود
+        self.assertEqual(todo_list.filter_tasks(), [])
+
+        for step in range(500):
+            tasks = todo_list.tasks
+            action = rng.random()
+            if action < 0.35 or not tasks:
+                parent = rng.choice(tasks) if tasks and rng.random() < 0.2 else None
+                todo_list.add_task(self._random_task(rng, parent.task_id if parent else None))
+            elif action < 0.6:
+                todo_list.edit_task(rng.choice(tasks).task_id, self._random_task(rng))
+            elif action < 0.85:
+                todo_list.toggle_task(rng.choice(tasks).task_id)
+            else:
+                todo_list.delete_tasks([rng.choice(tasks).task_id])
+
+            criteria = self._random_criteria(rng)
+            actual = [task.task_id for task in todo_list.filter_tasks(**criteria)]
+            expected = brute_force(todo_list.tasks, **criteria)
+            if not criteria:
+                expected = [task.task_id for task in todo_list.tasks]
+            self.assertEqual(actual, expected, f"step {step}: {criteria}")
+
+    def test_toggle_moves_task_between_status_buckets(self):
+        task = Task("گزارش", "", "بالا", category="کاری")
+        self.todo_list.add_task(task)
+        self.assertEqual(self.todo_list.filter_tasks(status="انجام نشده"), [task])
+        self.todo_list.toggle_task(task.task_id)
+        self.assertEqual(self.todo_list.filter_tasks(status="انجام نشده"), [])
+        self.assertEqual(self.todo_list.filter_tasks(status="انجام شده"), [task])
+        self.assertEqual(self.todo_list.indexes.values("status"), {"انجام شده": 1})
+
+
+if __name__ == "__main__":
+    unittest.main()
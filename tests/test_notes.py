@@ -0,0 +1,55 @@
+# test_notes.py
+
+import unittest
+
+from todo_app.notes import NotesRenderer, content_key
+
+
+class NotesRendererTest(unittest.TestCase):
+    def setUp(self):
+        self.renderer = NotesRenderer(maxsize=2)
+        self.converted = []
+
+        def convert(text):
+            self.converted.append(text)
+            return f"<p>{text}</p>"
+
+        # تبدیل ساختگی تا آزمون به markdown2 وابسته نباشد
+        self.renderer._convert = convert
+
+    def test_hit_and_miss_after_content_change(self):
+        self.assertEqual(self.renderer.render("یادداشت"), "<p>یادداشت</p>")
+        self.assertEqual(self.renderer.render("یادداشت"), "<p>یادداشت</p>")
+        self.assertEqual((self.renderer.hits, self.renderer.misses), (1, 1))
+
+        self.assertEqual(self.renderer.render("یادداشت!"), "<p>یادداشت!</p>")
+        self.assertEqual(self.converted, ["یادداشت", "یادداشت!"])
+        self.assertEqual((self.renderer.hits, self.renderer.misses), (1, 2))
+        self.assertNotEqual(content_key("یادداشت"), content_key("یادداشت!"))
+
+    def test_least_recently_used_is_evicted(self):
+        self.renderer.render("الف")
+        self.renderer.render("ب")
+        # استفاده دوباره «الف» را تازه نگه می‌دارد؛ «ب» باید حذف شود
+        self.renderer.render("الف")
+        self.renderer.render("ج")
+        self.assertEqual(len(self.renderer), 2)
+
+        self.converted.clear()
+        self.renderer.render("الف")
+        self.renderer.render("ج")
+        self.assertEqual(self.converted, [])
+        self.renderer.render("ب")
+        self.assertEqual(self.converted, ["ب"])
+        self.assertEqual(len(self.renderer), 2)
+
+    def test_blank_notes_and_images(self):
+        self.assertEqual(self.renderer.render("  \n"), "")
+        self.assertEqual(self.renderer.misses, 0)
+
+        self.renderer._convert = lambda text: '<p><img src="http://x/a.png" alt="نمودار"></p>'
+        self.assertEqual(self.renderer.render("![نمودار](http://x/a.png)"), "<p>نمودار</p>")
+
+
+if __name__ == "__main__":
+    unittest.main()
@@ -0,0 +1,25 @@
+# test_profiling.py
+
+import unittest
+
+from todo_app.logic import ToDoList
+from todo_app.profiling import EXCLUDED, Profiler
+
+
+class InstrumentTest(unittest.TestCase):
+    def test_generators_and_per_task_methods_are_not_wrapped(self):
+        profiler = Profiler()
+        profiler.instrument(ToDoList, None, EXCLUDED["ToDoList"])
+        try:
+            wrapped = {name for cls, name, func in profiler._originals}
+        finally:
+            profiler.restore()
+
+        self.assertIn("materialize_recurring", wrapped)
+        for name in ("load_steps", "recurring_occurrences", "_index_add", "_index_remove", "_index_update"):
+            self.assertNotIn(name, wrapped)
+            self.assertFalse(hasattr(vars(ToDoList)[name], "__wrapped__"))
+
+
+if __name__ == "__main__":
+    unittest.main()
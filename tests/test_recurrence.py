@@ -0,0 +1,215 @@
+# test_recurrence.py
+
+import os
+import random
+import tempfile
+import unittest
+from datetime import date, timedelta
+
+from todo_app.logic import Task, ToDoList
+from todo_app.recurrence import Rule
+from todo_app.storage import CsvStorage
+
+
+def _ordinal(year, month, day):
+    return date(year, month, day).toordinal()
+
+
+def _naive(rule, anchor, start, end):
+    """نمونه‌های سری با بررسی روز به روز (مرجع مقایسه)."""
+    anchor_date = date.fromordinal(anchor)
+    if rule.end is not None:
+        end = min(end, rule.end)
+    result = []
+    for ordinal in range(max(start, anchor), end + 1):
+        day = date.fromordinal(ordinal)
+        months = (day.year - anchor_date.year) * 12 + day.month - anchor_date.month
+        if rule.type == "daily":
+            match = (ordinal - anchor) % rule.interval == 0
+        elif rule.type == "weekly":
+            weeks = (ordinal - day.weekday() - (anchor - anchor_date.weekday())) // 7
+            if rule.weekdays:
+                match = weeks % rule.interval == 0 and day.weekday() in rule.weekdays
+            else:
+                match = (ordinal - anchor) % (7 * rule.interval) == 0
+        else:
+            step = rule.interval * (12 if rule.type == "yearly" else 1)
+            if months % step:
+                continue
+            if rule.type == "monthly" and rule.nth:
+                match = False
+                for n, weekday in rule.nth:
+                    if day.weekday() != weekday:
+                        continue
+                    if n > 0:
+                        match = match or (day.day - 1) // 7 + 1 == n
+                    else:
+                        following = (day + timedelta(days=-7 * n)).month != day.month
+                        previous = (day + timedelta(days=7 * (-n - 1))).month == day.month
+                        match = match or (following and previous)
+            else:
+                next_month = date(day.year + day.month // 12, day.month % 12 + 1, 1)
+                last_day = (next_month - timedelta(days=1)).day
+                match = day.day == min(anchor_date.day, last_day)
+        if match:
+            result.append(ordinal)
+    return result
+
+
+class RuleExpandTest(unittest.TestCase):
+    def test_monthly_clamps_to_month_end(self):
+        rule = Rule("monthly")
+        dates = [date.fromordinal(o) for o in rule.expand(_ordinal(2025, 1, 31), _ordinal(2025, 1, 1), _ordinal(2025, 5, 31))]
+        self.assertEqual(dates, [date(2025, 1, 31), date(2025, 2, 28), date(2025, 3, 31), date(2025, 4, 30), date(2025, 5, 31)])
+
+    def test_yearly_feb_29(self):
+        rule = Rule("yearly")
+        dates = [date.fromordinal(o) for o in rule.expand(_ordinal(2024, 2, 29), _ordinal(2024, 1, 1), _ordinal(2028, 12, 31))]
+        self.assertEqual(dates, [date(2024, 2, 29), date(2025, 2, 28), date(2026, 2, 28), date(2027, 2, 28), date(2028, 2, 29)])
+
+    def test_fifth_weekday_skips_short_months(self):
+        # پنجمین دوشنبه: فقط ماه‌هایی که پنج دوشنبه دارند
+        rule = Rule("monthly", 1, (), ((5, 0),))
+        dates = [date.fromordinal(o) for o in rule.expand(_ordinal(2025, 1, 1), _ordinal(2025, 1, 1), _ordinal(2025, 12, 31))]
+        self.assertEqual(dates, [date(2025, 3, 31), date(2025, 6, 30), date(2025, 9, 29), date(2025, 12, 29)])
+
+    def test_fifth_last_weekday_skips_short_months(self):
+        rule = Rule("monthly", 1, (), ((-5, 0),))
+        dates = [date.fromordinal(o) for o in rule.expand(_ordinal(2025, 1, 31), _ordinal(2025, 1, 31), _ordinal(2025, 12, 31))]
+        self.assertEqual(dates, [date(2025, 3, 3), date(2025, 6, 2), date(2025, 9, 1), date(2025, 12, 1)])
+
+    def test_end_date_is_inclusive(self):
+        rule = Rule("weekly", 1, (0, 3), (), end=_ordinal(2025, 1, 16))
+        dates = [date.fromordinal(o) for o in rule.expand(_ordinal(2025, 1, 6), _ordinal(2025, 1, 1), _ordinal(2025, 12, 31))]
+        self.assertEqual(dates, [date(2025, 1, 6), date(2025, 1, 9), date(2025, 1, 13), date(2025, 1, 16)])
+
+    def test_next_after(self):
+        rule = Rule("monthly", 1, (), ((-5, 0),), end=_ordinal(2025, 8, 31))
+        anchor = _ordinal(2025, 1, 31)
+        self.assertEqual(date.fromordinal(rule.next_after(anchor, _ordinal(2025, 3, 3))), date(2025, 6, 2))
+        self.assertIsNone(rule.next_after(anchor, _ordinal(2025, 6, 2)))
+        rule = Rule("yearly")
+        self.assertEqual(date.fromordinal(rule.next_after(_ordinal(2024, 2, 29), _ordinal(2024, 2, 29))), date(2025, 2, 28))
+
+    def test_matches_naive_expansion(self):
+        rng = random.Random(7)
+        for _ in range(1500):
+            kind = rng.choice(("daily", "weekly", "monthly", "yearly"))
+            interval = rng.randint(1, 3)
+            weekdays = tuple(rng.sample(range(7), rng.randint(0, 3))) if kind == "weekly" else ()
+            nth = ()
+            if kind == "monthly" and rng.random() < 0.6:
+                nth = tuple((rng.choice((-5, -4, -2, -1, 1, 2, 4, 5)), rng.randrange(7)) for _ in range(rng.randint(1, 2)))
+            anchor = _ordinal(2024, 1, 1) + rng.randrange(800)
+            end = anchor + rng.randrange(30, 900) if rng.random() < 0.3 else None
+            rule = Rule(kind, interval, weekdays, nth, end)
+            start = anchor + rng.randrange(-40, 400)
+            stop = start + rng.randrange(0, 500)
+            with self.subTest(rule=(kind, interval, weekdays, nth, end), anchor=anchor, start=start):
+                self.assertEqual(rule.expand(anchor, start, stop), _naive(rule, anchor, start, stop))
+
+
+class MaterializeRecurringTest(unittest.TestCase):
+    def setUp(self):
+        self.directory = tempfile.TemporaryDirectory()
+        filename = os.path.join(self.directory.name, "tasks.csv")
+        self.todo_list = ToDoList(filename, storage=CsvStorage(filename))
+
+    def tearDown(self):
+        self.directory.cleanup()
+
+    def _series(self, status):
+        task = Task(
+            "روزانه", "", "متوسط", status=status, due_date="2025-01-01",
+            is_recurring=True, recurrence_pattern={"type": "daily", "interval": 1},
+        )
+        self.todo_list.add_task(task)
+        return task
+
+    def _due_dates(self, tasks):
+        return sorted(task.due_date for task in tasks)
+
+    def test_catch_up_after_completed_instance(self):
+        self._series("انجام شده")
+        created = self.todo_list.materialize_recurring(today=date(2025, 1, 4))
+        self.assertEqual(self._due_dates(created), ["2025-01-02", "2025-01-03", "2025-01-04"])
+
+    def test_open_instance_gets_only_latest_occurrence(self):
+        self._series("انجام نشده")
+        created = self.todo_list.materialize_recurring(today=date(2025, 1, 4))
+        self.assertEqual(self._due_dates(created), ["2025-01-04"])
+        self.assertEqual(self.todo_list.materialize_recurring(today=date(2025, 1, 4)), [])
+
+
+class RecurringSeriesTest(unittest.TestCase):
+    def setUp(self):
+        self.directory = tempfile.TemporaryDirectory()
+        self.filename = os.path.join(self.directory.name, "tasks.csv")
+        self.todo_list = ToDoList(self.filename, storage=CsvStorage(self.filename))
+
+    def tearDown(self):
+        self.directory.cleanup()
+
+    def _complete_latest(self, todo_list):
+        latest = [task for task in todo_list.tasks if not task.is_completed()]
+        self.assertEqual(len(latest), 1)
+        todo_list.toggle_task(latest[0].task_id)
+
+    def _monthly(self, due):
+        task = Task("اجاره", "", "بالا", due_date=due, is_recurring=True,
+                    recurrence_pattern={"type": "monthly", "interval": 1})
+        self.todo_list.add_task(task)
+        return task
+
+    def test_day_31_series_keeps_month_end(self):
+        self._monthly("2025-01-31")
+        self._complete_latest(self.todo_list)
+        self._complete_latest(self.todo_list)
+        # پس از بارگذاری دوباره هم سری از تاریخ شروعش ادامه پیدا می‌کند
+        reloaded = ToDoList(self.filename, storage=CsvStorage(self.filename))
+        self._complete_latest(reloaded)
+        self.assertEqual(
+            [task.due_date for task in reloaded.tasks],
+            ["2025-01-31", "2025-02-28", "2025-03-31", "2025-04-30"],
+        )
+        self.assertEqual(len({task.series_id for task in reloaded.tasks}), 1)
+
+    def test_materialize_from_series_start(self):
+        self._monthly("2025-01-31")
+        self._complete_latest(self.todo_list)
+        self._complete_latest(self.todo_list)
+        # آخرین نمونه موجود 28 فوریه است؛ نمونه‌های جامانده از 31 ژانویه محاسبه می‌شوند
+        self.todo_list.delete_tasks([self.todo_list.tasks[-1].task_id])
+        created = self.todo_list.materialize_recurring(today=date(2025, 5, 31))
+        self.assertEqual(
+            sorted(task.due_date for task in created),
+            ["2025-03-31", "2025-04-30", "2025-05-31"],
+        )
+
+    def test_renamed_instance_stays_in_series(self):
+        first = self._monthly("2025-01-31")
+        self.todo_list.toggle_task(first.task_id)
+        second = [task for task in self.todo_list.tasks if not task.is_completed()][0]
+        renamed = Task("اجاره خانه", "", "بالا", due_date=second.due_date, is_recurring=True,
+                       recurrence_pattern={"type": "monthly", "interval": 1})
+        self.todo_list.edit_task(second.task_id, renamed)
+        self.assertEqual(renamed.series_id, first.series_id)
+
+        created = self.todo_list.materialize_recurring(today=date(2025, 3, 31))
+        self.assertEqual([task.due_date for task in created], ["2025-03-31"])
+        self.assertEqual(created[0].name, "اجاره خانه")
+
+    def test_reimported_series_gets_its_own_id(self):
+        first = self._monthly("2025-01-31")
+        self.todo_list.toggle_task(first.task_id)
+        export = os.path.join(self.directory.name, "export.csv")
+        CsvStorage(export).save(self.todo_list._snapshot_rows())
+        self.todo_list.import_from_csv(export)
+
+        series = {task.series_id for task in self.todo_list.tasks}
+        self.assertEqual(len(series), 2)
+        self.assertEqual(self.todo_list.materialize_recurring(today=date(2025, 2, 28)), [])
+
+
+if __name__ == "__main__":
+    unittest.main()
@@ -0,0 +1,152 @@
+# test_reminders.py
+
+import os
+import tempfile
+import unittest
+from datetime import date, datetime, time as day_time, timedelta
+
+from todo_app.logic import Task, ToDoList
+from todo_app.reminders import RecordingNotifier, ReminderQueue, ReminderScheduler
+from todo_app.storage import CsvStorage
+
+NINE = day_time(9, 0)
+
+
+def _task(name, due, status="انجام نشده"):
+    return Task(name, "", "متوسط", status=status, due_date=due.isoformat() if due else None)
+
+
+def _at(day):
+    return datetime.combine(day, NINE).timestamp()
+
+
+class FakeRoot:
+    """جایگزین after و after_cancel حلقه رویداد Tk."""
+
+    def __init__(self):
+        self.pending = {}
+        self._next_id = 0
+
+    def after(self, delay, callback):
+        self._next_id += 1
+        self.pending[self._next_id] = (delay, callback)
+        return self._next_id
+
+    def after_cancel(self, after_id):
+        self.pending.pop(after_id, None)
+
+    def run_pending(self):
+        pending, self.pending = self.pending, {}
+        for delay, callback in pending.values():
+            callback()
+
+
+class ReminderQueueTest(unittest.TestCase):
+    def setUp(self):
+        self.first_day = date(2025, 3, 10)
+        self.first = _task("اول", self.first_day)
+        self.second = _task("دوم", self.first_day + timedelta(days=2))
+        self.queue = ReminderQueue([self.first, self.second, _task("بدون سررسید", None)], at=NINE)
+
+    def test_pop_due_in_time_order(self):
+        self.assertEqual(len(self.queue), 2)
+        self.assertEqual(self.queue.next_time(), _at(self.first_day))
+        self.assertEqual(self.queue.pop_due(_at(self.first_day) - 1), [])
+        self.assertEqual(self.queue.pop_due(_at(self.first_day + timedelta(days=5))), [self.first.task_id, self.second.task_id])
+        self.assertIsNone(self.queue.next_time())
+
+    def test_fires_once(self):
+        self.assertEqual(self.queue.pop_due(_at(self.first_day)), [self.first.task_id])
+        # تغییر در جا بدون تغییر سررسید (مثلاً یادداشت) یادآوری را دوباره فعال نمی‌کند
+        self.queue.update(self.first, self.first)
+        self.queue.add(self.first)
+        self.assertEqual(self.queue.pop_due(_at(self.first_day) + 60), [])
+        self.assertEqual(self.queue.next_time(), _at(self.second.due))
+
+    def test_changed_due_date_rearms(self):
+        self.queue.pop_due(_at(self.first_day))
+        moved = _task("اول", self.first_day + timedelta(days=1))
+        moved.task_id = self.first.task_id
+        self.queue.update(self.first, moved)
+        self.assertEqual(self.queue.next_time(), _at(moved.due))
+        self.assertEqual(self.queue.pop_due(_at(moved.due)), [self.first.task_id])
+
+    def test_remove(self):
+        self.queue.remove(self.first)
+        self.assertEqual(len(self.queue), 1)
+        self.assertEqual(self.queue.pop_due(_at(self.second.due)), [self.second.task_id])
+
+    def test_reopened_task_is_reminded_again(self):
+        self.assertEqual(self.queue.pop_due(_at(self.first_day)), [self.first.task_id])
+        self.first.status = "انجام شده"
+        self.queue.update(self.first, self.first)
+        self.first.status = "انجام نشده"
+        self.queue.update(self.first, self.first)
+        self.assertEqual(self.queue.pop_due(_at(self.first_day)), [self.first.task_id])
+
+    def test_listener_called_for_earlier_reminder(self):
+        calls = []
+        self.queue.listener = lambda: calls.append(True)
+        self.queue.add(_task("دیرتر", self.first_day + timedelta(days=7)))
+        self.assertEqual(calls, [])
+        self.queue.add(_task("زودتر", self.first_day - timedelta(days=1)))
+        self.assertEqual(calls, [True])
+
+
+class ReminderSchedulerTest(unittest.TestCase):
+    def setUp(self):
+        self.directory = tempfile.TemporaryDirectory()
+        filename = os.path.join(self.directory.name, "tasks.csv")
+        self.todo_list = ToDoList(filename, storage=CsvStorage(filename))
+        self.root = FakeRoot()
+        self.notifier = RecordingNotifier()
+        self.scheduler = ReminderScheduler(self.root, self.todo_list, self.notifier, max_sleep=60)
+        self.yesterday = date.today() - timedelta(days=1)
+
+    def tearDown(self):
+        self.scheduler.stop()
+        self.directory.cleanup()
+
+    def test_overdue_task_notified_once(self):
+        self.todo_list.add_task(_task("گذشته", self.yesterday))
+        self.todo_list.add_task(_task("آینده", date.today() + timedelta(days=30)))
+        self.scheduler.start()
+        self.assertEqual(self.notifier.notifications, [("گذشته از موعد", "گذشته")])
+        # فقط یک زمان‌بندی فعال، حداکثر به اندازه max_sleep
+        self.assertEqual(len(self.root.pending), 1)
+        delay, _ = next(iter(self.root.pending.values()))
+        self.assertLessEqual(delay, 60 * 1000 + 1)
+
+        self.root.run_pending()
+        self.assertEqual(len(self.notifier.notifications), 1)
+
+    def test_new_overdue_task_reschedules(self):
+        self.scheduler.start()
+        self.assertEqual(self.notifier.notifications, [])
+        self.todo_list.add_task(_task("تازه", self.yesterday))
+        self.assertEqual(len(self.root.pending), 1)
+        delay, _ = next(iter(self.root.pending.values()))
+        self.assertLessEqual(delay, 1)
+        self.root.run_pending()
+        self.assertEqual(self.notifier.notifications, [("گذشته از موعد", "تازه")])
+
+    def test_reopened_task_notified_again(self):
+        task = _task("دوباره", self.yesterday)
+        self.todo_list.add_task(task)
+        self.scheduler.start()
+        self.todo_list.toggle_task(task.task_id)
+        self.todo_list.toggle_task(task.task_id)
+        self.root.run_pending()
+        self.assertEqual(len(self.notifier.notifications), 2)
+
+    def test_many_due_tasks_summarized(self):
+        self.todo_list.add_tasks([_task(f"کار {i}", self.yesterday) for i in range(5)])
+        self.scheduler.start()
+        self.assertEqual(len(self.notifier.notifications), 1)
+        title, message = self.notifier.notifications[0]
+        self.assertEqual(title, "یادآوری کارها")
+        self.assertIn("5", message)
+
+
+if __name__ == "__main__":
+    unittest.main()
@@ -0,0 +1,110 @@
+# test_search.py
+
+import os
+import random
+import tempfile
+import unittest
+
+from todo_app.logic import Task, ToDoList
+from todo_app.search import SearchIndex, normalize, task_tokens, tokenize
+from todo_app.storage import CsvStorage
+
+
+class NormalizeTest(unittest.TestCase):
+    def test_arabic_letters(self):
+        self.assertEqual(normalize("كتاب علي"), "کتاب علی")
+        self.assertEqual(tokenize("مدرسة"), tokenize("مدرسه"))
+
+    def test_zwnj_splits_words(self):
+        self.assertEqual(tokenize("می‌روم"), ["می", "روم"])
+
+    def test_diacritics_and_tatweel_removed(self):
+        self.assertEqual(normalize("كِتَابٌ"), "کتاب")
+        self.assertEqual(normalize("کـــتاب"), "کتاب")
+
+    def test_digits(self):
+        self.assertEqual(normalize("۱۴۰۲ و ٣٤"), "1402 و 34")
+        self.assertEqual(normalize("ABC"), "abc")
+
+
+class SearchIndexTest(unittest.TestCase):
+    def setUp(self):
+        self.directory = tempfile.TemporaryDirectory()
+        filename = os.path.join(self.directory.name, "tasks.csv")
+        self.todo_list = ToDoList(filename, storage=CsvStorage(filename))
+
+    def tearDown(self):
+        self.directory.cleanup()
+
+    def _names(self, query):
+        return sorted(task.name for task in self.todo_list.search(query))
+
+    def test_query_is_normalized(self):
+        self.todo_list.add_task(Task("خرید كتاب", "", "متوسط", notes="قیمت ۱۲۰"))
+        self.assertEqual(self._names("کتا"), ["خرید كتاب"])
+        self.assertEqual(self._names("120"), ["خرید كتاب"])
+        self.assertIsNone(self.todo_list.search_index.search("  "))
+
+    def test_rename_and_delete_update_index(self):
+        first = Task("نوشتن گزارش", "", "متوسط")
+        second = Task("خواندن کتاب", "", "متوسط")
+        self.todo_list.add_tasks([first, second])
+        self.assertEqual(self._names("گزارش"), ["نوشتن گزارش"])
+
+        self.todo_list.edit_task(first.task_id, Task("ارسال نامه", "", "متوسط"))
+        self.assertEqual(self._names("گزارش"), [])
+        self.assertEqual(self._names("نامه"), ["ارسال نامه"])
+
+        self.todo_list.update_notes(second.task_id, "فصل سوم")
+        self.assertEqual(self._names("فصل"), ["خواندن کتاب"])
+
+        self.todo_list.delete_tasks([second.task_id])
+        self.assertEqual(self._names("کتاب"), [])
+        self.assertNotIn("کتاب", self.todo_list.search_index._vocabulary)
+
+    def test_matches_brute_force_after_changes(self):
+        words = ["کتاب", "كتابخانه", "خرید", "نان", "گزارش", "۱۴۰۲", "می‌روم", "نامه"]
+        rng = random.Random(3)
+
+        def text():
+            return " ".join(rng.sample(words, rng.randint(1, 3)))
+
+        index = SearchIndex()
+        tasks = {}
+        for step in range(400):
+            action = rng.random()
+            if action < 0.5 or not tasks:
+                task = Task(text(), text(), "متوسط")
+                tasks[task.task_id] = task
+                index.add(task)
+            elif action < 0.8:
+                task = rng.choice(list(tasks.values()))
+                old = tasks[task.task_id]
+                renamed = Task(text(), old.description, "متوسط", task_id=old.task_id)
+                tasks[task.task_id] = renamed
+                index.update(old, renamed)
+            else:
+                task = tasks.pop(rng.choice(list(tasks)))
+                index.remove(task)
+
+            query = rng.choice(["کت", "كتابخ", "نا", "1402", "روم", "خرید نان"])
+            expected = {
+                task_id for task_id, task in tasks.items()
+                if all(any(token.startswith(term) for token in task_tokens(task)) for term in tokenize(query))
+            }
+            self.assertEqual(index.search(query), expected, f"step {step}: {query}")
+
+    def test_incremental_build_sees_changes_to_pending_tasks(self):
+        tasks = [Task(f"کار {i}", "", "متوسط") for i in range(10)]
+        index = SearchIndex(tasks)
+        index.build_step(3)
+        renamed = Task("تغییر یافته", "", "متوسط", task_id=tasks[7].task_id)
+        index.update(tasks[7], renamed)
+        index.remove(tasks[8])
+        self.assertEqual(index.search("تغییر"), {renamed.task_id})
+        self.assertEqual(len(index.search("کار")), 8)
+        self.assertTrue(index.ready)
+
+
+if __name__ == "__main__":
+    unittest.main()
@@ -0,0 +1,127 @@
+# test_smartlists.py
+
+import os
+import random
+import tempfile
+import unittest
+from datetime import date, timedelta
+
+from todo_app.logic import Task, ToDoList
+from todo_app.smartlists import SmartList, SmartLists
+from todo_app.storage import CsvStorage
+
+TODAY = date(2024, 3, 10)
+OPEN = "انجام نشده"
+
+
+def expected_members(name, task, today):
+    """تعریف مستقل هر لیست (بدون استفاده از SmartList.matches)."""
+    due = task.due
+    if name == "گذشته از موعد":
+        return due is not None and due < today and task.status == OPEN
+    if name == "سررسید امروز":
+        return due == today and task.status == OPEN
+    if name == "فوری کاری":
+        return task.priority == "بالا" and task.category == "کاری" and task.status == OPEN
+    if name == "تکرارشونده":
+        return bool(task.is_recurring)
+    if name == "این هفته":
+        return due is not None and today <= due <= today + timedelta(days=6)
+    if name == "فوری بدون سررسید":
+        return due is None and "فوری" in task.tags
+    raise AssertionError(name)
+
+
+class SmartListTest(unittest.TestCase):
+    def test_invalid_due_rule(self):
+        with self.assertRaises(ValueError):
+            SmartList({"name": "نامعتبر", "due": "tomorrow"})
+
+    def test_update_removes_task_that_no_longer_matches(self):
+        task = Task("گزارش", "", "بالا", category="کاری")
+        lists = SmartLists([{"name": "فوری", "priority": "بالا"}], [task], today=TODAY)
+        self.assertEqual(lists.ids("فوری"), {task.task_id})
+        task.priority = "پایین"
+        lists.update(task, task)
+        self.assertEqual(lists.counts(), {"فوری": 0})
+
+    def test_refresh_day_rebuilds_only_date_lists(self):
+        task = Task("گزارش", "", "بالا", due_date="2024-03-10")
+        lists = SmartLists(
+            [{"name": "امروز", "due": "today"}, {"name": "همه", "due": "any"}], [task], today=TODAY)
+        self.assertEqual(lists.refresh_day([task], TODAY), [])
+        self.assertEqual(lists.refresh_day([task], TODAY + timedelta(days=1)), ["امروز"])
+        self.assertEqual(lists.counts(), {"امروز": 0, "همه": 1})
+
+
+class SmartListsMaintenanceTest(unittest.TestCase):
+    def setUp(self):
+        self.directory = tempfile.TemporaryDirectory()
+        filename = os.path.join(self.directory.name, "tasks.csv")
+        self.todo_list = ToDoList(filename, storage=CsvStorage(filename))
+
+    def tearDown(self):
+        self.directory.cleanup()
+
+    def _random_task(self, rng):
+        due = None
+        if rng.random() < 0.7:
+            due = (TODAY + timedelta(days=rng.randint(-5, 10))).isoformat()
+        recurring = rng.random() < 0.15
+        return Task(
+            f"کار {rng.randint(0, 999)}", "", rng.choice(["پایین", "متوسط", "بالا"]),
+            due_date=due, category=rng.choice(["کاری", "شخصی"]),
+            is_recurring=recurring,
+            recurrence_pattern={"type": "daily", "interval": 1} if recurring else None,
+            tags=rng.choice(["", "فوری", "فوری, خانه", "خانه"]),
+        )
+
+    def _check(self, step):
+        smart_lists = self.todo_list.smart_lists
+        for name in smart_lists.names():
+            expected = {
+                task.task_id for task in self.todo_list.tasks
+                if expected_members(name, task, smart_lists.today)
+            }
+            self.assertEqual(smart_lists.ids(name), expected, f"step {step}: {name}")
+            actual = [task.task_id for task in self.todo_list.filter_tasks(smart_list=name)]
+            self.assertEqual(actual, [task.task_id for task in self.todo_list.tasks
+                                      if task.task_id in expected])
+
+    def test_matches_brute_force_after_changes(self):
+        rng = random.Random(11)
+        todo_list = self.todo_list
+        todo_list.smart_lists
+        todo_list.refresh_smart_lists(TODAY)
+        todo_list.save_smart_list({"name": "این هفته", "due": "week"})
+        todo_list.save_smart_list({"name": "فوری بدون سررسید", "due": "none", "tags": "فوری"})
+
+        for step in range(400):
+            tasks = todo_list.tasks
+            action = rng.random()
+            if action < 0.35 or not tasks:
+                todo_list.add_task(self._random_task(rng))
+            elif action < 0.6:
+                todo_list.edit_task(rng.choice(tasks).task_id, self._random_task(rng))
+            elif action < 0.85:
+                todo_list.toggle_task(rng.choice(tasks).task_id)
+            else:
+                todo_list.delete_tasks([rng.choice(tasks).task_id])
+            self._check(step)
+
+        # با عوض شدن روز لیست‌های نسبی دوباره ساخته می‌شوند
+        refreshed = todo_list.refresh_smart_lists(TODAY + timedelta(days=3))
+        self.assertEqual(set(refreshed), {"گذشته از موعد", "سررسید امروز", "این هفته"})
+        self._check("refresh")
+
+    def test_definitions_are_saved(self):
+        self.todo_list.save_smart_list({"name": "شخصی", "category": "شخصی"})
+        filename = self.todo_list.filename
+        reopened = ToDoList(filename, storage=CsvStorage(filename))
+        self.assertIn("شخصی", reopened.smart_lists)
+        self.assertTrue(reopened.delete_smart_list("شخصی"))
+        self.assertNotIn("شخصی", ToDoList(filename, storage=CsvStorage(filename)).smart_lists)
+
+
+if __name__ == "__main__":
+    unittest.main()
@@ -0,0 +1,68 @@
+# test_stats.py
+
+import os
+import tempfile
+import unittest
+from datetime import date, timedelta
+
+from todo_app.logic import Task, ToDoList
+from todo_app.stats import TaskStats
+from todo_app.storage import CsvStorage
+
+
+class TaskStatsContributionTest(unittest.TestCase):
+    def setUp(self):
+        self.directory = tempfile.TemporaryDirectory()
+        filename = os.path.join(self.directory.name, "tasks.csv")
+        self.todo_list = ToDoList(filename, storage=CsvStorage(filename))
+
+    def tearDown(self):
+        self.directory.cleanup()
+
+    def assertMatchesRebuild(self):
+        stats = self.todo_list.stats
+        rebuilt = TaskStats(self.todo_list.tasks)
+        self.assertEqual(stats._contributions, rebuilt._contributions)
+        self.assertEqual(stats._counters, rebuilt._counters)
+
+    def test_in_place_changes_replace_contributions(self):
+        overdue = (date.today() - timedelta(days=3)).isoformat()
+        tasks = [
+            Task("گذشته", "", "زیاد", due_date=overdue, category="کار"),
+            Task("تکراری", "", "متوسط", due_date=overdue, is_recurring=True,
+                 recurrence_pattern={"type": "weekly", "interval": 1}),
+            Task("ساده", "", "کم"),
+        ]
+        self.todo_list.add_tasks(tasks)
+        stats = self.todo_list.stats
+        self.assertEqual(len(stats), 3)
+        self.assertEqual(stats.open_by_category()["کار"], {"زیاد": 1})
+
+        # toggle_task کار را در جا تغییر می‌دهد؛ سهم قبلی باید کم شود
+        self.todo_list.toggle_task(tasks[0].task_id)
+        self.assertNotIn("کار", stats.open_by_category())
+        self.assertEqual(stats.completion_series(date.today(), date.today()), [1])
+        self.assertMatchesRebuild()
+
+        self.todo_list.toggle_task(tasks[1].task_id)
+        self.assertEqual(len(stats), 4)
+        self.assertMatchesRebuild()
+
+        self.todo_list.toggle_task(tasks[0].task_id)
+        self.assertEqual(stats.completion_series(date.today(), date.today()), [1])
+        self.assertMatchesRebuild()
+
+        self.todo_list.edit_task(tasks[2].task_id, Task("ویرایش شده", "", "زیاد", category="خانه"))
+        self.todo_list.delete_tasks([tasks[1].task_id])
+        self.assertMatchesRebuild()
+
+    def test_version_changes_with_updates(self):
+        task = Task("کار", "", "متوسط")
+        self.todo_list.add_task(task)
+        version = self.todo_list.stats.version
+        self.todo_list.toggle_task(task.task_id)
+        self.assertGreater(self.todo_list.stats.version, version)
+
+
+if __name__ == "__main__":
+    unittest.main()
@@ -0,0 +1,312 @@
+# test_storage.py
+
+import base64
+import csv
+import os
+import tempfile
+import threading
+import unittest
+from unittest import mock
+
+from todo_app import storage
+from todo_app.logic import Task, ToDoList
+from todo_app.storage import CSV_HEADER, CsvStorage, DebouncedStorage, JournalStorage, SqliteStorage
+
+
+class JournalCompactionTest(unittest.TestCase):
+    def setUp(self):
+        self.directory = tempfile.TemporaryDirectory()
+        self.filename = os.path.join(self.directory.name, "tasks.csv")
+
+    def tearDown(self):
+        self.directory.cleanup()
+
+    def _list(self):
+        journal = JournalStorage(self.filename, compact_threshold=2048, fsync=False)
+        return ToDoList(self.filename, storage=journal)
+
+    def test_compaction_retried_after_write_failure(self):
+        todo_list = self._list()
+        journal = todo_list.storage
+        real_write = storage._write_rows_atomic
+        failures = []
+
+        def failing_write(filename, rows):
+            if not failures:
+                failures.append(filename)
+                raise OSError("disk full")
+            return real_write(filename, rows)
+
+        with mock.patch.object(storage, "_write_rows_atomic", failing_write):
+            for i in range(200):
+                todo_list.add_task(Task(f"کار {i}", "توضیح", "متوسط"))
+                journal._wait_for_compactor()
+
+        self.assertEqual(len(failures), 1)
+        self.assertFalse(os.path.exists(journal.old_journal_path))
+        self.assertLess(os.path.getsize(journal.journal_path), 2048 * 2)
+        todo_list.close()
+
+        reloaded = self._list()
+        self.assertEqual(
+            sorted(task.name for task in reloaded.tasks),
+            sorted(f"کار {i}" for i in range(200)),
+        )
+        reloaded.close()
+
+    def test_csv_record_is_noop(self):
+        self.assertFalse(CsvStorage(self.filename).record([Task("الف", "", "متوسط").to_list()]))
+        self.assertFalse(os.path.exists(self.filename))
+
+
+class SnapshotTest(unittest.TestCase):
+    def test_snapshot_order_is_fixed_on_calling_thread(self):
+        with tempfile.TemporaryDirectory() as directory:
+            filename = os.path.join(directory, "tasks.csv")
+            todo_list = ToDoList(filename, storage=CsvStorage(filename))
+            first = Task("اول", "", "متوسط")
+            second = Task("دوم", "", "متوسط")
+            todo_list.add_task(first)
+            todo_list.add_task(second)
+            child = Task("زیرکار", "", "متوسط", parent_id=first.task_id, subtask_order=0)
+            todo_list.add_task(child)
+
+            snapshot = todo_list._snapshot()
+            # تغییرات بعدی لیست نباید روی snapshot گرفته شده اثر بگذارد
+            todo_list.add_task(Task("زیرکار تازه", "", "متوسط", parent_id=first.task_id, subtask_order=1))
+            todo_list.delete_tasks([second.task_id])
+
+            self.assertEqual([task.name for task in snapshot], ["اول", "زیرکار", "دوم"])
+
+
+class _FailingConnection:
+    """اتصال SQLite که executemany آن پس از نوشتن نیمی از ردیف‌ها خطا می‌دهد."""
+
+    def __init__(self, conn):
+        self._conn = conn
+
+    def __getattr__(self, name):
+        return getattr(self._conn, name)
+
+    def __enter__(self):
+        return self._conn.__enter__()
+
+    def __exit__(self, *exc_info):
+        return self._conn.__exit__(*exc_info)
+
+    def executemany(self, sql, rows):
+        rows = list(rows)
+        self._conn.executemany(sql, rows[: len(rows) // 2])
+        raise OSError("disk full")
+
+
+class SqliteStorageTest(unittest.TestCase):
+    LEGACY = {
+        4: (["Name", "Description", "Priority", "Status"], ["کار", "توضیح", "زیاد", "انجام نشده"]),
+        5: (
+            ["Name", "Description", "Priority", "Status", "CompletionDate"],
+            ["کار", "توضیح", "کم", "انجام شده", "2024-05-01T10:00:00"],
+        ),
+    }
+
+    def setUp(self):
+        self.directory = tempfile.TemporaryDirectory()
+        self.filename = os.path.join(self.directory.name, "tasks.csv")
+
+    def tearDown(self):
+        self.directory.cleanup()
+
+    def _write_csv(self, header, rows):
+        with open(self.filename, mode="w", newline="", encoding="utf-8-sig") as file:
+            writer = csv.writer(file)
+            writer.writerow(header)
+            writer.writerows(rows)
+
+    def _db_rows(self, storage):
+        return [list(row) for row in storage._conn.execute(storage._select_sql)]
+
+    def test_legacy_csv_migrated(self):
+        for width, (header, row) in self.LEGACY.items():
+            with self.subTest(columns=width):
+                self._write_csv(header, [row, row])
+                storage = SqliteStorage(self.filename, os.path.join(self.directory.name, f"{width}.db"))
+                todo_list = ToDoList(self.filename, storage=storage)
+                self.assertEqual(storage._user_version(), 1)
+                rows = self._db_rows(storage)
+                self.assertEqual(rows, [task.to_list() for task in todo_list.tasks])
+                self.assertEqual([stored[1:5] for stored in rows], [row[:4]] * 2)
+                if width == 5:
+                    self.assertEqual({stored[5] for stored in rows}, {"2024-05-01T10:00:00"})
+                storage.close()
+
+    def test_full_csv_migrated_in_one_transaction(self):
+        source = [
+            Task(f"کار {i}", "", "متوسط", notes=f"یادداشت {i}", due_date=f"2025-01-0{i + 1}").to_list()[:16]
+            for i in range(6)
+        ]
+        self._write_csv(CSV_HEADER[:16], source)
+
+        storage = SqliteStorage(self.filename)
+        storage._conn = _FailingConnection(storage._conn)
+        ToDoList(self.filename, storage=storage)
+        # نیمه نوشته شده برگشت خورده و انتقال در اجرای بعد از نو انجام می‌شود
+        storage._conn = storage._conn._conn
+        self.assertEqual(self._db_rows(storage), [])
+        self.assertEqual(storage._user_version(), 0)
+        storage.close()
+
+        storage = SqliteStorage(self.filename)
+        todo_list = ToDoList(self.filename, storage=storage)
+        self.assertEqual([row[:16] for row in self._db_rows(storage)], source)
+        self.assertEqual(todo_list.tasks[3].notes, "یادداشت 3")
+        storage.close()
+
+    def test_upsert_and_delete_round_trip(self):
+        storage = SqliteStorage(self.filename)
+        todo_list = ToDoList(self.filename, storage=storage)
+        parent = Task("والد", "", "زیاد", tags="کار,فوری", notes="یادداشت")
+        child = Task("زیرکار", "", "کم", parent_id=parent.task_id, subtask_order=0)
+        other = Task("دیگر", "", "متوسط", due_date="2025-02-01", is_recurring=True,
+                     recurrence_pattern={"type": "weekly", "interval": 2, "weekdays": [0, 3]})
+        todo_list.add_tasks([parent, child, other])
+        todo_list.toggle_task(child.task_id)
+        todo_list.edit_task(parent.task_id, Task("والد ویرایش شده", "", "زیاد", notes="تازه"))
+        todo_list.delete_tasks([other.task_id])
+        expected = [task.to_list() for task in todo_list.tasks]
+        storage.close()
+
+        storage = SqliteStorage(self.filename)
+        reloaded = ToDoList(self.filename, storage=storage)
+        self.assertEqual([task.to_list() for task in reloaded.tasks], expected)
+        self.assertEqual(reloaded.get_task(parent.task_id).subtasks[0].task_id, child.task_id)
+        self.assertFalse(os.path.exists(self.filename))
+        storage.close()
+
+
+class LoadTest(unittest.TestCase):
+    def setUp(self):
+        self.directory = tempfile.TemporaryDirectory()
+        self.filename = os.path.join(self.directory.name, "tasks.csv")
+
+    def tearDown(self):
+        self.directory.cleanup()
+
+    def test_subtasks_linked_in_order_when_listed_before_parent(self):
+        parent = Task("والد", "", "متوسط")
+        children = [
+            Task(f"زیرکار {i}", "", "متوسط", parent_id=parent.task_id, subtask_order=i)
+            for i in (2, 0, 1)
+        ]
+        CsvStorage(self.filename).save([task.to_list() for task in children + [parent]])
+
+        todo_list = ToDoList(self.filename, storage=CsvStorage(self.filename))
+        loaded = todo_list.get_task(parent.task_id)
+        self.assertEqual([task.name for task in loaded.subtasks], ["زیرکار 0", "زیرکار 1", "زیرکار 2"])
+
+    def test_failed_load_does_not_overwrite_file(self):
+        tasks = [Task(f"کار {i}", "", "متوسط") for i in range(3)]
+        CsvStorage(self.filename).save([task.to_list() for task in tasks])
+        with open(self.filename, "rb") as file:
+            original = file.read()
+
+        csv_storage = CsvStorage(self.filename)
+        real_iter_rows = csv_storage.iter_rows
+
+        def broken_rows():
+            rows = real_iter_rows()
+            yield next(rows)
+            raise OSError("read error")
+
+        with mock.patch.object(csv_storage, "iter_rows", broken_rows):
+            todo_list = ToDoList(self.filename, storage=csv_storage)
+        self.assertIsInstance(todo_list.load_error, OSError)
+        self.assertEqual(len(todo_list.tasks), 1)
+
+        todo_list.add_task(Task("تازه", "", "متوسط"))
+        todo_list.delete_tasks([todo_list.tasks[0].task_id])
+        with open(self.filename, "rb") as file:
+            self.assertEqual(file.read(), original)
+
+
+class BackgroundWriteTest(unittest.TestCase):
+    def setUp(self):
+        self.directory = tempfile.TemporaryDirectory()
+        self.filename = os.path.join(self.directory.name, "tasks.csv")
+
+    def tearDown(self):
+        self.directory.cleanup()
+
+    def test_notes_edit_during_debounced_flush_is_kept(self):
+        debounced = DebouncedStorage(CsvStorage(self.filename), delay=0.01)
+        todo_list = ToDoList(self.filename, storage=debounced)
+        task = Task("کار", "", "متوسط")
+        todo_list.add_task(task)
+        debounced.flush()
+
+        real_encode = base64.b64encode
+        encoding = threading.Event()
+        edited = threading.Event()
+
+        def encode(data):
+            # اگر رشته نویسنده یادداشت را رمزگذاری کند، ویرایش بعدی کاربر درست
+            # در میانه همین رمزگذاری انجام می‌شود
+            if threading.current_thread() is debounced._thread and not encoding.is_set():
+                encoding.set()
+                edited.wait(5)
+            return real_encode(data)
+
+        with mock.patch.object(base64, "b64encode", encode):
+            todo_list.update_notes(task.task_id, "یادداشت قدیمی")
+            encoding.wait(0.5)
+            todo_list.update_notes(task.task_id, "یادداشت تازه")
+            edited.set()
+            debounced.flush()
+            debounced.close()
+
+        reloaded = ToDoList(self.filename, storage=CsvStorage(self.filename))
+        self.assertEqual(reloaded.tasks[0].notes, "یادداشت تازه")
+
+    def test_debounced_save_keeps_state_at_request_time(self):
+        debounced = DebouncedStorage(CsvStorage(self.filename), delay=60)
+        todo_list = ToDoList(self.filename, storage=debounced)
+        task = Task("کار", "", "متوسط")
+        todo_list.add_task(task)
+        # تغییر در جای کار پس از درخواست ذخیره روی ردیف در انتظار اثری ندارد
+        task.name = "تغییر ذخیره نشده"
+        debounced.close()
+
+        reloaded = ToDoList(self.filename, storage=CsvStorage(self.filename))
+        self.assertEqual(reloaded.tasks[0].name, "کار")
+
+    def test_failed_debounced_write_is_requeued(self):
+        journal = JournalStorage(self.filename, fsync=False)
+        debounced = DebouncedStorage(journal, delay=60)
+        todo_list = ToDoList(self.filename, storage=debounced)
+        first, second = Task("اول", "", "متوسط"), Task("دوم", "", "متوسط")
+        todo_list.add_tasks([first, second])
+
+        with mock.patch.object(journal, "record", side_effect=OSError("disk full")):
+            debounced.flush()
+        self.assertEqual(debounced.writes, 0)
+        # تغییر تازه‌تر روی همان کار بر نسخه بازگشته به صف مقدم است
+        todo_list.toggle_task(second.task_id)
+        todo_list.add_task(Task("سوم", "", "متوسط"))
+        debounced.close()
+
+        reloaded = ToDoList(self.filename, storage=JournalStorage(self.filename, fsync=False))
+        self.assertEqual(sorted(task.name for task in reloaded.tasks), ["اول", "دوم", "سوم"])
+        self.assertFalse(reloaded.get_task(first.task_id).is_completed())
+        self.assertTrue(reloaded.get_task(second.task_id).is_completed())
+        reloaded.close()
+
+    def test_to_list_does_not_change_task(self):
+        task = Task("کار", "", "متوسط", notes="یادداشت")
+        before = {name: getattr(task, name) for name in Task.__slots__ if hasattr(task, name)}
+        row = task.to_list()
+        after = {name: getattr(task, name) for name in Task.__slots__ if hasattr(task, name)}
+        self.assertEqual(before, after)
+        self.assertEqual(base64.b64decode(row[15]).decode("utf-8"), "یادداشت")
+
+
+if __name__ == "__main__":
+    unittest.main()
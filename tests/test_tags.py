@@ -0,0 +1,47 @@
+# test_tags.py
+
+import unittest
+
+from todo_app.logic import Task
+from todo_app.tags import TagIndex
+
+
+def _task(name, tags):
+    return Task(name, "", "متوسط", tags=tags)
+
+
+class TagIndexOrdinalTest(unittest.TestCase):
+    def test_removed_ordinal_is_reused(self):
+        first, second, third = _task("اول", "فوری"), _task("دوم", "خانه,فوری"), _task("سوم", "کار")
+        index = TagIndex([first, second, third])
+        ordinal = index._ordinals[second.task_id]
+
+        index.remove(second)
+        self.assertEqual(index.query("خانه"), set())
+        self.assertEqual(index.query("فوری"), {first.task_id})
+
+        fourth = _task("چهارم", "کار")
+        index.add(fourth)
+        self.assertEqual(index._ordinals[fourth.task_id], ordinal)
+        self.assertEqual(len(index._ids), 3)
+        # برچسب‌های کار حذف شده به کار تازه با همان ordinal نمی‌رسند
+        self.assertEqual(index.query("کار"), {third.task_id, fourth.task_id})
+        self.assertEqual(index.query("!کار"), {first.task_id})
+        self.assertEqual(index.tags(), {"فوری": 1, "کار": 2})
+
+    def test_update_keeps_ordinal(self):
+        task = _task("کار", "الف")
+        other = _task("دیگر", "ب")
+        index = TagIndex([task, other])
+        ordinal = index._ordinals[task.task_id]
+
+        task.tags = ("ب",)
+        index.update(task, task)
+        self.assertEqual(index._ordinals[task.task_id], ordinal)
+        self.assertEqual(index.query("ب"), {task.task_id, other.task_id})
+        self.assertEqual(index.query("الف"), set())
+        self.assertEqual(len(index), 2)
+
+
+if __name__ == "__main__":
+    unittest.main()
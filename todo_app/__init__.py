@@ -0,0 +1,6 @@
+# __init__.py
+
+import time
+
+# زمان شروع بارگذاری بسته؛ مبدأ زمان‌گیری مراحل راه‌اندازی (--profile-startup)
+STARTED = time.perf_counter()
@@ -1,34 +1,92 @@
 # app.py
 
 import tkinter as tk
-from tkinter import ttk, messagebox, filedialog, font
+from tkinter import ttk, messagebox, filedialog, font, simpledialog
+import argparse
+import base64
+import bisect
 import os
-import tksvg
+from datetime import date, timedelta
 
-from .logic import Task, ToDoList
+from .icons import THEMED_MARKER, IconCache, cache_dir, icon_size
+from .logic import Task, ToDoList, classify_due_dates
+from .importer import ImportJob
+from .notes import NotesRenderer, content_key
+from .smartlists import seconds_until_tomorrow
+from .reminders import ReminderScheduler, create_notifier
+from . import profiling, watchdog
+from .watchdog import Watchdog
 
 
 # ------------------ مدیریت آیکون ------------------
 class IconManager:
-    """کلاسی برای مدیریت و بارگذاری آیکون‌ها."""
+    """کلاسی برای مدیریت و بارگذاری آیکون‌ها.
 
-    def __init__(self, icons_path):
+    بیت‌مپ‌های رسم شده در IconCache (روی دیسک) نگه داشته می‌شوند، بنابراین SVG
+    فقط وقتی با tksvg رسم می‌شود که فایل آن یا اندازه و رنگ درخواستی تازه باشد.
+    اندازه آیکون‌ها در ضریب DPI نمایشگر (scale) ضرب می‌شود و بیت‌مپ‌های همین
+    اندازه هنگام ساخت در پس‌زمینه از دیسک خوانده می‌شوند. آیکون‌هایی که از
+    currentColor استفاده می‌کنند با رنگ متن تم رسم و با تغییر تم در جا عوض می‌شوند.
+    """
+
+    def __init__(self, icons_path, scale=1.0, color=None):
         self.icons_path = icons_path
+        self.scale = scale
+        self.color = color
         self.icons = {}
+        self.cache = IconCache(icons_path, cache_dir())
+        self.cache.prewarm(icon_size(scale), color)
 
     def get_icon(self, name, scale=1.0):
-        if name in self.icons:
-            return self.icons[name]
-
+        size = icon_size(scale * self.scale)
+        key = (name, size)
+        if key in self.icons:
+            return self.icons[key]
+
+        image = self._load(name, size)
+        if image is not None:
+            self.icons[key] = image
+        return image
+
+    def _load(self, name, size, image=None):
+        """تصویر آیکون از cache (یا با رسم SVG)؛ اگر image داده شود محتوای آن جایگزین می‌شود."""
         filepath = os.path.join(self.icons_path, name)
         try:
-            icon_image = tksvg.SvgImage(file=filepath, scaletowidth=int(20 * scale))
-            self.icons[name] = icon_image
-            return icon_image
+            data = self.cache.bitmap(name, size, self.color)
+            if data is None:
+                rendered = self._rasterize(filepath, size)
+                data = self.cache.store(
+                    name, size, self.color, lambda path: rendered.write(path, format="png")
+                )
+            # اگر cache روی دیسک در دسترس نباشد خود تصویر SVG استفاده می‌شود
+            source = rendered if data is None else tk.PhotoImage(data=data, format="png")
+            if image is None:
+                return source
+            image.blank()
+            image.tk.call(image.name, "copy", source.name)
+            return image
         except Exception as e:
             print(f"خطا در بارگذاری آیکون '{filepath}': {e}")
             return None
 
+    def _rasterize(self, filepath, size):
+        import tksvg
+
+        with open(filepath, "rb") as file:
+            svg = file.read()
+        if self.color and THEMED_MARKER in svg:
+            svg = svg.replace(THEMED_MARKER, self.color.encode("ascii"))
+        return tksvg.SvgImage(data=svg.decode("utf-8"), scaletowidth=size)
+
+    def set_color(self, color):
+        """رنگ آیکون‌های تم‌پذیر را عوض می‌کند؛ تصویرها در جا به‌روز می‌شوند."""
+        if color == self.color:
+            return
+        self.color = color
+        for (name, size), image in self.icons.items():
+            if self.cache.themed(name):
+                self._load(name, size, image)
+
 
 # ------------------ مدیریت تم ------------------
 class ThemeManager:
@@ -63,6 +121,17 @@ class ThemeManager:
             "done_fg": "#a9a9a9",
             "button_bg": "#555555",
         }
+        # رنگ پس‌زمینه ردیف کارهای دارای برچسب‌های خاص (روشن، تاریک)
+        self.tag_colors = {
+            "فوری": ("#ffb3b3", "#a02020"),
+            "مهم": ("#ffd9a0", "#8a5a00"),
+        }
+
+    def set_tag_color(self, tag, light, dark=None):
+        """رنگ یک برچسب را تعیین کرده و تم را دوباره اعمال می‌کند."""
+        self.tag_colors[tag] = (light, dark or light)
+        self.apply_theme()
+        self.app.refresh_task_list()
 
     def apply_theme(self):
         theme = (
@@ -115,6 +184,14 @@ class ThemeManager:
         )
         self.app.task_list_frame.tree.tag_configure("done", foreground=theme["done_fg"])
 
+        # برچسب‌های رنگی؛ ردیف‌ها فقط برای این برچسب‌ها تگ «tag:<نام>» می‌گیرند
+        dark = self.app.current_theme != "light"
+        for tag, colors in self.tag_colors.items():
+            self.app.task_list_frame.tree.tag_configure(f"tag:{tag}", background=colors[dark])
+        self.app.task_list_frame.colored_tags = frozenset(self.tag_colors)
+        self.app.notes_frame.apply_theme(theme)
+        self.app.icon_manager.set_color(theme["fg"])
+
 
 # ------------------ فریم ورودی‌ها (آپدیت شده) ------------------
 class InputFrame(ttk.Frame):
@@ -172,6 +249,13 @@ class InputFrame(ttk.Frame):
         self.category_combo.grid(row=2, column=3, padx=5, pady=5, sticky="w")
         self.update_categories()
 
+        # ردیف چهارم: برچسب‌ها
+        ttk.Label(self, text="برچسب‌ها (با کاما):").grid(
+            row=3, column=0, padx=5, pady=5, sticky="w"
+        )
+        self.tags_entry = ttk.Entry(self, width=30)
+        self.tags_entry.grid(row=3, column=1, padx=5, pady=5, sticky="ew")
+
         # دکمه افزودن
         add_icon = self.controller.icon_manager.get_icon("Add.svg")
         add_button = ttk.Button(
@@ -183,7 +267,7 @@ class InputFrame(ttk.Frame):
         )
         if not add_icon:
             add_button.config(text="افزودن کار")
-        add_button.grid(row=3, column=3, padx=10, pady=10, sticky="e")
+        add_button.grid(row=4, column=3, padx=10, pady=10, sticky="e")
 
         self.columnconfigure(1, weight=1)
 
@@ -203,17 +287,156 @@ class InputFrame(ttk.Frame):
         self.name_entry.delete(0, tk.END)
         self.desc_entry.delete(0, tk.END)
         self.due_date_entry.delete(0, tk.END)
+        self.tags_entry.delete(0, tk.END)
         self.category_combo.set("بدون دسته")
 
 
+# ------------------ فریم فیلترها ------------------
+class FilterFrame(ttk.Frame):
+    """فیلتر لیست بر اساس دسته‌بندی، اولویت، وضعیت و سررسید (از طریق ایندکس‌های ToDoList)."""
+
+    ALL = "همه"
+    DUE_OPTIONS = (ALL, "امروز", "۷ روز آینده", "گذشته از موعد", "بدون سررسید")
+    # گزینه سررسید -> شرط due در تعریف لیست هوشمند
+    DUE_RULES = {"امروز": "today", "۷ روز آینده": "week", "گذشته از موعد": "overdue", "بدون سررسید": "none"}
+
+    def __init__(self, parent, controller):
+        super().__init__(parent, padding=(10, 0))
+        self.controller = controller
+
+        ttk.Label(self, text="لیست:").pack(side=tk.LEFT, padx=(0, 5))
+        self.smart_combo = self._combo((self.ALL,), 14)
+        ttk.Button(self, text="ذخیره لیست", command=self.save_smart_list).pack(side=tk.LEFT, padx=3)
+        ttk.Button(self, text="حذف لیست", command=self.delete_smart_list).pack(side=tk.LEFT, padx=3)
+
+        ttk.Label(self, text="فیلتر:").pack(side=tk.LEFT, padx=(10, 5))
+        self.category_combo = self._combo((self.ALL,), 14)
+        self.priority_combo = self._combo((self.ALL, "پایین", "متوسط", "بالا"), 8)
+        self.status_combo = self._combo((self.ALL, "انجام نشده", "انجام شده"), 10)
+        self.due_combo = self._combo(self.DUE_OPTIONS, 14)
+        ttk.Label(self, text="برچسب:").pack(side=tk.LEFT, padx=(8, 3))
+        # عبارت برچسب مثل «فوری & !خانه» یا «(کار | مهم) نه بعدا»
+        self.tags_var = tk.StringVar()
+        self.tags_entry = ttk.Entry(self, textvariable=self.tags_var, width=20)
+        self.tags_entry.pack(side=tk.LEFT, padx=3)
+        self.tags_var.trace_add("write", lambda *args: self.controller.schedule_search())
+        ttk.Button(self, text="حذف فیلترها", command=self.clear).pack(side=tk.LEFT, padx=5)
+        self.update_categories()
+        self.update_smart_lists()
+
+    def _combo(self, values, width):
+        combo = ttk.Combobox(self, values=values, width=width, state="readonly")
+        combo.set(self.ALL)
+        combo.pack(side=tk.LEFT, padx=3)
+        combo.bind("<<ComboboxSelected>>", lambda event: self.controller.refresh_task_list())
+        return combo
+
+    def update_categories(self):
+        """به‌روزرسانی گزینه‌های دسته‌بندی."""
+        self.category_combo["values"] = (self.ALL, *self.controller.todo_list.get_all_categories())
+
+    def update_smart_lists(self):
+        """به‌روزرسانی گزینه‌های لیست‌های هوشمند."""
+        names = self.controller.todo_list.smart_lists.names()
+        self.smart_combo["values"] = (self.ALL, *names)
+        if self.smart_combo.get() not in names:
+            self.smart_combo.set(self.ALL)
+
+    def save_smart_list(self):
+        """فیلترهای فعلی را به عنوان یک لیست هوشمند نام‌دار ذخیره می‌کند."""
+        definition = self.get_definition()
+        if not definition:
+            messagebox.showwarning("لیست هوشمند", "ابتدا حداقل یک فیلتر انتخاب کنید.")
+            return
+        name = simpledialog.askstring("لیست هوشمند", "نام لیست:", parent=self)
+        if not name or not name.strip():
+            return
+        definition["name"] = name.strip()
+        try:
+            self.controller.todo_list.save_smart_list(definition)
+        except ValueError as e:
+            messagebox.showwarning("لیست هوشمند", f"خطا در تعریف لیست: {e}")
+            return
+        self.clear(refresh=False)
+        self.update_smart_lists()
+        self.smart_combo.set(definition["name"])
+        self.controller.refresh_task_list()
+
+    def delete_smart_list(self):
+        name = self.smart_combo.get()
+        if name == self.ALL:
+            return
+        if messagebox.askyesno("لیست هوشمند", f"لیست «{name}» حذف شود؟"):
+            self.controller.todo_list.delete_smart_list(name)
+            self.update_smart_lists()
+            self.controller.refresh_task_list()
+
+    def get_definition(self):
+        """فیلترهای انتخاب شده به شکل تعریف یک لیست هوشمند (بدون نام)."""
+        definition = {}
+        for key, combo in (
+            ("category", self.category_combo),
+            ("priority", self.priority_combo),
+            ("status", self.status_combo),
+        ):
+            if combo.get() != self.ALL:
+                definition[key] = combo.get()
+        due = self.due_combo.get()
+        if due in self.DUE_RULES:
+            definition["due"] = self.DUE_RULES[due]
+        if self.tags_var.get().strip():
+            definition["tags"] = self.tags_var.get().strip()
+        return definition
+
+    def clear(self, refresh=True):
+        for combo in (self.category_combo, self.priority_combo, self.status_combo, self.due_combo):
+            combo.set(self.ALL)
+        self.tags_var.set("")
+        if refresh:
+            self.controller.refresh_task_list()
+
+    def get_filters(self):
+        """شرط‌های انتخاب شده به شکل آرگومان‌های ToDoList.filter_tasks.
+
+        بازه‌های تاریخ در هر بار فراخوانی از روی تاریخ امروز محاسبه می‌شوند.
+        """
+        filters = {}
+        if self.smart_combo.get() != self.ALL:
+            filters["smart_list"] = self.smart_combo.get()
+        for key, combo in (
+            ("category", self.category_combo),
+            ("priority", self.priority_combo),
+            ("status", self.status_combo),
+        ):
+            if combo.get() != self.ALL:
+                filters[key] = combo.get()
+
+        due = self.due_combo.get()
+        today = date.today()
+        if due == "امروز":
+            filters["due_from"] = filters["due_to"] = today
+        elif due == "۷ روز آینده":
+            filters["due_from"], filters["due_to"] = today, today + timedelta(days=6)
+        elif due == "گذشته از موعد":
+            filters["due_to"] = today - timedelta(days=1)
+            filters.setdefault("status", "انجام نشده")
+        elif due == "بدون سررسید":
+            filters["has_due"] = False
+
+        if self.tags_var.get().strip():
+            filters["tags"] = self.tags_var.get()
+        return filters
+
+
 # ------------------ فریم لیست کارها ------------------
 class TaskListFrame(ttk.Frame):
     def __init__(self, parent, controller):
         super().__init__(parent, padding="10")
         self.controller = controller
 
-        # ستون‌های جدید: status, name, description, priority, category, due_date, due_status
-        columns = ("status", "name", "description", "priority", "category", "due_date", "due_status")
+        columns = (
+            "status", "name", "description", "priority", "category", "tags", "due_date", "due_status"
+        )
         self.tree = ttk.Treeview(
             self, columns=columns, show="headings", height=15, selectmode="extended"
         )
@@ -227,78 +450,479 @@ class TaskListFrame(ttk.Frame):
         self.tree.column("priority", width=80, anchor="center")
         self.tree.heading("category", text="دسته‌بندی")
         self.tree.column("category", width=100, anchor="center")
+        self.tree.heading("tags", text="برچسب‌ها")
+        self.tree.column("tags", width=120, anchor="w")
         self.tree.heading("due_date", text="سررسید")
         self.tree.column("due_date", width=120, anchor="center")
         self.tree.heading("due_status", text="وضعیت سررسید")
         self.tree.column("due_status", width=100, anchor="center")
 
+        # پیکربندی تگ‌های رنگی برای وضعیت سررسید
+        self.tree.tag_configure("overdue", background="#ffcccc")
+        self.tree.tag_configure("due_today", background="#fff9cc")
+        # برچسب‌هایی که رنگ دارند (ThemeManager تنظیم می‌کند)
+        self.colored_tags = frozenset()
+
+        # در حالت افزایشی، مقادیر و تگ‌های رسم شده هر ردیف نگه داشته می‌شود
+        # تا در بازخوانی بعدی فقط ردیف‌های تغییر یافته به Treeview ارسال شوند
+        self.incremental = True
+        self._rendered = {}
+        self._order = []
+        # تعداد فراخوانی‌های Tcl در آخرین بازخوانی
+        self.last_refresh_calls = 0
+
+        # حالت مجازی: برای لیست‌های بزرگ فقط ردیف‌های قابل مشاهده (به علاوه
+        # چند ردیف اضافه) در Treeview نگه داشته می‌شوند و انتخاب روی ردیف‌های
+        # منطقی (شناسه کارها) نگهداری می‌شود
+        self.virtual_threshold = 2000
+        self.overscan = 10
+        self.virtual = False
+        self._tasks = []
+        self._offset = 0
+        self._positions = None
+        self._selected = set()
+        self._anchor = None
+
         self.tree.bind("<Button-1>", self.controller.handle_tree_click)
+        self.tree.bind("<Button-1>", self._on_click, add="+")
         self.tree.bind("<Delete>", self.controller.handle_delete_key)
         self.tree.bind("<Return>", self.controller.confirm_deletion)
+        self.tree.bind("<<TreeviewSelect>>", self._on_select)
+        self.tree.bind("<Configure>", lambda event: self._render_window())
+        self.tree.bind("<MouseWheel>", self._on_mousewheel)
+        self.tree.bind("<Button-4>", lambda event: self._on_wheel_units(-3))
+        self.tree.bind("<Button-5>", lambda event: self._on_wheel_units(3))
+        self.tree.bind("<Up>", lambda event: self._on_arrow(-1))
+        self.tree.bind("<Down>", lambda event: self._on_arrow(1))
 
         self.tree.pack(fill=tk.BOTH, expand=True, side=tk.LEFT)
-        scrollbar = ttk.Scrollbar(self, orient=tk.VERTICAL, command=self.tree.yview)
-        self.tree.configure(yscroll=scrollbar.set)
-        scrollbar.pack(side=tk.RIGHT, fill=tk.Y)
+        self.scrollbar = ttk.Scrollbar(self, orient=tk.VERTICAL, command=self._on_scrollbar)
+        self.tree.configure(yscroll=self._on_tree_yscroll)
+        self.scrollbar.pack(side=tk.RIGHT, fill=tk.Y)
 
     def refresh(self, tasks):
         """لیست کارها را بازخوانی می‌کند."""
+        self._tasks = tasks
+        self._positions = None
+        self.virtual = len(tasks) >= self.virtual_threshold
+        if self.virtual:
+            self._render_window()
+            return
+
+        self._selected.clear()
+        rows = self._build_rows(tasks)
+        if self.incremental:
+            self._reconcile(rows)
+        else:
+            self._rebuild(rows)
+
+    # ---------- حالت مجازی ----------
+
+    def _visible_count(self):
+        """تعداد ردیف‌هایی که در ارتفاع فعلی Treeview جا می‌شوند."""
+        row_height = 25
+        header_height = 25
+        height = self.tree.winfo_height()
+        rows = (height - header_height) // row_height
+        return max(rows, int(self.tree.cget("height")))
+
+    def _render_window(self):
+        """فقط ردیف‌های پنجره قابل مشاهده را از روی مدل می‌سازد و رسم می‌کند."""
+        if not self.virtual:
+            return
+        total = len(self._tasks)
+        visible = self._visible_count()
+        self._offset = max(0, min(self._offset, total - visible))
+
+        window = self._tasks[self._offset:self._offset + visible + self.overscan]
+        self._reconcile(self._build_rows(window))
+        self.tree.yview_moveto(0)
+
+        # بازگرداندن انتخاب منطقی برای ردیف‌های داخل پنجره
+        selected = [task.task_id for task in window if task.task_id in self._selected]
+        self.tree.selection_set(selected)
+
+        if total:
+            first = self._offset / total
+            last = min(1.0, (self._offset + visible) / total)
+            self.scrollbar.set(first, last)
+        else:
+            self.scrollbar.set(0.0, 1.0)
+
+    def scroll_to(self, offset):
+        """پنجره نمایش را به ردیف منطقی offset منتقل می‌کند."""
+        if offset != self._offset:
+            self._offset = offset
+            self._render_window()
+
+    def _on_tree_yscroll(self, first, last):
+        # در حالت مجازی، محدوده اسکرول بار بر اساس تعداد کل ردیف‌ها تعیین می‌شود
+        if not self.virtual:
+            self.scrollbar.set(first, last)
+
+    def _on_scrollbar(self, *args):
+        if not self.virtual:
+            self.tree.yview(*args)
+            return
+        visible = self._visible_count()
+        if args[0] == "moveto":
+            self.scroll_to(int(float(args[1]) * len(self._tasks)))
+        elif args[0] == "scroll":
+            step = visible if args[2] == "pages" else 1
+            self.scroll_to(self._offset + int(args[1]) * step)
+
+    def _on_mousewheel(self, event):
+        return self._on_wheel_units(-3 if event.delta > 0 else 3)
+
+    def _on_wheel_units(self, units):
+        if not self.virtual:
+            return None
+        self.scroll_to(self._offset + units)
+        return "break"
+
+    def _on_arrow(self, step):
+        """حرکت با کلیدهای جهت در لبه پنجره، پنجره را اسکرول می‌کند."""
+        if not self.virtual:
+            return None
+        focus = self.tree.focus()
+        position = self._position_of(focus)
+        if position is None:
+            return None
+        target = position + step
+        if not 0 <= target < len(self._tasks):
+            return "break"
+        visible = self._visible_count()
+        if target < self._offset:
+            self.scroll_to(target)
+        elif target >= self._offset + visible:
+            self.scroll_to(target - visible + 1)
+        else:
+            return None
+
+        task_id = self._tasks[target].task_id
+        self._selected = {task_id}
+        self._anchor = task_id
+        self.tree.focus(task_id)
+        self.tree.selection_set(task_id)
+        return "break"
+
+    def _position_of(self, task_id):
+        """جایگاه منطقی یک کار در لیست فعلی."""
+        if self._positions is None:
+            self._positions = {task.task_id: i for i, task in enumerate(self._tasks)}
+        return self._positions.get(task_id)
+
+    def _on_click(self, event):
+        """مدیریت انتخاب منطقی هنگام کلیک (به‌خصوص Shift+کلیک فراتر از پنجره)."""
+        if not self.virtual:
+            return None
+        row_id = self.tree.identify_row(event.y)
+        if not row_id:
+            return None
+
+        shift = event.state & 0x0001
+        control = event.state & 0x0004
+        if shift and self._anchor is not None:
+            start = self._position_of(self._anchor)
+            end = self._position_of(row_id)
+            if start is not None and end is not None:
+                if start > end:
+                    start, end = end, start
+                self._selected = {task.task_id for task in self._tasks[start:end + 1]}
+                self._render_window()
+                self.tree.focus(row_id)
+                return "break"
+        if not control:
+            # کلیک ساده انتخاب‌های خارج از پنجره را هم پاک می‌کند
+            self._selected.clear()
+        self._anchor = row_id
+        return None
+
+    def _on_select(self, event):
+        """همگام‌سازی انتخاب منطقی با انتخاب ردیف‌های داخل پنجره."""
+        if self.virtual:
+            selected = set(self.tree.selection())
+            for iid in self._order:
+                if iid in selected:
+                    self._selected.add(iid)
+                else:
+                    self._selected.discard(iid)
+        self.controller.on_selection_changed()
+
+    def selected_task_ids(self):
+        """شناسه کارهای انتخاب شده را به ترتیب لیست برمی‌گرداند."""
+        if not self.virtual:
+            return list(self.tree.selection())
+        selected = [
+            task_id for task_id in self._selected if self._position_of(task_id) is not None
+        ]
+        return sorted(selected, key=self._position_of)
+
+    def _build_rows(self, tasks):
+        """ردیف‌های Treeview را با یک تاریخ مرجع مشترک برای همه کارها می‌سازد."""
+        due_infos = classify_due_dates(tasks, date.today())
+        return [
+            (task.task_id, *self._build_row(task, due_info))
+            for task, due_info in zip(tasks, due_infos)
+        ]
+
+    def _build_row(self, task, due_info):
+        """مقادیر ستون‌ها و تگ‌های یک ردیف را برای یک کار محاسبه می‌کند."""
+        is_overdue, is_due_today, due_date_display, due_status_display = due_info
+
+        # نمایش وضعیت با آیکون تیک
+        status_text = "☑" if task.is_completed() else "☐"
+
+        # آیکون تکرارشونده
+        name_display = task.name
+        if task.is_recurring:
+            name_display = f"🔁 {task.name}"
+
+        # نمایش پیشرفت زیرکارها
+        description_display = task.description
+        if task.has_subtasks():
+            progress = task.get_subtask_progress()
+            if progress:
+                completed, total = progress
+                description_display = f"{task.description} ({completed}/{total} انجام شده)"
+
+        # دسته‌بندی
+        category_display = task.category if task.category else "بدون دسته"
+
+        # تعیین تگ‌ها برای رنگ‌آمیزی
+        tags = [task.priority]
+        if task.is_completed():
+            tags.append("done")
+        if is_overdue:
+            tags.append("overdue")
+        elif is_due_today:
+            tags.append("due_today")
+        colored_tags = self.colored_tags
+        if colored_tags:
+            tags.extend(f"tag:{tag}" for tag in task.tags if tag in colored_tags)
+
+        values = (
+            status_text,
+            name_display,
+            description_display,
+            task.priority,
+            category_display,
+            "، ".join(task.tags),
+            due_date_display,
+            due_status_display
+        )
+        return values, tuple(tags)
+
+    def _rebuild(self, rows):
+        """همه ردیف‌ها را حذف و دوباره درج می‌کند (حالت غیرافزایشی)."""
         self.tree.delete(*self.tree.get_children())
+        for iid, values, tags in rows:
+            self.tree.insert("", tk.END, iid=iid, values=values, tags=tags)
+        self._rendered = {iid: (values, tags) for iid, values, tags in rows}
+        self._order = [row[0] for row in rows]
+        self.last_refresh_calls = len(rows) + 2
+
+    def _reconcile(self, rows):
+        """فقط ردیف‌هایی از Treeview را تغییر می‌دهد که واقعاً عوض شده‌اند."""
+        calls = 0
+        new_ids = [row[0] for row in rows]
+        new_positions = {iid: i for i, iid in enumerate(new_ids)}
+
+        # ۱. حذف ردیف‌هایی که دیگر وجود ندارند (در یک فراخوانی)
+        stale = [iid for iid in self._order if iid not in new_positions]
+        if stale:
+            self.tree.delete(*stale)
+            calls += 1
+            for iid in stale:
+                del self._rendered[iid]
+        survivors = [iid for iid in self._order if iid in new_positions]
+
+        # ۲. ردیف‌هایی که در بلندترین زیردنباله صعودی نیستند باید جابه‌جا شوند
+        keep = self._longest_increasing_run(survivors, new_positions)
+        moving = [iid for iid in survivors if iid not in keep]
+        if moving:
+            self.tree.detach(*moving)
+            calls += 1
+        order = [iid for iid in survivors if iid in keep]
+
+        # ۳. درج ردیف‌های جدید، جابه‌جایی و به‌روزرسانی مقادیر تغییر یافته
+        for index, (iid, values, tags) in enumerate(rows):
+            rendered = self._rendered.get(iid)
+            if rendered is None:
+                self.tree.insert("", index, iid=iid, values=values, tags=tags)
+                order.insert(index, iid)
+                calls += 1
+            else:
+                if iid not in keep:
+                    self.tree.move(iid, "", index)
+                    order.insert(index, iid)
+                    calls += 1
+                if rendered != (values, tags):
+                    self.tree.item(iid, values=values, tags=tags)
+                    calls += 1
+            self._rendered[iid] = (values, tags)
+
+        self._order = order
+        self.last_refresh_calls = calls
+
+    @staticmethod
+    def _longest_increasing_run(order, positions):
+        """بزرگ‌ترین مجموعه از ردیف‌ها که ترتیب نسبی‌شان تغییر نکرده است."""
+        tails = []
+        tail_ids = []
+        previous = {}
+        for iid in order:
+            position = positions[iid]
+            i = bisect.bisect_left(tails, position)
+            previous[iid] = tail_ids[i - 1] if i > 0 else None
+            if i == len(tails):
+                tails.append(position)
+                tail_ids.append(iid)
+            else:
+                tails[i] = position
+                tail_ids[i] = iid
 
-        # پیکربندی تگ‌های رنگی برای وضعیت سررسید
-        self.tree.tag_configure("overdue", background="#ffcccc")
-        self.tree.tag_configure("due_today", background="#fff9cc")
+        keep = set()
+        iid = tail_ids[-1] if tail_ids else None
+        while iid is not None:
+            keep.add(iid)
+            iid = previous[iid]
+        return keep
 
-        for i, task in enumerate(tasks):
-            # نمایش وضعیت با آیکون تیک
-            status_text = "☑" if task.is_completed() else "☐"
-
-            # آیکون تکرارشونده
-            name_display = task.name
-            if task.is_recurring:
-                name_display = f"🔁 {task.name}"
-
-            # نمایش پیشرفت زیرکارها
-            description_display = task.description
-            if task.has_subtasks():
-                progress = task.get_subtask_progress()
-                if progress:
-                    completed, total = progress
-                    description_display = f"{task.description} ({completed}/{total} انجام شده)"
-
-            # دسته‌بندی
-            category_display = task.category if task.category else "بدون دسته"
-
-            # تاریخ سررسید با فرمت نسبی
-            due_date_display = task.get_formatted_due_date()
-
-            # وضعیت سررسید
-            due_status_display = task.get_due_status()
-
-            # تعیین تگ‌ها برای رنگ‌آمیزی
-            tags = [task.priority]
-            if task.is_completed():
-                tags.append("done")
-            if task.is_overdue():
-                tags.append("overdue")
-            elif task.is_due_today():
-                tags.append("due_today")
-
-            self.tree.insert(
-                "",
-                tk.END,
-                iid=i,
-                values=(
-                    status_text,
-                    name_display,
-                    description_display,
-                    task.priority,
-                    category_display,
-                    due_date_display,
-                    due_status_display
-                ),
-                tags=tags,
-            )
+
+# ------------------ فریم یادداشت‌ها ------------------
+class NotesFrame(ttk.Frame):
+    """ویرایش یادداشت‌های کار انتخاب شده و پیش‌نمایش Markdown آن.
+
+    پیش‌نمایش و ذخیره پس از توقف تایپ (RENDER_DELAY و SAVE_DELAY) انجام
+    می‌شوند و HTML از cache NotesRenderer خوانده می‌شود. tkhtmlview فقط هنگام
+    اولین پیش‌نمایش import می‌شود.
+    """
+
+    RENDER_DELAY = 300
+    SAVE_DELAY = 1000
+
+    def __init__(self, parent, controller):
+        super().__init__(parent, padding=(10, 0, 10, 0))
+        self.controller = controller
+        self.renderer = NotesRenderer()
+        self.task_id = None
+        self._saved_text = ""
+        self._render_after = None
+        self._save_after = None
+        self._rendered_key = None
+
+        self.title_label = ttk.Label(self, text="یادداشت‌ها")
+        self.title_label.grid(row=0, column=0, columnspan=2, sticky="e")
+        self.editor = tk.Text(self, height=7, width=50, wrap="word", undo=True, font=("Tahoma", 10))
+        self.editor.grid(row=1, column=0, sticky="nsew", padx=(0, 5))
+        self.editor.bind("<<Modified>>", self._on_modified)
+        self.preview_frame = ttk.Frame(self)
+        self.preview_frame.grid(row=1, column=1, sticky="nsew")
+        self.preview = None
+        self.columnconfigure(0, weight=1)
+        self.columnconfigure(1, weight=1)
+        self.show_task(None)
+
+    def apply_theme(self, theme):
+        self.editor.config(
+            background=theme["entry_bg"], foreground=theme["fg"], insertbackground=theme["fg"]
+        )
+        if self.preview is not None:
+            self.preview.config(background=theme["tree_bg"], foreground=theme["fg"])
+
+    def _text(self):
+        return self.editor.get("1.0", "end-1c")
+
+    def show_task(self, task):
+        """یادداشت‌های task (یا هیچ، اگر None) را نمایش می‌دهد؛ تغییرات کار قبلی ابتدا ذخیره می‌شوند."""
+        task_id = task.task_id if task is not None else None
+        if task_id == self.task_id and task_id is not None:
+            return
+        self.flush()
+        self.task_id = task_id
+        self._saved_text = task.notes if task is not None else ""
+        self.editor.config(state=tk.NORMAL)
+        self.editor.delete("1.0", tk.END)
+        self.editor.insert("1.0", self._saved_text)
+        self.editor.edit_reset()
+        self.editor.edit_modified(False)
+        if task is None:
+            self.editor.config(state=tk.DISABLED)
+            self.title_label.config(text="یادداشت‌ها")
+        else:
+            self.title_label.config(text=f"یادداشت‌های «{task.name}»")
+        self.render()
+
+    def _on_modified(self, event=None):
+        if not self.editor.edit_modified():
+            return
+        self.editor.edit_modified(False)
+        if self.task_id is None:
+            return
+        for attribute, delay, callback in (
+            ("_render_after", self.RENDER_DELAY, self.render),
+            ("_save_after", self.SAVE_DELAY, self.save),
+        ):
+            after_id = getattr(self, attribute)
+            if after_id is not None:
+                self.after_cancel(after_id)
+            setattr(self, attribute, self.after(delay, callback))
+
+    def _ensure_preview(self):
+        if self.preview is not None:
+            return
+        try:
+            from tkhtmlview import HTMLScrolledText
+
+            self.preview = HTMLScrolledText(self.preview_frame, height=7, width=50)
+        except ImportError as e:
+            print(f"خطا در بارگذاری tkhtmlview (پیش‌نمایش به صورت متن نمایش داده می‌شود): {e}")
+            self.preview = tk.Text(self.preview_frame, height=7, width=50, wrap="word")
+        self.preview.pack(fill=tk.BOTH, expand=True)
+        theme_manager = self.controller.theme_manager
+        dark = self.controller.current_theme != "light"
+        self.apply_theme(theme_manager.dark_theme if dark else theme_manager.light_theme)
+
+    def render(self):
+        """پیش‌نمایش Markdown متن فعلی ویرایشگر."""
+        self._render_after = None
+        text = self._text()
+        key = content_key(text)
+        if key == self._rendered_key:
+            return
+        if self.preview is None and not text.strip():
+            # تا اولین یادداشت غیرخالی، tkhtmlview بارگذاری نمی‌شود
+            return
+        self._ensure_preview()
+        self._rendered_key = key
+        if hasattr(self.preview, "set_html"):
+            self.preview.set_html(self.renderer.render(text))
+        else:
+            self.preview.config(state=tk.NORMAL)
+            self.preview.delete("1.0", tk.END)
+            self.preview.insert("1.0", text)
+            self.preview.config(state=tk.DISABLED)
+
+    def save(self):
+        """تغییرات ویرایشگر را در یادداشت‌های کار ذخیره می‌کند."""
+        self._save_after = None
+        if self.task_id is None:
+            return
+        text = self._text()
+        if text == self._saved_text:
+            return
+        if self.controller.todo_list.update_notes(self.task_id, text):
+            self._saved_text = text
+
+    def flush(self):
+        """ذخیره‌سازی و پیش‌نمایش در انتظار را همین حالا انجام می‌دهد (مثلاً پیش از بستن برنامه)."""
+        for attribute in ("_render_after", "_save_after"):
+            after_id = getattr(self, attribute)
+            if after_id is not None:
+                self.after_cancel(after_id)
+                setattr(self, attribute, None)
+        self.save()
 
 
 # ------------------ فریم دکمه‌های عملیاتی (آپدیت شده) ------------------
@@ -330,12 +954,45 @@ class ActionFrame(ttk.Frame):
             text=" وارد کردن",
             image=import_icon,
             compound="left",
-            command=self.controller.import_from_csv_dialog,
+            command=self.controller.import_dialog,
         )
         if not import_icon:
             import_button.config(text="وارد کردن")
         import_button.pack(side=tk.LEFT, padx=5)
 
+        export_icon = self.controller.icon_manager.get_icon("Export.svg")
+        export_button = ttk.Button(
+            self,
+            text=" خروجی اکسل",
+            image=export_icon,
+            compound="left",
+            command=self.controller.export_dialog,
+        )
+        if not export_icon:
+            export_button.config(text="خروجی اکسل")
+        export_button.pack(side=tk.LEFT, padx=5)
+
+        stats_icon = self.controller.icon_manager.get_icon("Chart.svg")
+        stats_button = ttk.Button(
+            self,
+            text=" آمار",
+            image=stats_icon,
+            compound="left",
+            command=self.controller.open_stats,
+        )
+        if not stats_icon:
+            stats_button.config(text="آمار")
+        stats_button.pack(side=tk.LEFT, padx=5)
+
+        # جستجو در نام، توضیحات و یادداشت‌ها (با تأخیر پس از آخرین کلید)
+        ttk.Label(self, text="جستجو:").pack(side=tk.LEFT, padx=(10, 2))
+        self.search_var = tk.StringVar()
+        self.search_entry = ttk.Entry(self, textvariable=self.search_var, width=25)
+        self.search_entry.pack(side=tk.LEFT, padx=5)
+        self.search_var.trace_add("write", lambda *args: self.controller.schedule_search())
+        self.search_entry.bind("<FocusIn>", lambda event: self.controller.warm_search_index())
+        self.search_entry.bind("<Escape>", lambda event: self.search_var.set(""))
+
         # سمت راست: دکمه‌های عملیاتی
         delete_icon = self.controller.icon_manager.get_icon("Delete.svg")
         delete_button = ttk.Button(
@@ -363,38 +1020,402 @@ class ActionFrame(ttk.Frame):
         self.edit_button.pack(side=tk.RIGHT, padx=5)
 
 
+# ------------------ پنجره پیشرفت وارد/صادر کردن ------------------
+class ProgressDialog(tk.Toplevel):
+    """نمایش پیشرفت وارد یا صادر کردن فایل با امکان لغو؛ وضعیت با after() خوانده می‌شود.
+
+    job یک ImportJob یا ExportJob است و on_finish پس از پایان آن صدا زده می‌شود.
+    """
+
+    POLL_INTERVAL = 100
+
+    def __init__(self, controller, job, title, on_finish):
+        super().__init__(controller)
+        self.controller = controller
+        self.job = job
+        self.on_finish = on_finish
+        self.title(title)
+        self.transient(controller)
+        self.resizable(False, False)
+        self.protocol("WM_DELETE_WINDOW", self.job.cancel)
+
+        frame = ttk.Frame(self, padding="20")
+        frame.pack(fill=tk.BOTH, expand=True)
+        self.progressbar = ttk.Progressbar(frame, length=320, maximum=100)
+        self.progressbar.pack(fill=tk.X, pady=(0, 10))
+        self.status_label = ttk.Label(frame, text="در حال پردازش فایل...")
+        self.status_label.pack(fill=tk.X)
+        ttk.Button(frame, text="لغو", command=self.job.cancel).pack(side=tk.RIGHT, pady=(10, 0))
+
+        self.controller.theme_manager.apply_theme()
+        self.job.start()
+        self.after(self.POLL_INTERVAL, self._poll)
+
+    def _poll(self):
+        finished = self.job.poll()
+        fraction = self.job.fraction
+        if fraction is None:
+            # تعداد کل ردیف‌ها نامعلوم است
+            self.progressbar.config(mode="indeterminate")
+            self.progressbar.step(5)
+        else:
+            self.progressbar.config(mode="determinate", value=fraction * 100)
+        text = f"{self.job.rows_read} ردیف ({self.job.rows_per_second:.0f} ردیف در ثانیه)"
+        if self.job.bad_row_count:
+            text += f" - {self.job.bad_row_count} ردیف نامعتبر"
+        self.status_label.config(text=text)
+
+        if finished:
+            self.destroy()
+            self.on_finish(self.job)
+        else:
+            self.after(self.POLL_INTERVAL, self._poll)
+
+
+# ------------------ پنجره آمار ------------------
+class StatsWindow(tk.Toplevel):
+    """داشبورد آمار: خلاصه تعدادها و چهار نمودار.
+
+    داده نمودارها از شمارنده‌های نگهداری شده ToDoList.stats خوانده می‌شود و
+    رسم آن‌ها در رشته کاری ChartRenderer انجام می‌شود؛ فقط نمودارهایی که
+    داده‌شان تغییر کرده دوباره رسم می‌شوند. تا وقتی پنجره باز است تغییرات
+    کارها با مقایسه stats.version (هر REFRESH_INTERVAL میلی‌ثانیه) دنبال می‌شود.
+    """
+
+    REFRESH_INTERVAL = 1000
+    POLL_INTERVAL = 50
+    CHART_SIZE = (4.6, 2.8)
+
+    def __init__(self, controller, renderer):
+        super().__init__(controller)
+        self.controller = controller
+        self.renderer = renderer
+        self.title("آمار کارها")
+        self.protocol("WM_DELETE_WINDOW", self.close)
+
+        from .charts import CHARTS, TITLES
+
+        frame = ttk.Frame(self, padding="10")
+        frame.pack(fill=tk.BOTH, expand=True)
+        self.summary_label = ttk.Label(frame, text="")
+        self.summary_label.grid(row=0, column=0, columnspan=2, sticky="e", pady=(0, 10))
+
+        self.chart_labels = {}
+        self.images = {}
+        for index, name in enumerate(CHARTS):
+            row, column = divmod(index, 2)
+            cell = ttk.Frame(frame, padding="5")
+            cell.grid(row=row + 1, column=column, sticky="nsew")
+            ttk.Label(cell, text=TITLES[name]).pack(anchor="e")
+            label = ttk.Label(cell, text="در حال رسم نمودار...")
+            label.pack(fill=tk.BOTH, expand=True)
+            self.chart_labels[name] = label
+
+        self._version = None
+        self._pending = {}
+        self._poll_after = None
+        self._refresh_after = None
+        self.controller.theme_manager.apply_theme()
+        self.refresh()
+
+    def refresh(self):
+        """اگر کارها یا تم تغییر کرده باشند داده نمودارها را دوباره می‌خواند."""
+        from .charts import dashboard_data
+
+        self._refresh_after = self.after(self.REFRESH_INTERVAL, self.refresh)
+        stats = self.controller.todo_list.stats
+        theme_manager = self.controller.theme_manager
+        theme = theme_manager.light_theme if self.controller.current_theme == "light" else theme_manager.dark_theme
+        colors = (theme["bg"], theme["fg"])
+        today = date.today()
+        version = (stats.version, colors, today)
+        if version == self._version:
+            return
+        self._version = version
+
+        summary = stats.summary(today)
+        self.summary_label.config(
+            text=(
+                f"کل: {summary['total']}  |  انجام نشده: {summary['open']}  |  "
+                f"انجام شده: {summary['completed']}  |  گذشته از موعد: {summary['overdue']}"
+            )
+        )
+        for name, data in dashboard_data(stats, today).items():
+            self._pending[name] = self.renderer.submit(name, data, colors, self.CHART_SIZE)
+        if self._poll_after is None:
+            self._poll()
+
+    def _poll(self):
+        """تصویرهای رسم شده را (در رشته اصلی) نمایش می‌دهد."""
+        self._poll_after = None
+        for name, future in list(self._pending.items()):
+            if not future.done():
+                continue
+            del self._pending[name]
+            label = self.chart_labels[name]
+            try:
+                image = tk.PhotoImage(master=self, data=base64.b64encode(future.result()))
+            except Exception as e:
+                label.config(image="", text=f"خطا در رسم نمودار: {e}")
+                continue
+            self.images[name] = image
+            label.config(image=image, text="")
+        if self._pending:
+            self._poll_after = self.after(self.POLL_INTERVAL, self._poll)
+
+    def close(self):
+        for after_id in (self._poll_after, self._refresh_after):
+            if after_id is not None:
+                self.after_cancel(after_id)
+        self.controller.stats_window = None
+        self.destroy()
+
+
 # ------------------ کلاس اصلی برنامه ------------------
 class TodoApp(tk.Tk):
-    def __init__(self, icons_path):
+    # تأخیر جستجو پس از آخرین کلید (میلی‌ثانیه)
+    SEARCH_DELAY = 150
+    # بیشترین فاصله بررسی عوض شدن روز (میلی‌ثانیه)؛ خواب سیستم یا تغییر ساعت را پوشش می‌دهد
+    DAY_CHECK_INTERVAL = 3600 * 1000
+    # تعداد کارهای بارگذاری شده در هر مرحله و فاصله به‌روزرسانی لیست در حین بارگذاری (مرحله)
+    LOAD_BATCH = 2000
+    LOAD_REFRESH_EVERY = 5
+
+    def __init__(self, icons_path, notifier=None, startup=None):
+        """startup یک profiling.StartupProfile برای زمان‌گیری مراحل راه‌اندازی (یا None)."""
         super().__init__()
+        self.startup = startup
+        self.mark_startup("Tk")
         self.title("مدیریت لیست کارها")
 
-        self.todo_list = ToDoList()
-        self.icon_manager = IconManager(icons_path)
+        # کارها پس از نمایش پنجره به تدریج بارگذاری می‌شوند (load_tasks)
+        self.todo_list = ToDoList(load=False)
+        self._loader = None
+        self._load_steps = 0
         self.style = ttk.Style(self)
         self.theme_manager = ThemeManager(self)
+        # ضریب DPI نمایشگر (۹۶ DPI = ۱) برای اندازه آیکون‌ها
+        dpi_scale = self.winfo_fpixels("1i") / 96.0
+        self.icon_manager = IconManager(icons_path, dpi_scale, self.theme_manager.light_theme["fg"])
 
         self.current_theme = "light"
         self.priority_var = tk.StringVar(value="متوسط")
         self.delete_mode = False
+        self.search_query = ""
+        self._search_after = None
+        self._warm_after = None
+        self._filter_error = None
+        self._cleanup_after = None
+        self.chart_renderer = None
+        self.stats_window = None
 
         self.bind("<Return>", lambda event: self.add_task())
+        self.protocol("WM_DELETE_WINDOW", self.on_close)
 
         self.input_frame = InputFrame(self, self)
         self.input_frame.pack(fill=tk.X)
+        self.filter_frame = FilterFrame(self, self)
+        self.filter_frame.pack(fill=tk.X)
         self.task_list_frame = TaskListFrame(self, self)
         self.task_list_frame.pack(fill=tk.BOTH, expand=True)
+        self.notes_frame = NotesFrame(self, self)
+        self.notes_frame.pack(fill=tk.X)
         self.action_frame = ActionFrame(self, self)
         self.action_frame.pack(fill=tk.X)
+        self.mark_startup("widgets")
 
         self.theme_manager.apply_theme()
-        self.refresh_task_list()
+        self.mark_startup("theme")
+        self.reminders = ReminderScheduler(self, self.todo_list, create_notifier(notifier))
 
         self.update_idletasks()
         self.minsize(self.winfo_reqwidth(), self.winfo_reqheight())
+        self.mark_startup("layout")
+        self.bind("<Map>", self._on_first_map)
+        self.load_tasks()
+
+    def mark_startup(self, phase):
+        if self.startup is not None:
+            self.startup.mark(phase)
+
+    def _on_first_map(self, event):
+        if event.widget is self:
+            self.unbind("<Map>")
+            self.mark_startup("window shown")
+
+    def load_tasks(self):
+        """بارگذاری تدریجی کارها با after()؛ بین مرحله‌ها پنجره رسم و به رویدادها پاسخ داده می‌شود."""
+        self._loader = self.todo_list.load_steps(self.LOAD_BATCH)
+        self._load_steps = 0
+        self.update_status()
+        self.after(1, self._load_step)
+
+    def _load_step(self):
+        if self._loader is None:
+            return
+        try:
+            next(self._loader)
+        except StopIteration:
+            self._loader = None
+            self.finish_loading()
+            return
+        self._load_steps += 1
+        if self._load_steps == 1:
+            self.mark_startup("load: open storage")
+        elif self._load_steps == 2:
+            # اولین دسته کارها؛ بخش قابل مشاهده لیست پر می‌شود
+            self.refresh_task_list()
+            self.mark_startup("first tasks shown")
+        elif self._load_steps % self.LOAD_REFRESH_EVERY == 0:
+            self.refresh_task_list()
+        else:
+            self.update_status()
+        self.after(1, self._load_step)
+
+    def finish_loading(self):
+        """پس از بارگذاری همه کارها: نمایش کامل لیست و آغاز کارهای زمان‌بندی شده."""
+        self.mark_startup("load: tasks")
+        self.update_categories()
+        self.refresh_task_list()
+        self.mark_startup("populate list")
+        self.schedule_day_check()
+        error = self.todo_list.load_error
+        if error is not None:
+            # لیست ناقص است و ذخیره نمی‌شود؛ پاکسازی و ساخت نمونه‌های تکرارشونده هم اجرا نمی‌شوند
+            messagebox.showerror(
+                "خطا در بارگذاری",
+                f"فایل کارها به طور کامل خوانده نشد: {error}\n"
+                "تغییرات این اجرا ذخیره نمی‌شوند تا فایل فعلی بازنویسی نشود.",
+            )
+        else:
+            # جبران نمونه‌های جامانده کارهای تکرارشونده و اولین پاکسازی
+            self.after_idle(self.materialize_recurring)
+            self._cleanup_after = self.after_idle(self.run_cleanup)
+        self.after_idle(self.reminders.start)
+        if self.startup is not None:
+            self.after_idle(self._report_startup)
+
+    def _report_startup(self):
+        self.mark_startup("idle tasks")
+        self.startup.dump()
 
     def refresh_task_list(self):
-        self.task_list_frame.refresh(self.todo_list.tasks)
+        self.task_list_frame.refresh(self.visible_tasks())
+        self.update_status()
+        self.on_selection_changed()
+
+    def on_selection_changed(self):
+        """یادداشت‌های کار انتخاب شده (فقط اگر یک کار انتخاب شده باشد) را نمایش می‌دهد."""
+        selected = self.task_list_frame.selected_task_ids()
+        task = self.todo_list.get_task(selected[0]) if len(selected) == 1 else None
+        self.notes_frame.show_task(task)
+
+    def schedule_cleanup(self):
+        """اجرای بعدی پاکسازی را در موعد منقضی شدن اولین کار زمان‌بندی می‌کند."""
+        if self._cleanup_after is not None:
+            self.after_cancel(self._cleanup_after)
+            self._cleanup_after = None
+        delay = self.todo_list.next_cleanup_delay()
+        if delay is not None:
+            # حداقل یک ثانیه تا کارهای هم‌زمان منقضی شده در یک اجرا حذف شوند
+            self._cleanup_after = self.after(int(max(delay, 1) * 1000), self.run_cleanup)
+
+    def run_cleanup(self):
+        """کارهای منقضی شده را (با یک ذخیره‌سازی) حذف کرده و اجرای بعدی را زمان‌بندی می‌کند."""
+        self._cleanup_after = None
+        if self.todo_list.run_cleanup():
+            self.refresh_task_list()
+        self.schedule_cleanup()
+
+    def update_status(self):
+        """تعداد کارهای لیست‌های هوشمند (یا پیام فعال) را در نوار وضعیت نشان می‌دهد.
+
+        تعدادها از نتیجه‌های نگهداری شده لیست‌ها خوانده می‌شوند، نه با پیمایش کارها.
+        """
+        if self.delete_mode:
+            text = "حالت حذف فعال است"
+        elif self._loader is not None:
+            text = f"در حال بارگذاری کارها... ({len(self.todo_list.tasks)})"
+        elif self._filter_error:
+            text = self._filter_error
+        else:
+            counts = self.todo_list.smart_lists.counts()
+            text = "  |  ".join(f"{name}: {count}" for name, count in counts.items())
+        self.action_frame.status_label.config(text=text)
+
+    def schedule_day_check(self):
+        """بررسی عوض شدن روز را برای کمی پس از نیمه‌شب زمان‌بندی می‌کند."""
+        delay = int(seconds_until_tomorrow() * 1000) + 1000
+        self.after(min(delay, self.DAY_CHECK_INTERVAL), self.on_day_check)
+
+    def on_day_check(self):
+        """با آغاز روز جدید نمونه‌های امروز کارهای تکرارشونده ساخته شده و فقط لیست‌های
+        هوشمند وابسته به تاریخ دوباره ارزیابی می‌شوند."""
+        created = self.todo_list.materialize_recurring()
+        if self.todo_list.refresh_smart_lists() or created:
+            self.refresh_task_list()
+        self.schedule_day_check()
+
+    def materialize_recurring(self):
+        """نمونه‌های جامانده کارهای تکرارشونده (وقتی برنامه بسته بوده) را یکجا می‌سازد."""
+        if self.todo_list.materialize_recurring():
+            self.refresh_task_list()
+
+    def visible_tasks(self):
+        """کارهایی که با جستجو و فیلترهای فعلی نمایش داده می‌شوند."""
+        filters = self.filter_frame.get_filters()
+        self._filter_error = None
+        if not filters and not self.search_query.strip():
+            return self.todo_list.tasks
+        try:
+            return self.todo_list.filter_tasks(query=self.search_query, **filters)
+        except ValueError as e:
+            # عبارت برچسب نیمه‌کاره یا نامعتبر؛ بقیه فیلترها اعمال می‌شوند
+            self._filter_error = f"خطا در عبارت برچسب: {e}"
+            filters.pop("tags", None)
+            return self.todo_list.filter_tasks(query=self.search_query, **filters)
+
+    def update_categories(self):
+        """گزینه‌های دسته‌بندی فرم ورودی و فیلترها را به‌روز می‌کند."""
+        self.input_frame.update_categories()
+        self.filter_frame.update_categories()
+
+    def schedule_search(self):
+        """جستجو را تا پایان تایپ کاربر (SEARCH_DELAY) به تعویق می‌اندازد."""
+        if self._search_after is not None:
+            self.after_cancel(self._search_after)
+        self._search_after = self.after(self.SEARCH_DELAY, self.apply_search)
+
+    def apply_search(self):
+        self._search_after = None
+        self.search_query = self.action_frame.search_var.get()
+        self.refresh_task_list()
+
+    def warm_search_index(self):
+        """ایندکس جستجو را در دسته‌های کوچک و بدون قفل کردن رابط کاربری می‌سازد."""
+        if self._warm_after is not None:
+            return
+
+        def step():
+            self._warm_after = None
+            if not self.todo_list.search_index.build_step():
+                self._warm_after = self.after(1, step)
+
+        step()
+
+    def on_close(self):
+        """پیش از بستن پنجره، ذخیره‌سازی در انتظار را کامل می‌کند."""
+        if self._loader is not None:
+            # بقیه کارها بارگذاری می‌شوند تا تغییرات انجام شده در حین بارگذاری ذخیره شوند
+            for _ in self._loader:
+                pass
+            self._loader = None
+        self.reminders.stop()
+        self.notes_frame.flush()
+        if self.chart_renderer is not None:
+            self.chart_renderer.shutdown()
+        self.todo_list.close()
+        self.destroy()
 
     def toggle_theme(self):
         self.current_theme = "dark" if self.current_theme == "light" else "light"
@@ -431,7 +1452,8 @@ class TodoApp(tk.Tk):
             description=self.input_frame.desc_entry.get(),
             priority=self.priority_var.get(),
             due_date=due_date,
-            category=category
+            category=category,
+            tags=self.input_frame.tags_entry.get()
         )
 
         self.todo_list.add_task(task)
@@ -439,7 +1461,7 @@ class TodoApp(tk.Tk):
 
         # پاک کردن فیلدها و به‌روزرسانی لیست دسته‌بندی‌ها
         self.input_frame.clear_inputs()
-        self.input_frame.update_categories()
+        self.update_categories()
         self.input_frame.name_entry.focus_set()
 
     def handle_tree_click(self, event):
@@ -449,61 +1471,101 @@ class TodoApp(tk.Tk):
         if not row_id:
             return
         if self.task_list_frame.tree.identify_column(event.x) == "#1":
-            task_index = int(row_id)
-            if (
-                self.todo_list.tasks[task_index].status == "انجام نشده"
-                and self.todo_list.tasks[task_index].priority == "بالا"
-            ):
+            task = self.todo_list.get_task(row_id)
+            if task is None:
+                return
+            if task.status == "انجام نشده" and task.priority == "بالا":
                 self.show_congrats_popup()
-            self.todo_list.toggle_task_status(task_index)
+            self.todo_list.toggle_task(row_id)
             self.refresh_task_list()
 
     def handle_delete_key(self, event):
         self.delete_mode = not self.delete_mode
-        self.action_frame.status_label.config(
-            text="حالت حذف فعال است" if self.delete_mode else ""
-        )
+        self.update_status()
 
     def confirm_deletion(self, event):
         if not self.delete_mode:
             return
-        selected_items = self.task_list_frame.tree.selection()
+        selected_items = self.task_list_frame.selected_task_ids()
         if not selected_items:
             return
-        self.delete_tasks_by_indices([int(iid) for iid in selected_items])
         self.delete_mode = False
-        self.action_frame.status_label.config(text="")
+        self.delete_tasks_by_ids(selected_items)
 
     def delete_task_with_button(self):
-        selected_items = self.task_list_frame.tree.selection()
+        selected_items = self.task_list_frame.selected_task_ids()
         if not selected_items:
             messagebox.showwarning("انتخاب نشده", "لطفاً کاری برای حذف انتخاب کنید.")
             return
         if messagebox.askyesno(
             "تایید حذف", f"آیا از حذف {len(selected_items)} کار مطمئن هستید؟"
         ):
-            self.delete_tasks_by_indices([int(iid) for iid in selected_items])
+            self.delete_tasks_by_ids(selected_items)
 
-    def delete_tasks_by_indices(self, indices):
-        self.todo_list.delete_multiple_tasks(indices)
+    def delete_tasks_by_ids(self, task_ids):
+        self.todo_list.delete_tasks(task_ids)
         self.refresh_task_list()
 
-    def import_from_csv_dialog(self):
+    def import_dialog(self):
         filepath = filedialog.askopenfilename(
-            filetypes=(("CSV Files", "*.csv"), ("All files", "*.*"))
+            filetypes=(
+                ("CSV Files", "*.csv"),
+                ("Excel Files", "*.xlsx *.xlsm"),
+                ("All files", "*.*"),
+            )
         )
         if not filepath:
             return
-        success, message = self.todo_list.import_from_csv(filepath)
-        if success:
-            self.refresh_task_list()
-            messagebox.showinfo("موفقیت", message)
+        if filepath.lower().endswith((".xlsx", ".xlsm")):
+            from .excel import XlsxImportJob
+
+            job = XlsxImportJob(self.todo_list, filepath)
         else:
-            messagebox.showerror("خطا", message)
+            job = ImportJob(self.todo_list, filepath)
+        ProgressDialog(self, job, "وارد کردن کارها", self.finish_import)
+
+    def export_dialog(self):
+        """کل لیست کارها را در پس‌زمینه در یک فایل اکسل ذخیره می‌کند."""
+        filepath = filedialog.asksaveasfilename(
+            defaultextension=".xlsx",
+            initialfile="tasks.xlsx",
+            filetypes=(("Excel Files", "*.xlsx"), ("All files", "*.*")),
+        )
+        if not filepath:
+            return
+        from .excel import ExportJob
+
+        ProgressDialog(self, ExportJob(self.todo_list, filepath), "صادر کردن کارها", self.finish_export)
+
+    def finish_import(self, job):
+        """پس از پایان (یا لغو) وارد کردن، لیست را به‌روز و نتیجه را نمایش می‌دهد."""
+        self.refresh_task_list()
+        self.update_categories()
+        if job.success:
+            messagebox.showinfo("موفقیت", job.summary())
+        else:
+            messagebox.showerror("خطا", job.summary())
+
+    def open_stats(self):
+        """پنجره آمار را باز (یا اگر باز است فعال) می‌کند."""
+        if self.stats_window is not None:
+            self.stats_window.lift()
+            return
+        if self.chart_renderer is None:
+            from .charts import ChartRenderer
+
+            self.chart_renderer = ChartRenderer()
+        self.stats_window = StatsWindow(self, self.chart_renderer)
+
+    def finish_export(self, job):
+        if job.success:
+            messagebox.showinfo("موفقیت", job.summary())
+        else:
+            messagebox.showerror("خطا", job.summary())
 
     def edit_task_dialog(self):
         """دیالوگ ویرایش کار را نمایش می‌دهد."""
-        selected_items = self.task_list_frame.tree.selection()
+        selected_items = self.task_list_frame.selected_task_ids()
 
         if not selected_items:
             messagebox.showwarning("انتخاب نشده", "لطفاً یک کار برای ویرایش انتخاب کنید.")
@@ -513,8 +1575,9 @@ class TodoApp(tk.Tk):
             messagebox.showwarning("انتخاب چندگانه", "لطفاً فقط یک کار برای ویرایش انتخاب کنید.")
             return
 
-        task_index = int(selected_items[0])
-        task = self.todo_list.tasks[task_index]
+        task = self.todo_list.get_task(selected_items[0])
+        if task is None:
+            return
 
         # ایجاد پنجره مدال
         dialog = tk.Toplevel(self)
@@ -567,14 +1630,20 @@ class TodoApp(tk.Tk):
         category_combo.set(task.category if task.category else "بدون دسته")
         category_combo.grid(row=4, column=1, padx=5, pady=10, sticky="w")
 
+        # برچسب‌ها
+        ttk.Label(main_frame, text="برچسب‌ها (با کاما):").grid(row=5, column=0, padx=5, pady=10, sticky="w")
+        tags_entry = ttk.Entry(main_frame, width=40)
+        tags_entry.insert(0, "، ".join(task.tags))
+        tags_entry.grid(row=5, column=1, columnspan=2, padx=5, pady=10, sticky="ew")
+
         # وضعیت (انجام شده / انجام نشده)
         status_var = tk.BooleanVar(value=task.is_completed())
         status_check = ttk.Checkbutton(main_frame, text="انجام شده", variable=status_var)
-        status_check.grid(row=5, column=1, padx=5, pady=10, sticky="w")
+        status_check.grid(row=6, column=1, padx=5, pady=10, sticky="w")
 
         # دکمه‌های ذخیره و انصراف
         button_frame = ttk.Frame(main_frame)
-        button_frame.grid(row=6, column=0, columnspan=3, pady=20, sticky="e")
+        button_frame.grid(row=7, column=0, columnspan=3, pady=20, sticky="e")
 
         def save_changes():
             new_name = name_entry.get().strip()
@@ -622,13 +1691,14 @@ class TodoApp(tk.Tk):
                 task_id=task.task_id,
                 is_recurring=task.is_recurring,
                 recurrence_pattern=task.recurrence_pattern,
-                notes=task.notes
+                notes=task.notes,
+                tags=tags_entry.get()
             )
 
             # به‌روزرسانی کار
-            self.todo_list.update_task(task_index, updated_task)
+            self.todo_list.edit_task(task.task_id, updated_task)
             self.refresh_task_list()
-            self.input_frame.update_categories()
+            self.update_categories()
             dialog.destroy()
 
         def cancel():
@@ -659,7 +1729,52 @@ class TodoApp(tk.Tk):
 
 
 # ------------------ تابع اصلی ------------------
-def main():
+def parse_args(argv=None):
+    parser = argparse.ArgumentParser(description="مدیریت لیست کارها")
+    parser.add_argument(
+        "--profile",
+        action="store_true",
+        help="زمان‌گیری عملیات (معادل TODO_PROFILE=1)؛ خلاصه هنگام خروج یا با Ctrl+Shift+P چاپ می‌شود",
+    )
+    parser.add_argument(
+        "--profile-startup",
+        nargs="?",
+        const="",
+        metavar="FILE",
+        help="زمان‌گیری مراحل راه‌اندازی (معادل TODO_PROFILE_STARTUP)؛ در خروجی خطا یا فایل FILE چاپ می‌شود",
+    )
+    parser.add_argument(
+        "--watchdog",
+        type=float,
+        nargs="?",
+        const=Watchdog.DEFAULT_THRESHOLD * 1000,
+        metavar="MS",
+        help="ثبت callbackهایی که حلقه رویداد را بیش از MS میلی‌ثانیه متوقف می‌کنند (معادل TODO_WATCHDOG)",
+    )
+    parser.add_argument(
+        "--notifier",
+        choices=("plyer", "console", "none"),
+        help="نحوه نمایش یادآوری سررسید کارها (معادل TODO_NOTIFIER)",
+    )
+    # آرگومان‌های ناشناخته (مثلاً از طرف cx_Freeze) نادیده گرفته می‌شوند
+    args, _ = parser.parse_known_args(argv)
+    return args
+
+
+def main(argv=None):
+    args = parse_args(argv)
+
+    startup = None
+    startup_path = args.profile_startup if args.profile_startup is not None else profiling.startup_env()
+    if startup_path is not None:
+        startup = profiling.StartupProfile(path=startup_path or None)
+        startup.mark("imports")
+
+    profiler = None
+    if args.profile or profiling.env_enabled():
+        # باید پیش از ساخت TodoApp فعال شود تا callbackها هم زمان‌گیری شوند
+        profiler = profiling.enable()
+
     script_dir = os.path.dirname(os.path.abspath(__file__))
     icons_path = os.path.join(script_dir, "icons")
 
@@ -669,7 +1784,14 @@ def main():
             f"پوشه 'icons' در مسیر '{icons_path}' ایجاد شد. لطفاً آیکون‌ها را در آن قرار دهید."
         )
 
-    app = TodoApp(icons_path=icons_path)
+    app = TodoApp(icons_path=icons_path, notifier=args.notifier, startup=startup)
+    if profiler is not None:
+        app.bind_all("<Control-P>", lambda event: profiler.dump())
+
+    threshold = args.watchdog / 1000 if args.watchdog else watchdog.env_threshold()
+    if threshold:
+        watchdog.configure_logging()
+        Watchdog(app, threshold=threshold, task_count=lambda: len(app.todo_list.tasks)).start()
     app.mainloop()
 
 
@@ -0,0 +1,158 @@
+# charts.py
+
+import io
+from concurrent.futures import Future, ThreadPoolExecutor
+from datetime import timedelta
+
+# نمودارهای پنجره آمار به ترتیب نمایش
+CHARTS = ("completion", "open", "overdue", "recurring")
+
+TITLES = {
+    "completion": "کارهای انجام شده در هر روز",
+    "open": "کارهای انجام نشده بر اساس دسته‌بندی و اولویت",
+    "overdue": "روند کارهای گذشته از موعد",
+    "recurring": "پایبندی به کارهای تکرارشونده",
+}
+
+PRIORITY_COLORS = {"بالا": "#e74c3c", "متوسط": "#f1c40f", "پایین": "#2ecc71"}
+ADHERENCE_COLORS = ("#2ecc71", "#f39c12", "#e74c3c")
+ADHERENCE_LABELS = ("به موقع", "با تأخیر", "از دست رفته")
+
+
+def dashboard_data(stats, today, days=30, months=6):
+    """داده هر نمودار از روی شمارنده‌های TaskStats (بدون پیمایش کارها).
+
+    باید در رشته اصلی صدا زده شود؛ مقدارها tuple هستند تا با داده‌ای که تصویر
+    نگهداری شده از روی آن رسم شده مقایسه شوند.
+    """
+    start = today - timedelta(days=days - 1)
+    by_category = stats.open_by_category()
+    return {
+        "completion": (start, tuple(stats.completion_series(start, today))),
+        "open": tuple(
+            (category, tuple(sorted(priorities.items())))
+            for category, priorities in sorted(by_category.items())
+        ),
+        "overdue": (start, tuple(stats.overdue_series(start, today))),
+        "recurring": tuple(stats.recurring_adherence(today, months)),
+    }
+
+
+def _day_labels(start, count):
+    return [(start + timedelta(days=i)).strftime("%m-%d") for i in range(count)]
+
+
+def _plot_completion(axes, data):
+    start, series = data
+    positions = range(len(series))
+    axes.bar(positions, series, color="#3498db")
+    labels = _day_labels(start, len(series))
+    step = max(1, len(series) // 6)
+    axes.set_xticks(list(positions)[::step], labels[::step])
+
+
+def _plot_open(axes, data):
+    categories = [category for category, _ in data]
+    left = [0] * len(data)
+    for priority in ("بالا", "متوسط", "پایین"):
+        counts = [dict(priorities).get(priority, 0) for _, priorities in data]
+        axes.barh(categories, counts, left=left, color=PRIORITY_COLORS[priority], label=priority)
+        left = [a + b for a, b in zip(left, counts)]
+    if data:
+        axes.legend(fontsize=8)
+
+
+def _plot_overdue(axes, data):
+    start, series = data
+    positions = range(len(series))
+    axes.plot(positions, series, color="#e74c3c", marker=".")
+    axes.fill_between(positions, series, color="#e74c3c", alpha=0.15)
+    labels = _day_labels(start, len(series))
+    step = max(1, len(series) // 6)
+    axes.set_xticks(list(positions)[::step], labels[::step])
+    axes.set_ylim(bottom=0)
+
+
+def _plot_recurring(axes, data):
+    labels = [f"{year}-{month:02d}" for (year, month), *_ in data]
+    bottom = [0] * len(data)
+    for index, (color, label) in enumerate(zip(ADHERENCE_COLORS, ADHERENCE_LABELS)):
+        counts = [row[index + 1] for row in data]
+        axes.bar(labels, counts, bottom=bottom, color=color, label=label)
+        bottom = [a + b for a, b in zip(bottom, counts)]
+    axes.legend(fontsize=8)
+
+
+_PLOTTERS = {
+    "completion": _plot_completion,
+    "open": _plot_open,
+    "overdue": _plot_overdue,
+    "recurring": _plot_recurring,
+}
+
+
+def render_chart(name, data, colors, size=(5.0, 3.0), dpi=100):
+    """یک نمودار را با backend غیرتعاملی Agg به PNG (bytes) تبدیل می‌کند.
+
+    از pyplot استفاده نمی‌شود تا رسم در رشته کاری به وضعیت سراسری matplotlib
+    وابسته نباشد. matplotlib فقط در اولین رسم import می‌شود.
+    """
+    from matplotlib.backends.backend_agg import FigureCanvasAgg
+    from matplotlib.figure import Figure
+
+    background, foreground = colors
+    figure = Figure(figsize=size, dpi=dpi, facecolor=background)
+    FigureCanvasAgg(figure)
+    axes = figure.add_subplot()
+    axes.set_facecolor(background)
+    for spine in axes.spines.values():
+        spine.set_color(foreground)
+    axes.tick_params(colors=foreground, labelsize=8)
+    _PLOTTERS[name](axes, data)
+    figure.tight_layout()
+
+    buffer = io.BytesIO()
+    figure.savefig(buffer, format="png", facecolor=background)
+    return buffer.getvalue()
+
+
+class ChartRenderer:
+    """رسم نمودارها در یک رشته کاری و نگهداری آخرین تصویر هر نمودار.
+
+    تصویر هر نمودار همراه با داده، رنگ‌ها و اندازه‌ای که از روی آن رسم شده نگه
+    داشته می‌شود؛ اگر هیچ‌کدام تغییر نکرده باشند دوباره رسم نمی‌شود.
+    """
+
+    def __init__(self, render=render_chart):
+        self._render = render
+        self._executor = None
+        self._images = {}
+
+    def cached(self, name, data, colors, size):
+        entry = self._images.get(name)
+        if entry is not None and entry[0] == (data, colors, size):
+            return entry[1]
+        return None
+
+    def submit(self, name, data, colors, size):
+        """Future تصویر PNG نمودار؛ اگر تصویر معتبر موجود باشد بلافاصله کامل است."""
+        image = self.cached(name, data, colors, size)
+        if image is not None:
+            future = Future()
+            future.set_result(image)
+            return future
+        if self._executor is None:
+            self._executor = ThreadPoolExecutor(max_workers=1, thread_name_prefix="charts")
+        key = (data, colors, size)
+        return self._executor.submit(self._run, name, key)
+
+    def _run(self, name, key):
+        data, colors, size = key
+        image = self._render(name, data, colors, size)
+        self._images[name] = (key, image)
+        return image
+
+    def shutdown(self):
+        if self._executor is not None:
+            self._executor.shutdown(wait=False, cancel_futures=True)
+            self._executor = None
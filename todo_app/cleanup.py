@@ -0,0 +1,146 @@
+# cleanup.py
+
+import heapq
+import json
+import os
+import time
+
+# نام فایل تنظیمات پاکسازی (کنار فایل کارها)
+CLEANUP_FILE = "cleanup.json"
+
+DEFAULT_CONFIG = {
+    "enabled": True,
+    # کارهایی که بیش از این تعداد روز از انجامشان گذشته باشد حذف می‌شوند
+    "days_old": 1,
+    "status_filter": "completed",
+    "priority_filter": [],
+    "exclude_categories": [],
+    # فاصله اجرای دوره‌ای (دقیقه)
+    "interval_minutes": 60,
+}
+
+
+def config_path(tasks_filename):
+    return os.path.join(os.path.dirname(os.path.abspath(tasks_filename)), CLEANUP_FILE)
+
+
+def load_config(path):
+    """تنظیمات ذخیره شده (ادغام شده با مقادیر پیش‌فرض)."""
+    config = dict(DEFAULT_CONFIG)
+    if not os.path.exists(path):
+        return config
+    try:
+        with open(path, encoding="utf-8") as file:
+            config.update(json.load(file))
+    except (OSError, ValueError, TypeError) as e:
+        print(f"خطا در خواندن تنظیمات پاکسازی: {e}")
+    return config
+
+
+def save_config(path, config):
+    try:
+        with open(path, mode="w", encoding="utf-8") as file:
+            json.dump(config, file, ensure_ascii=False, indent=2)
+    except OSError as e:
+        print(f"خطا در ذخیره تنظیمات پاکسازی: {e}")
+
+
+def _completion_time(task):
+    """زمان انجام کار به صورت timestamp (برای مقایسه زمان‌های با و بدون منطقه زمانی)."""
+    completed_at = task.completed_at
+    if completed_at is None or not task.is_completed():
+        return None
+    try:
+        return completed_at.timestamp()
+    except (OverflowError, OSError, ValueError):
+        return None
+
+
+class CleanupIndex:
+    """صف اولویت (min-heap) کارهای قابل پاکسازی بر اساس زمان انجام.
+
+    فقط کارهایی که با فیلترهای وضعیت، اولویت و دسته‌بندی تنظیمات منطبق‌اند
+    در صف قرار می‌گیرند، بنابراین هر اجرا فقط به کارهای منقضی شده دست می‌زند.
+    حذف از صف تنبل است: مدخل‌هایی که با زمان فعلی کار در _times نمی‌خوانند
+    هنگام بیرون آمدن کنار گذاشته می‌شوند. مثل بقیه ایندکس‌ها با add، remove
+    و update همگام نگه داشته می‌شود.
+    """
+
+    def __init__(self, config, tasks=()):
+        self.config = config
+        self._priorities = set(config.get("priority_filter") or ())
+        self._excluded = set(config.get("exclude_categories") or ())
+        # فقط کارهای انجام شده زمان انجام دارند؛ «incomplete» هیچ کاری را پاک نمی‌کند
+        self._active = config.get("status_filter", "completed") in ("completed", "all")
+        self._times = {}
+        self._heap = []
+        # مدخل‌های منقضی که حذفشان به تعویق افتاده؛ در هر اجرا دوباره بررسی می‌شوند
+        self._deferred = []
+        for task in tasks:
+            time_key = self._key(task)
+            if time_key is not None:
+                self._times[task.task_id] = time_key
+                self._heap.append((time_key, task.task_id))
+        heapq.heapify(self._heap)
+
+    def __len__(self):
+        return len(self._times)
+
+    def _key(self, task):
+        if not self._active:
+            return None
+        if task.category in self._excluded:
+            return None
+        if self._priorities and task.priority not in self._priorities:
+            return None
+        return _completion_time(task)
+
+    def add(self, task):
+        time_key = self._key(task)
+        if time_key is None:
+            return
+        self._times[task.task_id] = time_key
+        heapq.heappush(self._heap, (time_key, task.task_id))
+
+    def remove(self, task):
+        self._times.pop(task.task_id, None)
+
+    def update(self, old_task, new_task):
+        self._times.pop(old_task.task_id, None)
+        self.add(new_task)
+
+    def _valid(self, entry):
+        return self._times.get(entry[1]) == entry[0]
+
+    def next_expiry(self):
+        """زمان (timestamp) منقضی شدن اولین کار یا None اگر صف خالی باشد."""
+        heap = self._heap
+        while heap and not self._valid(heap[0]):
+            heapq.heappop(heap)
+        if not heap:
+            return None
+        return heap[0][0] + self.config.get("days_old", 1) * 86400
+
+    def pop_expired(self, now=None):
+        """شناسه کارهایی که زمان انجامشان قبل از مرز پاکسازی است را از صف خارج می‌کند."""
+        cutoff = (now or time.time()) - self.config.get("days_old", 1) * 86400
+        heap = self._heap
+        expired = [entry for entry in self._deferred if self._valid(entry)]
+        self._deferred = []
+        for entry in expired:
+            del self._times[entry[1]]
+        while heap and heap[0][0] < cutoff:
+            entry = heapq.heappop(heap)
+            if self._valid(entry):
+                del self._times[entry[1]]
+                expired.append(entry)
+        return expired
+
+    def defer(self, entries):
+        """مدخل‌هایی که این بار حذف نشدند (مثلاً والد با زیرکار ناتمام) در اجرای بعد دوباره بررسی می‌شوند.
+
+        این مدخل‌ها در heap برنمی‌گردند تا next_expiry به خاطر آن‌ها صفر نشود.
+        """
+        for entry in entries:
+            self._times[entry[1]] = entry[0]
+        self._deferred.extend(entries)
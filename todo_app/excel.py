@@ -0,0 +1,278 @@
+# excel.py
+
+import base64
+import os
+import threading
+import time
+from datetime import date, datetime
+
+from .importer import ImportJob
+from .storage import CSV_HEADER
+
+# ستون اضافه خروجی اکسل: عمق کار در سلسله‌مراتب زیرکارها (۰ = کار اصلی)
+LEVEL_COLUMN = "Level"
+XLSX_HEADER = CSV_HEADER + [LEVEL_COLUMN]
+SHEET_TITLE = "Tasks"
+
+COLUMN_WIDTHS = {"Name": 40, "Description": 40, "Notes": 60, "Tags": 25, "Category": 15}
+
+_ID = CSV_HEADER.index("TaskID")
+_PARENT = CSV_HEADER.index("ParentID")
+_NOTES = CSV_HEADER.index("Notes")
+_DUE = CSV_HEADER.index("DueDate")
+_ORDER = CSV_HEADER.index("SubtaskOrder")
+_RECURRING = CSV_HEADER.index("IsRecurring")
+_INTERVAL = CSV_HEADER.index("RecurrenceInterval")
+# ستون‌های متن آزاد؛ نویسه‌های کنترلی غیرمجاز در اکسل از آن‌ها حذف می‌شوند
+_TEXT_COLUMNS = tuple(
+    CSV_HEADER.index(name) for name in ("Name", "Description", "Category", "Notes", "Tags")
+)
+
+
+def _openpyxl():
+    try:
+        import openpyxl
+    except ImportError:
+        raise ImportError("برای کار با فایل‌های اکسل باید کتابخانه openpyxl نصب شده باشد.")
+    return openpyxl
+
+
+# ------------------ صادر کردن ------------------
+
+def _excel_date(value):
+    """تاریخ سررسید ردیف CSV به صورت date (برای ذخیره به شکل تاریخ اکسل) یا None."""
+    try:
+        return datetime.fromisoformat(value).date()
+    except ValueError:
+        return None
+
+
+def export_rows(rows):
+    """ردیف‌های خروجی اکسل را به صورت جریانی تولید می‌کند.
+
+    rows ردیف‌های CSV به ترتیب ذخیره‌سازی است (هر والد پیش از زیرکارهایش، مثل
+    ToDoList._snapshot_rows) و در همان جا تبدیل می‌شوند. یادداشت‌ها رمزگشایی
+    شده، سررسید به صورت تاریخ اکسل و ستون Level عمق کار در سلسله‌مراتب است.
+    """
+    from openpyxl.cell.cell import ILLEGAL_CHARACTERS_RE
+
+    levels = {}
+    for row in rows:
+        if row[_NOTES]:
+            try:
+                row[_NOTES] = base64.b64decode(row[_NOTES]).decode("utf-8")
+            except (ValueError, UnicodeDecodeError):
+                row[_NOTES] = ""
+        for index in _TEXT_COLUMNS:
+            if row[index]:
+                row[index] = ILLEGAL_CHARACTERS_RE.sub("", row[index])
+        if row[_DUE]:
+            row[_DUE] = _excel_date(row[_DUE]) or row[_DUE]
+        if row[_ORDER].isdigit():
+            row[_ORDER] = int(row[_ORDER])
+        row[_RECURRING] = row[_RECURRING] == "true"
+        if row[_INTERVAL].isdigit():
+            row[_INTERVAL] = int(row[_INTERVAL])
+
+        parent_id = row[_PARENT]
+        level = levels.get(parent_id, -1) + 1 if parent_id else 0
+        levels[row[_ID]] = level
+        row.append(level)
+        # سلول‌های خالی اصلاً نوشته نمی‌شوند
+        yield [value if value != "" else None for value in row]
+
+
+def write_xlsx(filepath, rows, progress, cancel=None):
+    """ردیف‌ها را با workbook فقط-نوشتنی openpyxl (بدون نگه داشتن سلول‌ها در حافظه) ذخیره می‌کند.
+
+    ابتدا در یک فایل موقت نوشته می‌شود تا فایل قبلی در صورت خطا یا لغو سالم بماند.
+    progress["rows"] با هر ردیف به‌روز می‌شود؛ False یعنی کار لغو شده است.
+    """
+    openpyxl = _openpyxl()
+    from openpyxl.utils import get_column_letter
+
+    workbook = openpyxl.Workbook(write_only=True)
+    sheet = workbook.create_sheet(SHEET_TITLE)
+    for index, name in enumerate(XLSX_HEADER, start=1):
+        if name in COLUMN_WIDTHS:
+            sheet.column_dimensions[get_column_letter(index)].width = COLUMN_WIDTHS[name]
+    sheet.append(XLSX_HEADER)
+    for row in rows:
+        if cancel is not None and cancel.is_set():
+            # بستن جریان کاربرگ؛ فایل موقت openpyxl هنگام خروج پاک می‌شود
+            sheet.close()
+            return False
+        sheet.append(row)
+        progress["rows"] += 1
+
+    temp_path = filepath + ".tmp"
+    try:
+        workbook.save(temp_path)
+        os.replace(temp_path, filepath)
+    finally:
+        if os.path.exists(temp_path):
+            os.remove(temp_path)
+    return True
+
+
+class ExportJob:
+    """صادر کردن لیست کارها به فایل XLSX در یک رشته پس‌زمینه.
+
+    رابط آن مثل ImportJob است (start، poll، cancel، fraction) تا همان پنجره
+    پیشرفت برای هر دو استفاده شود. ردیف‌های کارها هنگام ساخت (در رشته Tk و
+    به ترتیب والد و سپس زیرکارها) ساخته می‌شوند و رشته پس‌زمینه فقط همین
+    ردیف‌ها را می‌نویسد، نه خود کارها را.
+    """
+
+    FORMAT = "XLSX"
+
+    def __init__(self, todo_list, filepath):
+        self.filepath = filepath
+        self._rows = todo_list._snapshot_rows()
+        self.total_rows = len(self._rows)
+        self.progress = {"rows": 0}
+        self.bad_row_count = 0
+        self.error = None
+        self.done = False
+        self.cancelled = False
+
+        self._cancel = threading.Event()
+        self._thread = None
+        self._started_at = None
+        self._finished_at = None
+
+    @property
+    def success(self):
+        return self.error is None
+
+    @property
+    def rows_read(self):
+        return self.progress["rows"]
+
+    @property
+    def fraction(self):
+        if not self.total_rows:
+            return 1.0 if self.done else 0.0
+        return min(1.0, self.rows_read / self.total_rows)
+
+    @property
+    def elapsed(self):
+        if self._started_at is None:
+            return 0.0
+        return (self._finished_at or time.monotonic()) - self._started_at
+
+    @property
+    def rows_per_second(self):
+        elapsed = self.elapsed
+        return self.rows_read / elapsed if elapsed > 0 else 0.0
+
+    def summary(self):
+        if self.error:
+            return self.error
+        if self.cancelled:
+            return "صادر کردن لغو شد."
+        return f"{self.rows_read} کار در فایل {os.path.basename(self.filepath)} ذخیره شد."
+
+    def run(self):
+        """کل فایل را همزمان در رشته فراخوان می‌نویسد."""
+        self._started_at = time.monotonic()
+        try:
+            if not write_xlsx(self.filepath, export_rows(self._rows), self.progress, self._cancel):
+                self.cancelled = True
+        except Exception as e:
+            self.error = f"خطا در ذخیره فایل {self.FORMAT}: {e}"
+        self._rows = None
+        self._finished_at = time.monotonic()
+        self.done = True
+
+    def start(self):
+        self._thread = threading.Thread(target=self.run, name="xlsx-export", daemon=True)
+        self._thread.start()
+
+    def cancel(self):
+        self._cancel.set()
+
+    def poll(self):
+        """True یعنی نوشتن فایل تمام (یا لغو) شده است."""
+        return self.done
+
+
+# ------------------ وارد کردن ------------------
+
+def _cell_text(value):
+    """مقدار یک سلول اکسل به صورت رشته‌ای که ستون‌های CSV انتظار دارند."""
+    if value is None:
+        return ""
+    if isinstance(value, str):
+        return value
+    if isinstance(value, bool):
+        return "true" if value else "false"
+    if isinstance(value, datetime):
+        # اکسل تاریخ بدون ساعت ندارد؛ نیمه‌شب یعنی فقط تاریخ
+        if value.time() == datetime.min.time():
+            return value.date().isoformat()
+        return value.isoformat()
+    if isinstance(value, date):
+        return value.isoformat()
+    if isinstance(value, float) and value.is_integer():
+        return str(int(value))
+    return str(value)
+
+
+def read_xlsx_rows(filepath, progress):
+    """ردیف‌های اولین کاربرگ (یا کاربرگ Tasks) را با حالت فقط-خواندنی openpyxl تولید می‌کند.
+
+    مثل read_csv_rows خروجی (شماره ردیف، ردیف رشته‌ای) است و اولین ردیف غیرخالی
+    هدر است؛ یادداشت‌های متنی دوباره base64 می‌شوند تا همان RowDecoder و
+    اعتبارسنجی وارد کردن CSV استفاده شود. progress["rows"] و progress["total_rows"]
+    (از ابعاد ثبت شده کاربرگ، در صورت وجود) به‌روز می‌شوند.
+    """
+    openpyxl = _openpyxl()
+    workbook = openpyxl.load_workbook(filepath, read_only=True, data_only=True)
+    try:
+        if SHEET_TITLE in workbook.sheetnames:
+            sheet = workbook[SHEET_TITLE]
+        else:
+            sheet = workbook.worksheets[0]
+        progress["total_rows"] = sheet.max_row or 0
+        header = None
+        notes_index = None
+        for line_num, values in enumerate(sheet.iter_rows(values_only=True), start=1):
+            progress["rows"] = line_num
+            row = [_cell_text(value) for value in values]
+            if not any(row):
+                continue
+            if header is None:
+                header = [name.strip() for name in row]
+                if "Notes" in header:
+                    notes_index = header.index("Notes")
+            elif notes_index is not None and notes_index < len(row) and row[notes_index]:
+                row[notes_index] = base64.b64encode(row[notes_index].encode("utf-8")).decode("ascii")
+            yield line_num, row
+    finally:
+        workbook.close()
+
+
+class XlsxImportJob(ImportJob):
+    """وارد کردن جریانی یک فایل XLSX؛ تبدیل، اعتبارسنجی و افزودن مثل ImportJob است."""
+
+    FORMAT = "XLSX"
+
+    def __init__(self, todo_list, filepath, **kwargs):
+        super().__init__(todo_list, filepath, **kwargs)
+        self.progress = {"rows": 0, "total_rows": 0}
+
+    @property
+    def fraction(self):
+        """درصد پیشرفت بر اساس ردیف‌های خوانده شده از کاربرگ.
+
+        فایل‌هایی که با حالت فقط-نوشتنی ساخته شده‌اند (مثل خروجی خود برنامه)
+        ابعاد کاربرگ را ثبت نمی‌کنند؛ در این حالت None برمی‌گردد (پیشرفت نامعلوم).
+        """
+        total = self.progress["total_rows"]
+        if not total:
+            return 1.0 if self.done else None
+        return min(1.0, self.progress["rows"] / total)
+
+    def read_rows(self):
+        return read_xlsx_rows(self.filepath, self.progress)
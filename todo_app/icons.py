@@ -0,0 +1,209 @@
+# icons.py
+
+import hashlib
+import json
+import os
+import threading
+
+# مسیر پوشه cache بیت‌مپ آیکون‌ها؛ none (یا off) cache روی دیسک را غیرفعال می‌کند
+ENV_VAR = "TODO_ICON_CACHE"
+INDEX_FILE = "index.json"
+
+# عرض آیکون‌ها (پیکسل) در مقیاس ۱ و نمایشگر ۹۶ DPI
+BASE_SIZE = 20
+# SVGهایی که این مقدار را دارند با رنگ متن تم رسم می‌شوند
+THEMED_MARKER = b"currentColor"
+
+
+def cache_dir():
+    """پوشه cache آیکون‌ها (LOCALAPPDATA در ویندوز، XDG_CACHE_HOME یا ~/.cache) یا None."""
+    path = os.environ.get(ENV_VAR, "").strip()
+    if path.lower() in ("none", "off", "0"):
+        return None
+    if path:
+        return path
+    base = os.environ.get("LOCALAPPDATA") or os.environ.get("XDG_CACHE_HOME")
+    if not base:
+        base = os.path.join(os.path.expanduser("~"), ".cache")
+    return os.path.join(base, "todo_app", "icons")
+
+
+def icon_size(scale):
+    """عرض آیکون به پیکسل برای ضریب scale (مقیاس درخواستی × ضریب DPI نمایشگر)."""
+    return max(1, round(BASE_SIZE * scale))
+
+
+class IconCache:
+    """cache بیت‌مپ‌های PNG رسم شده از آیکون‌های SVG، در حافظه و روی دیسک.
+
+    کلید هر بیت‌مپ (هش محتوای SVG، عرض به پیکسل، رنگ) است؛ رنگ فقط برای
+    SVGهایی که از currentColor استفاده می‌کنند در کلید می‌آید، پس بقیه آیکون‌ها
+    بین تم‌ها مشترک‌اند. هش هر SVG همراه با mtime و اندازه فایل در index.json
+    نگه داشته می‌شود تا در اجراهای بعدی فقط فایل‌های تغییر کرده دوباره خوانده
+    و هش شوند. رسم SVG (با Tk) بر عهده IconManager است؛ این کلاس به Tk وابسته
+    نیست و می‌تواند در رشته پس‌زمینه استفاده شود.
+    """
+
+    def __init__(self, icons_path, directory=None):
+        self.icons_path = icons_path
+        self.directory = directory
+        self._lock = threading.Lock()
+        self._index = None
+        self._index_dirty = False
+        self._bitmaps = {}
+        self._thread = None
+
+    def _load_index(self):
+        # باید با قفل صدا زده شود
+        if self._index is None:
+            self._index = {}
+            if self.directory:
+                try:
+                    with open(os.path.join(self.directory, INDEX_FILE), encoding="utf-8") as file:
+                        self._index = json.load(file)
+                except (OSError, ValueError):
+                    pass
+        return self._index
+
+    def source(self, name):
+        return os.path.join(self.icons_path, name)
+
+    def info(self, name):
+        """(هش، رنگی بودن) فایل SVG یا None اگر فایل وجود نداشته باشد."""
+        path = self.source(name)
+        try:
+            stat = os.stat(path)
+        except OSError:
+            return None
+        with self._lock:
+            entry = self._load_index().get(name)
+        if entry and entry["mtime_ns"] == stat.st_mtime_ns and entry["size"] == stat.st_size:
+            return entry["digest"], entry["themed"]
+
+        try:
+            with open(path, "rb") as file:
+                data = file.read()
+        except OSError:
+            return None
+        entry = {
+            "mtime_ns": stat.st_mtime_ns,
+            "size": stat.st_size,
+            "digest": hashlib.sha256(data).hexdigest(),
+            "themed": THEMED_MARKER in data,
+        }
+        with self._lock:
+            self._load_index()[name] = entry
+            self._index_dirty = True
+        return entry["digest"], entry["themed"]
+
+    def themed(self, name):
+        info = self.info(name)
+        return info is not None and info[1]
+
+    def _key(self, name, size, color):
+        info = self.info(name)
+        if info is None:
+            return None
+        digest, themed = info
+        return digest, size, color if themed else None
+
+    def _path(self, key):
+        digest, size, color = key
+        suffix = f"-{color.lstrip('#').lower()}" if color else ""
+        return os.path.join(self.directory, f"{digest[:32]}-{size}{suffix}.png")
+
+    def bitmap(self, name, size, color=None):
+        """بیت‌مپ PNG (bytes) آیکون از حافظه یا دیسک؛ None یعنی باید از SVG رسم شود."""
+        key = self._key(name, size, color)
+        if key is None:
+            return None
+        with self._lock:
+            data = self._bitmaps.get(key)
+        if data is None and self.directory:
+            try:
+                with open(self._path(key), "rb") as file:
+                    data = file.read()
+            except OSError:
+                return None
+            with self._lock:
+                self._bitmaps[key] = data
+        return data
+
+    def store(self, name, size, color, write):
+        """بیت‌مپ تازه رسم شده را با write(مسیر) روی دیسک ذخیره کرده و برمی‌گرداند."""
+        key = self._key(name, size, color)
+        if key is None or not self.directory:
+            return None
+        path = self._path(key)
+        temp_path = path + ".tmp"
+        try:
+            os.makedirs(self.directory, exist_ok=True)
+            write(temp_path)
+            os.replace(temp_path, path)
+            with open(path, "rb") as file:
+                data = file.read()
+        except Exception as e:
+            print(f"خطا در ذخیره cache آیکون '{name}': {e}")
+            if os.path.exists(temp_path):
+                os.remove(temp_path)
+            return None
+        with self._lock:
+            self._bitmaps[key] = data
+        self.save_index()
+        return data
+
+    def save_index(self):
+        with self._lock:
+            if not self._index_dirty or not self.directory:
+                return
+            index = dict(self._index)
+            self._index_dirty = False
+        path = os.path.join(self.directory, INDEX_FILE)
+        try:
+            os.makedirs(self.directory, exist_ok=True)
+            with open(path + ".tmp", "w", encoding="utf-8") as file:
+                json.dump(index, file)
+            os.replace(path + ".tmp", path)
+        except OSError as e:
+            print(f"خطا در ذخیره فهرست cache آیکون‌ها: {e}")
+
+    # ---------- آماده‌سازی در پس‌زمینه ----------
+
+    def prewarm(self, size, color=None):
+        """همه SVGهای پوشه آیکون‌ها را در یک رشته پس‌زمینه اعتبارسنجی و بیت‌مپ‌های
+        size آن‌ها را از دیسک در حافظه بارگذاری می‌کند."""
+        self._thread = threading.Thread(
+            target=self._prewarm, args=(size, color), name="icon-cache", daemon=True
+        )
+        self._thread.start()
+
+    def _prewarm(self, size, color):
+        try:
+            names = sorted(name for name in os.listdir(self.icons_path) if name.lower().endswith(".svg"))
+        except OSError:
+            return
+        for name in names:
+            self.bitmap(name, size, color)
+        self.save_index()
+        self._prune()
+
+    def _prune(self):
+        """بیت‌مپ‌های نسخه‌های قدیمی SVGها (هشی که دیگر در فهرست نیست) را حذف می‌کند."""
+        if not self.directory:
+            return
+        with self._lock:
+            digests = {entry["digest"][:32] for entry in self._load_index().values()}
+        try:
+            files = os.listdir(self.directory)
+        except OSError:
+            return
+        for filename in files:
+            if filename.endswith(".png") and filename.split("-", 1)[0] not in digests:
+                try:
+                    os.remove(os.path.join(self.directory, filename))
+                except OSError:
+                    pass
+
+    def wait(self, timeout=None):
+        if self._thread is not None:
+            self._thread.join(timeout)
@@ -0,0 +1,271 @@
+# importer.py
+
+import csv
+import os
+import queue
+import threading
+import time
+
+from .logic import RowDecoder
+
+VALID_PRIORITIES = ("پایین", "متوسط", "بالا")
+VALID_STATUSES = ("انجام نشده", "انجام شده")
+
+
+# ------------------ مراحل خط لوله وارد کردن ------------------
+
+def read_csv_rows(filepath, progress):
+    """ردیف‌های فایل CSV را به صورت جریانی (بدون خواندن کل فایل) تولید می‌کند.
+
+    progress یک دیکشنری است که bytes_read در آن به‌روز می‌شود.
+    خروجی: (شماره خط، ردیف)؛ اولین ردیف تولید شده هدر فایل است.
+    """
+    with open(filepath, mode="rb") as file:
+
+        def lines():
+            first = True
+            for raw in file:
+                progress["bytes_read"] += len(raw)
+                # فایل‌های ذخیره شده توسط برنامه با BOM شروع می‌شوند
+                yield raw.decode("utf-8-sig" if first else "utf-8")
+                first = False
+
+        reader = csv.reader(lines())
+        for row in reader:
+            if row:
+                yield reader.line_num, row
+
+
+def decode_rows(rows, header=None):
+    """ردیف‌ها را به کار تبدیل می‌کند؛ برای ردیف‌های خراب دلیل خطا را برمی‌گرداند.
+
+    نگاشت ستون‌ها یک بار از روی header ساخته می‌شود (RowDecoder).
+    خروجی: (شماره خط، کار یا None، پیام خطا یا None)
+    """
+    decode = RowDecoder(header).decode
+    for line_num, row in rows:
+        try:
+            task = decode(row)
+        except (ValueError, IndexError) as e:
+            yield line_num, None, f"ردیف نامعتبر: {e}"
+            continue
+        if task is None:
+            yield line_num, None, f"تعداد ستون‌ها کافی نیست ({len(row)})"
+        else:
+            yield line_num, task, None
+
+
+def validate_tasks(decoded):
+    """کارهای تبدیل شده را اعتبارسنجی می‌کند."""
+    for line_num, task, error in decoded:
+        if task is not None:
+            if not task.name.strip():
+                task, error = None, "نام کار خالی است"
+            elif task.priority not in VALID_PRIORITIES:
+                task, error = None, f"اولویت نامعتبر: {task.priority}"
+            elif task.status not in VALID_STATUSES:
+                task, error = None, f"وضعیت نامعتبر: {task.status}"
+            elif task.due_date and task.due is None:
+                task, error = None, f"تاریخ سررسید نامعتبر: {task.due_date}"
+            elif task.completion_date and task.completed_at is None:
+                task, error = None, f"تاریخ انجام نامعتبر: {task.completion_date}"
+        yield line_num, task, error
+
+
+# ------------------ کار وارد کردن ------------------
+
+class ImportJob:
+    """وارد کردن جریانی یک فایل CSV به ToDoList.
+
+    خواندن، تبدیل و اعتبارسنجی ردیف‌ها در یک رشته پس‌زمینه انجام می‌شود و
+    کارها در دسته‌های batch_size تایی از طریق یک صف محدود به رشته اصلی
+    (رابط کاربری) تحویل داده می‌شوند؛ بنابراین حافظه مصرفی به اندازه فایل
+    بستگی ندارد. ردیف‌های خراب به جای متوقف کردن کار، در bad_rows ثبت می‌شوند.
+    زیرکلاس‌ها (مثلاً وارد کردن اکسل) فقط read_rows و fraction را عوض می‌کنند.
+    """
+
+    # نام قالب فایل در پیام‌ها
+    FORMAT = "CSV"
+
+    def __init__(self, todo_list, filepath, batch_size=500, max_pending_batches=4,
+                 max_reported_errors=1000):
+        self.todo_list = todo_list
+        self.filepath = filepath
+        self.batch_size = batch_size
+        self.max_reported_errors = max_reported_errors
+
+        self.total_bytes = os.path.getsize(filepath) if os.path.exists(filepath) else 0
+        self.progress = {"bytes_read": 0}
+        self.rows_read = 0
+        self.imported_count = 0
+        self.bad_row_count = 0
+        self.bad_rows = []
+        self.error = None
+        self.done = False
+        self.cancelled = False
+
+        # شناسه‌های تکراری که هنگام افزودن عوض شده‌اند (شناسه فایل -> شناسه جدید)
+        self._id_map = {}
+        self._queue = queue.Queue(maxsize=max_pending_batches)
+        self._cancel = threading.Event()
+        self._thread = None
+        self._started_at = None
+        self._finished_at = None
+
+    # ---------- وضعیت ----------
+
+    @property
+    def success(self):
+        return self.error is None
+
+    @property
+    def fraction(self):
+        """درصد پیشرفت (۰ تا ۱) بر اساس بایت‌های خوانده شده."""
+        if not self.total_bytes:
+            return 1.0 if self.done else 0.0
+        return min(1.0, self.progress["bytes_read"] / self.total_bytes)
+
+    @property
+    def elapsed(self):
+        if self._started_at is None:
+            return 0.0
+        return (self._finished_at or time.monotonic()) - self._started_at
+
+    @property
+    def rows_per_second(self):
+        elapsed = self.elapsed
+        return self.rows_read / elapsed if elapsed > 0 else 0.0
+
+    def summary(self):
+        """پیام نهایی قابل نمایش به کاربر."""
+        if self.error:
+            return self.error
+        message = f"{self.imported_count} کار با موفقیت وارد شد."
+        if self.cancelled:
+            message = f"وارد کردن لغو شد. {message}"
+        if self.bad_row_count:
+            message += f"\n{self.bad_row_count} ردیف نامعتبر نادیده گرفته شد."
+            for line_num, reason in self.bad_rows[:5]:
+                message += f"\nخط {line_num}: {reason}"
+        return message
+
+    # ---------- خط لوله ----------
+
+    def read_rows(self):
+        """ردیف‌های خام فایل: (شماره خط، ردیف)؛ اولین ردیف هدر است."""
+        return read_csv_rows(self.filepath, self.progress)
+
+    def _iter_batches(self):
+        """کارهای معتبر را در دسته‌های batch_size تایی تولید می‌کند."""
+        rows = self.read_rows()
+        header = next(rows, None)
+        if header is None:
+            self.error = f"فایل {self.FORMAT} خالی است."
+            return
+
+        batch = []
+        for line_num, task, error in validate_tasks(decode_rows(rows, header[1])):
+            if self._cancel.is_set():
+                self.cancelled = True
+                break
+            self.rows_read += 1
+            if task is None:
+                self.bad_row_count += 1
+                if len(self.bad_rows) < self.max_reported_errors:
+                    self.bad_rows.append((line_num, error))
+                continue
+            batch.append(task)
+            if len(batch) >= self.batch_size:
+                yield batch
+                batch = []
+        if batch:
+            yield batch
+
+    def _commit(self, batch):
+        # در ذخیره‌سازی‌های غیرافزایشی، ذخیره کامل فقط یک بار در پایان انجام می‌شود
+        self.todo_list.add_tasks(
+            batch, persist=self.todo_list.storage.incremental, id_map=self._id_map
+        )
+        self.imported_count += len(batch)
+
+    def _finish(self):
+        if self.imported_count and not self.todo_list.storage.incremental:
+            self.todo_list._save_tasks()
+        self._finished_at = time.monotonic()
+        self.done = True
+
+    def run(self):
+        """کل فایل را همزمان در رشته فراخوان وارد می‌کند."""
+        self._started_at = time.monotonic()
+        try:
+            for batch in self._iter_batches():
+                self._commit(batch)
+        except Exception as e:
+            self.error = f"خطا در پردازش فایل {self.FORMAT}: {e}"
+        self._finish()
+
+    # ---------- اجرای پس‌زمینه ----------
+
+    def start(self):
+        """خواندن فایل را در یک رشته پس‌زمینه آغاز می‌کند."""
+        self._started_at = time.monotonic()
+        self._thread = threading.Thread(target=self._worker, name=f"{self.FORMAT.lower()}-import", daemon=True)
+        self._thread.start()
+
+    def _put(self, item):
+        # صف محدود است؛ اگر رابط کاربری عقب باشد رشته منتظر می‌ماند
+        while not self._cancel.is_set():
+            try:
+                self._queue.put(item, timeout=0.1)
+                return True
+            except queue.Full:
+                continue
+        return False
+
+    def _worker(self):
+        try:
+            for batch in self._iter_batches():
+                if not self._put(batch):
+                    self.cancelled = True
+                    break
+        except Exception as e:
+            self.error = f"خطا در پردازش فایل {self.FORMAT}: {e}"
+        # نشانه پایان؛ پس از لغو هم باید به رشته اصلی برسد
+        while True:
+            try:
+                self._queue.put(None, timeout=0.1)
+                return
+            except queue.Full:
+                if self._cancel.is_set():
+                    self._drain()
+
+    def _drain(self):
+        while True:
+            try:
+                self._queue.get_nowait()
+            except queue.Empty:
+                return
+
+    def cancel(self):
+        """درخواست توقف؛ دسته‌هایی که تا این لحظه اضافه شده‌اند باقی می‌مانند."""
+        if not self.done:
+            self.cancelled = True
+        self._cancel.set()
+
+    def poll(self, max_batches=4):
+        """دسته‌های آماده را در رشته اصلی به لیست اضافه می‌کند.
+
+        باید به صورت دوره‌ای (مثلاً با after) فراخوانی شود؛ True یعنی کار تمام شده است.
+        """
+        for _ in range(max_batches):
+            try:
+                batch = self._queue.get_nowait()
+            except queue.Empty:
+                return False
+            if batch is None:
+                self._finish()
+                return True
+            if self._cancel.is_set():
+                continue
+            self._commit(batch)
+        return False
@@ -0,0 +1,147 @@
+# indexes.py
+
+import bisect
+
+# ستون‌هایی که برای هر مقدار آن‌ها یک سطل (مجموعه شناسه‌ها) نگه داشته می‌شود
+BUCKET_FIELDS = ("category", "priority", "status")
+
+
+class TaskIndexes:
+    """ایندکس‌های ثانویه کارها برای فیلترهای سریع.
+
+    - برای دسته‌بندی، اولویت و وضعیت: دیکشنری مقدار -> مجموعه شناسه‌ها
+    - برای تاریخ سررسید: لیست مرتب (ordinal تاریخ، جایگاه، شناسه) که بازه‌ها
+      با bisect از آن برش زده می‌شوند
+    - جایگاه هر کار در لیست تا نتیجه بدون پیمایش کل لیست مرتب شود
+
+    کلیدهای هر کار هنگام افزودن ذخیره می‌شوند، بنابراین update را می‌توان
+    پس از تغییر درجای یک کار (مثلاً تغییر وضعیت) صدا زد.
+    """
+
+    def __init__(self, tasks=()):
+        self._buckets = {field: {} for field in BUCKET_FIELDS}
+        self._due = []
+        self._no_due = set()
+        self._keys = {}
+        self._positions = {}
+        self._next_position = 0
+        entries = []
+        for task in tasks:
+            entry = self._add_keys(task, self._next_position)
+            self._next_position += 1
+            if entry is not None:
+                entries.append(entry)
+        entries.sort()
+        self._due = entries
+
+    def __len__(self):
+        return len(self._keys)
+
+    # ---------- نگهداری ----------
+
+    def _add_keys(self, task, position):
+        """سطل‌ها را به‌روز کرده و مدخل ایندکس تاریخ را برمی‌گرداند (یا None)."""
+        task_id = task.task_id
+        values = (task.category, task.priority, task.status)
+        for field, value in zip(BUCKET_FIELDS, values):
+            bucket = self._buckets[field].get(value)
+            if bucket is None:
+                self._buckets[field][value] = {task_id}
+            else:
+                bucket.add(task_id)
+        if task.due is not None:
+            due_entry = (task.due.toordinal(), position, task_id)
+        else:
+            due_entry = None
+            self._no_due.add(task_id)
+        self._keys[task_id] = (values, due_entry)
+        self._positions[task_id] = position
+        return due_entry
+
+    def add(self, task, position=None):
+        if position is None:
+            position = self._next_position
+            self._next_position += 1
+        due_entry = self._add_keys(task, position)
+        if due_entry is not None:
+            bisect.insort(self._due, due_entry)
+
+    def remove(self, task):
+        task_id = task.task_id
+        keys = self._keys.pop(task_id, None)
+        if keys is None:
+            return None
+        values, due_entry = keys
+        for field, value in zip(BUCKET_FIELDS, values):
+            buckets = self._buckets[field]
+            bucket = buckets[value]
+            bucket.discard(task_id)
+            if not bucket:
+                del buckets[value]
+        if due_entry is not None:
+            i = bisect.bisect_left(self._due, due_entry)
+            if i < len(self._due) and self._due[i] == due_entry:
+                del self._due[i]
+        else:
+            self._no_due.discard(task_id)
+        return self._positions.pop(task_id)
+
+    def update(self, old_task, new_task):
+        """کار old_task (با کلیدهای ذخیره شده) را با new_task در همان جایگاه جایگزین می‌کند."""
+        position = self.remove(old_task)
+        self.add(new_task, position)
+
+    # ---------- پرس‌وجو ----------
+
+    def values(self, field):
+        """مقادیر موجود یک ستون همراه با تعداد کارها."""
+        return {value: len(ids) for value, ids in self._buckets[field].items()}
+
+    def ids_with(self, field, values):
+        """شناسه کارهایی که مقدار field آن‌ها یکی از values است."""
+        if isinstance(values, str):
+            return self._buckets[field].get(values, set())
+        buckets = self._buckets[field]
+        result = set()
+        for value in values:
+            result |= buckets.get(value, set())
+        return result
+
+    def ids_due_between(self, start=None, end=None):
+        """شناسه کارهایی که سررسیدشان بین start و end (هر دو شامل) است."""
+        due = self._due
+        lo = bisect.bisect_left(due, (start.toordinal(),)) if start is not None else 0
+        hi = bisect.bisect_left(due, (end.toordinal() + 1,)) if end is not None else len(due)
+        return {entry[2] for entry in due[lo:hi]}
+
+    def order(self, ids):
+        """شناسه‌ها را به ترتیب جایگاه کارها در لیست مرتب می‌کند."""
+        return sorted(ids, key=self._positions.__getitem__)
+
+    def query(self, category=None, priority=None, status=None, due_from=None, due_to=None,
+              has_due=None):
+        """شناسه کارهای منطبق بر همه شرط‌ها یا None اگر هیچ شرطی داده نشده باشد.
+
+        هر شرط ستونی می‌تواند یک مقدار یا مجموعه‌ای از مقادیر باشد. has_due
+        با False فقط کارهای بدون سررسید و با True فقط کارهای دارای سررسید را
+        نگه می‌دارد. اشتراک از کوچک‌ترین مجموعه شروع می‌شود تا هزینه متناسب
+        با اندازه نتیجه باشد.
+        """
+        candidates = []
+        for field, values in zip(BUCKET_FIELDS, (category, priority, status)):
+            if values is not None:
+                candidates.append(self.ids_with(field, values))
+        if due_from is not None or due_to is not None or has_due:
+            candidates.append(self.ids_due_between(due_from, due_to))
+        if has_due is False:
+            candidates.append(self._no_due)
+        if not candidates:
+            return None
+
+        candidates.sort(key=len)
+        result = set(candidates[0])
+        for ids in candidates[1:]:
+            if not result:
+                break
+            result.intersection_update(ids)
+        return result
@@ -1,16 +1,76 @@
 # logic.py
 
-import csv
 import os
 import base64
+import sys
 import time
 import json
-from datetime import datetime, timedelta
+from datetime import date, datetime, timedelta
+from functools import lru_cache
+from operator import itemgetter
+
+from .cleanup import CleanupIndex, config_path, load_config, save_config
+from .indexes import TaskIndexes
+from .reminders import ReminderQueue
+from .recurrence import MAX_CATCH_UP, RecurrenceIndex, format_weekdays, parse_weekdays, rule_for
+from .search import SearchIndex
+from .stats import TaskStats
+from .smartlists import SmartLists, definitions_path, load_definitions, save_definitions
+from .storage import BASE_COLUMNS, CSV_HEADER, create_storage
+from .tags import TagIndex, format_tags, parse_tags
+
+
+def _intern(value):
+    """رشته‌های تکراری را به یک نمونه مشترک تبدیل می‌کند."""
+    return sys.intern(value) if type(value) is str else value
+
+
+@lru_cache(maxsize=4096)
+def _parse_due(value):
+    """تاریخ سررسید تجزیه شده؛ تاریخ‌های تکراری فقط یک بار تجزیه می‌شوند."""
+    try:
+        return datetime.fromisoformat(value).date()
+    except (ValueError, TypeError):
+        return None
+
+
+@lru_cache(maxsize=4096)
+def _parse_completion(value):
+    """زمان انجام تجزیه شده؛ مقادیر تکراری فقط یک بار تجزیه می‌شوند."""
+    try:
+        return datetime.fromisoformat(value)
+    except (ValueError, TypeError):
+        return None
 
 
 class Task:
     """کلاسی برای مدل‌سازی یک کار تکی با وضعیت و تاریخ انجام."""
 
+    # بدون __dict__ برای هر نمونه؛ در لیست‌های بسیار بزرگ حافظه کمتری مصرف می‌شود
+    __slots__ = (
+        "name",
+        "description",
+        "priority",
+        "status",
+        "_completion_date",
+        "_completed_at",
+        "_due_date",
+        "_due",
+        "category",
+        "task_id",
+        "parent_id",
+        "subtask_order",
+        "is_recurring",
+        "_recurrence_pattern",
+        "_recurrence_raw",
+        "_notes",
+        "_notes_b64",
+        "tags",
+        "series_id",
+        "series_start",
+        "_subtasks",
+    )
+
     def __init__(
         self,
         name,
@@ -25,90 +85,254 @@ class Task:
         subtask_order=None,
         is_recurring=False,
         recurrence_pattern=None,
-        notes=""
+        notes="",
+        tags=None,
+        series_id=None,
+        series_start=None
     ):
         self.name = name
         self.description = description
-        self.priority = priority
-        self.status = status
+        # مقادیر تکراری (اولویت، وضعیت، دسته‌بندی) بین همه کارها به اشتراک گذاشته می‌شوند
+        self.priority = _intern(priority)
+        self.status = _intern(status)
         self.completion_date = completion_date
         self.due_date = due_date
-        self.category = category or "بدون دسته"
+        self.category = _intern(category or "بدون دسته")
         self.task_id = task_id or self._generate_task_id()
         self.parent_id = parent_id
         self.subtask_order = subtask_order
         self.is_recurring = is_recurring
         self.recurrence_pattern = recurrence_pattern
         self.notes = notes
-        self.subtasks = []
+        self.tags = parse_tags(tags)
+        # شناسه سری تکرار (شناسه اولین نمونه) و تاریخ شروع سری؛ نمونه‌های بعدی
+        # از همین تاریخ محاسبه می‌شوند نه از سررسید نمونه قبلی
+        self.series_id = series_id
+        self.series_start = series_start
+        # لیست زیرکارها فقط برای کارهایی که زیرکار دارند ساخته می‌شود
+        self._subtasks = None
+
+    @classmethod
+    def _from_columns(
+        cls,
+        task_id,
+        name,
+        description,
+        priority,
+        status,
+        completion_date,
+        due_date,
+        category,
+        parent_id,
+        subtask_order,
+        is_recurring,
+        recurrence_type,
+        recurrence_interval,
+        recurrence_weekdays,
+        recurrence_end_date,
+        notes_encoded,
+        tags="",
+        series_id="",
+        series_start="",
+    ):
+        """ساخت سریع یک کار از مقادیر خام ستون‌های فرمت کامل CSV.
+
+        یادداشت‌ها (base64) و الگوی تکرار تا اولین دسترسی رمزگشایی نمی‌شوند.
+        """
+        task = cls.__new__(cls)
+        task.name = name
+        task.description = description
+        # مقادیر ستون‌های CSV همیشه رشته هستند
+        task.priority = sys.intern(priority)
+        task.status = sys.intern(status)
+        task._completion_date = completion_date or None
+        task._completed_at = _parse_completion(completion_date) if completion_date else None
+        task._due_date = due_date or None
+        task._due = _parse_due(due_date) if due_date else None
+        task.category = sys.intern(category or "بدون دسته")
+        task.task_id = task_id or task._generate_task_id()
+        task.parent_id = parent_id or None
+        task.subtask_order = int(subtask_order) if subtask_order else None
+        task.is_recurring = is_recurring.lower() == "true"
+        task._recurrence_pattern = None
+        task._recurrence_raw = None
+        if task.is_recurring and recurrence_type:
+            task._recurrence_raw = (
+                recurrence_type, recurrence_interval, recurrence_weekdays, recurrence_end_date
+            )
+        task._notes = None if notes_encoded else ""
+        task._notes_b64 = notes_encoded
+        task.tags = parse_tags(tags) if tags else ()
+        task.series_id = series_id or None
+        task.series_start = series_start or None
+        task._subtasks = None
+        return task
+
+    @property
+    def notes(self):
+        """یادداشت‌های کار؛ نسخه base64 خوانده شده از فایل در اولین دسترسی رمزگشایی می‌شود."""
+        if self._notes is None:
+            try:
+                self._notes = base64.b64decode(self._notes_b64).decode('utf-8')
+            except Exception:
+                self._notes = ""
+        return self._notes
+
+    @notes.setter
+    def notes(self, value):
+        # نسخه base64 همین‌جا (در رشته‌ای که کار را تغییر می‌دهد) ساخته می‌شود تا
+        # to_list فقط بخواند و در رشته نویسنده پس‌زمینه چیزی در کار ننویسد
+        notes = value or ""
+        self._notes_b64 = base64.b64encode(notes.encode('utf-8')).decode('utf-8') if notes else ""
+        self._notes = notes
+
+    @property
+    def recurrence_pattern(self):
+        """الگوی تکرار؛ ستون‌های خام فایل در اولین دسترسی تجزیه می‌شوند."""
+        if self._recurrence_raw is not None:
+            recurrence_type, interval, weekdays, end_date = self._recurrence_raw
+            try:
+                weekday_list, nth = parse_weekdays(weekdays)
+                self._recurrence_pattern = {
+                    "type": recurrence_type,
+                    "interval": int(interval) if interval else 1,
+                    "weekdays": weekday_list,
+                    "end_date": end_date if end_date else None
+                }
+                if nth:
+                    self._recurrence_pattern["nth"] = nth
+            except ValueError:
+                self._recurrence_pattern = None
+            self._recurrence_raw = None
+        return self._recurrence_pattern
+
+    @recurrence_pattern.setter
+    def recurrence_pattern(self, value):
+        self._recurrence_pattern = value
+        self._recurrence_raw = None
 
     def _generate_task_id(self):
         """تولید شناسه یکتا برای کار با استفاده از timestamp و عدد تصادفی."""
         return f"{int(time.time() * 1000)}_{os.urandom(4).hex()}"
 
+    @property
+    def due_date(self):
+        """تاریخ سررسید به صورت رشته ISO (یا None)."""
+        return self._due_date
+
+    @due_date.setter
+    def due_date(self, value):
+        # تاریخ فقط یک بار (هنگام مقداردهی) تجزیه و نگه داشته می‌شود
+        self._due_date = value
+        self._due = _parse_due(value) if value else None
+
+    @property
+    def due(self):
+        """تاریخ سررسید تجزیه شده (date) یا None اگر تاریخ نامعتبر یا خالی باشد."""
+        return self._due
+
+    @property
+    def series_anchor(self):
+        """تاریخ شروع سری تکرار (date)؛ برای کارهای قدیمی بدون آن، سررسید همین نمونه.
+
+        قانون تکرار (مثلاً «روز ۳۱ هر ماه» که در ماه‌های کوتاه‌تر به روز آخر
+        می‌افتد) از این تاریخ محاسبه می‌شود.
+        """
+        start = _parse_due(self.series_start) if self.series_start else None
+        return start or self._due
+
+    @property
+    def completion_date(self):
+        """تاریخ انجام به صورت رشته ISO (یا None)."""
+        return self._completion_date
+
+    @completion_date.setter
+    def completion_date(self, value):
+        self._completion_date = value
+        self._completed_at = _parse_completion(value) if value else None
+
+    @property
+    def completed_at(self):
+        """زمان انجام تجزیه شده (datetime) یا None."""
+        return self._completed_at
+
     def is_completed(self):
         """بررسی می‌کند که آیا کار انجام شده است."""
         return self.status == "انجام شده"
 
-    def is_overdue(self):
+    def is_overdue(self, today=None):
         """بررسی می‌کند که آیا کار گذشته از موعد است."""
-        if not self.due_date or self.is_completed():
-            return False
-        try:
-            due = datetime.fromisoformat(self.due_date).date()
-            today = datetime.now().date()
-            return due < today
-        except (ValueError, TypeError):
+        if self._due is None or self.is_completed():
             return False
+        return self._due < (today or date.today())
 
-    def is_due_today(self):
+    def is_due_today(self, today=None):
         """بررسی می‌کند که آیا کار امروز سررسید دارد."""
-        if not self.due_date or self.is_completed():
-            return False
-        try:
-            due = datetime.fromisoformat(self.due_date).date()
-            today = datetime.now().date()
-            return due == today
-        except (ValueError, TypeError):
+        if self._due is None or self.is_completed():
             return False
+        return self._due == (today or date.today())
 
-    def get_due_status(self):
+    def get_due_status(self, today=None):
         """وضعیت سررسید کار را برمی‌گرداند."""
-        if not self.due_date or self.is_completed():
-            return "-"
-        if self.is_overdue():
-            return "دیرکرد"
-        if self.is_due_today():
-            return "امروز"
-        return ""
-
-    def get_formatted_due_date(self):
+        return self.classify_due(today)[3]
+
+    def get_formatted_due_date(self, today=None):
         """تاریخ سررسید را به صورت فرمت شده برمی‌گرداند."""
-        if not self.due_date:
-            return ""
-        try:
-            due = datetime.fromisoformat(self.due_date).date()
-            today = datetime.now().date()
-            delta = (due - today).days
-
-            if delta == 0:
-                return "امروز"
-            elif delta == 1:
-                return "فردا"
-            elif delta == -1:
-                return "دیروز"
-            elif delta > 0 and delta <= 7:
-                return f"{delta} روز دیگر"
-            elif delta < 0 and delta >= -7:
-                return f"{abs(delta)} روز پیش"
-            else:
-                return self.due_date
-        except (ValueError, TypeError):
-            return self.due_date or ""
+        return self.classify_due(today)[2]
+
+    def classify_due(self, today=None):
+        """وضعیت سررسید را در یک مرحله محاسبه می‌کند.
+
+        خروجی: (دیرکرد دارد، سررسید امروز است، برچسب نسبی تاریخ، وضعیت سررسید)
+        """
+        if not self._due_date:
+            return False, False, "", "-"
+        due = self._due
+        if due is None:
+            return False, False, self._due_date, "-" if self.is_completed() else ""
+
+        delta = (due - (today or date.today())).days
+        if delta == 0:
+            label = "امروز"
+        elif delta == 1:
+            label = "فردا"
+        elif delta == -1:
+            label = "دیروز"
+        elif 0 < delta <= 7:
+            label = f"{delta} روز دیگر"
+        elif -7 <= delta < 0:
+            label = f"{abs(delta)} روز پیش"
+        else:
+            label = self._due_date
+
+        if self.is_completed():
+            return False, False, label, "-"
+        if delta < 0:
+            return True, False, label, "دیرکرد"
+        if delta == 0:
+            return False, True, label, "امروز"
+        return False, False, label, ""
+
+    @property
+    def subtasks(self):
+        """زیرکارهای این کار (برای کارهای بدون زیرکار یک tuple خالی)."""
+        if self._subtasks is None:
+            return ()
+        return self._subtasks
+
+    @subtasks.setter
+    def subtasks(self, subtasks):
+        self._subtasks = subtasks or None
+
+    def add_subtask(self, subtask):
+        """یک زیرکار به انتهای لیست زیرکارها اضافه می‌کند."""
+        if self._subtasks is None:
+            self._subtasks = []
+        self._subtasks.append(subtask)
 
     def has_subtasks(self):
         """بررسی می‌کند که آیا کار دارای زیرکار است."""
-        return len(self.subtasks) > 0
+        return bool(self._subtasks)
 
     def get_subtask_progress(self):
         """پیشرفت زیرکارها را برمی‌گرداند (تعداد انجام شده / کل)."""
@@ -120,23 +344,23 @@ class Task:
 
     def to_list(self):
         """یک کار را برای نوشتن در فایل CSV به لیست تبدیل می‌کند."""
-        # رمزگذاری notes به base64
-        notes_encoded = ""
-        if self.notes:
-            notes_encoded = base64.b64encode(self.notes.encode('utf-8')).decode('utf-8')
+        # notes به صورت base64 (مقدار خوانده شده از فایل یا ساخته شده در setter)
+        notes_encoded = self._notes_b64
 
-        # تبدیل recurrence_pattern به JSON
-        recurrence_json = ""
         recurrence_type = ""
         recurrence_interval = ""
         recurrence_weekdays = ""
         recurrence_end_date = ""
 
-        if self.is_recurring and self.recurrence_pattern:
+        if self.is_recurring and self._recurrence_raw is not None:
+            # الگوی تکرار هنوز تجزیه نشده؛ ستون‌های خام بدون تغییر نوشته می‌شوند
+            recurrence_type, recurrence_interval, recurrence_weekdays, recurrence_end_date = (
+                self._recurrence_raw
+            )
+        elif self.is_recurring and self.recurrence_pattern:
             recurrence_type = self.recurrence_pattern.get("type", "")
             recurrence_interval = str(self.recurrence_pattern.get("interval", ""))
-            weekdays = self.recurrence_pattern.get("weekdays", [])
-            recurrence_weekdays = ",".join(map(str, weekdays)) if weekdays else ""
+            recurrence_weekdays = format_weekdays(self.recurrence_pattern)
             recurrence_end_date = self.recurrence_pattern.get("end_date", "") or ""
 
         return [
@@ -155,410 +379,814 @@ class Task:
             recurrence_interval,
             recurrence_weekdays,
             recurrence_end_date,
-            notes_encoded
+            notes_encoded,
+            format_tags(self.tags),
+            self.series_id or "",
+            self.series_start or "",
         ]
 
 
+def classify_due_dates(tasks, today=None):
+    """وضعیت سررسید همه کارها را نسبت به یک تاریخ مرجع واحد محاسبه می‌کند.
+
+    برای هر کار یک چهارتایی (دیرکرد، امروز، برچسب نسبی، وضعیت سررسید) برمی‌گرداند.
+    """
+    today = today or date.today()
+    return [task.classify_due(today) for task in tasks]
+
+
+def task_from_row(row):
+    """یک ردیف CSV (فرمت ۱۶ ستونی یا فرمت‌های قدیمی ۴ و ۵ ستونی) را به Task تبدیل می‌کند.
+
+    فرمت بر اساس تعداد ستون‌های همین ردیف تشخیص داده می‌شود؛ برای فایل‌هایی که
+    هدر شناخته شده دارند RowDecoder سریع‌تر است. برای ردیف‌های کوتاه‌تر از ۴ ستون
+    None برمی‌گرداند.
+    """
+    # پشتیبانی از فرمت جدید (16 ستون و ستون‌های اختیاری بعدی)
+    if len(row) >= BASE_COLUMNS:
+        return Task._from_columns(*row[:len(CSV_HEADER)])
+
+    # پشتیبانی از فرمت‌های قدیمی (5 و 4 ستون)
+    if len(row) >= 4:
+        return Task(
+            name=row[0],
+            description=row[1],
+            priority=row[2],
+            status=row[3],
+            completion_date=row[4] if len(row) > 4 and row[4] else None,
+        )
+    return None
+
+
+class RowDecoder:
+    """تبدیل ردیف‌های CSV به Task با نگاشت ستون‌هایی که یک بار از روی هدر فایل ساخته می‌شود.
+
+    اگر هدر فرمت کامل باشد (با هر ترتیبی از ستون‌ها)، هر ردیف بدون هیچ بررسی
+    فرمتی مستقیماً به Task._from_columns داده می‌شود. برای هدرهای قدیمی نیز
+    یک نگاشت ثابت ساخته می‌شود و فقط برای هدرهای ناشناخته، فرمت هر ردیف
+    جداگانه تشخیص داده می‌شود.
+    """
+
+    LEGACY_COLUMNS = ("Name", "Description", "Priority", "Status")
+
+    def __init__(self, header=None):
+        columns = {}
+        for i, name in enumerate(header or ()):
+            columns.setdefault(name.strip().lstrip("\ufeff"), i)
+
+        if all(name in columns for name in CSV_HEADER[:BASE_COLUMNS]):
+            self.format = "full"
+            # ستون‌های اضافه شده بعدی (مثل Tags) در فایل‌های قدیمی‌تر وجود ندارند
+            indices = [columns[name] for name in CSV_HEADER if name in columns]
+            width = max(indices) + 1
+            getter = itemgetter(*indices)
+            from_columns = Task._from_columns
+            # ردیف‌های کوتاه‌تر (فرمت قدیمی در همان فایل) جداگانه تشخیص داده می‌شوند
+            self.decode = lambda row: (
+                from_columns(*getter(row)) if len(row) >= width else task_from_row(row)
+            )
+        elif all(name in columns for name in self.LEGACY_COLUMNS):
+            self.format = "legacy"
+            getter = itemgetter(*(columns[name] for name in self.LEGACY_COLUMNS))
+            completion_index = columns.get("CompletionDate")
+            self.decode = lambda row: self._decode_legacy(getter(row), row, completion_index)
+        else:
+            self.format = "detect"
+            self.decode = task_from_row
+
+    @staticmethod
+    def _decode_legacy(values, row, completion_index):
+        name, description, priority, status = values
+        completion_date = None
+        if completion_index is not None and completion_index < len(row):
+            completion_date = row[completion_index] or None
+        return Task(
+            name=name,
+            description=description,
+            priority=priority,
+            status=status,
+            completion_date=completion_date,
+        )
+
+
 class ToDoList:
     """کلاسی برای مدیریت کل لیست کارها و فایل CSV."""
 
-    def __init__(self, filename="tasks.csv"):
+    def __init__(self, filename="tasks.csv", storage=None, load=True):
+        """اگر load برابر False باشد کارها بارگذاری نمی‌شوند تا با load_steps به تدریج
+        (مثلاً پس از نمایش پنجره برنامه) بارگذاری شوند."""
         self.filename = filename
-        self.tasks = []
+        self.storage = storage or create_storage(filename)
+        # ایندکس اصلی کارها بر اساس task_id (به ترتیب افزودن)
+        self._tasks_by_id = {}
+        self._tasks_view = None
+        # ایندکس‌های ثانویه فعال؛ در اولین استفاده ساخته و با هر تغییر به‌روز می‌شوند
+        self._indexes = []
+        self._search_index = None
+        self._task_indexes = None
+        self._tag_index = None
+        self._smart_lists = None
+        self._cleanup_index = None
+        self._cleanup_config = None
+        self._recurrence_index = None
+        self._reminder_queue = None
+        self._stats = None
         self.categories = set()
+        self._sorted_categories = None
         self._default_categories = ["بدون دسته", "کاری", "شخصی", "خانه", "خرید", "مطالعه"]
         self.categories.update(self._default_categories)
-        self._load_tasks()
-        # در ابتدای اجرای برنامه، کارهای قدیمی را پاک کن
-        # self._cleanup_old_tasks()  # Will be replaced with configurable cleanup
+        # تا پایان بارگذاری، ذخیره‌سازی به تعویق می‌افتد (لیست هنوز کامل نیست)
+        self.loaded = False
+        self._save_after_load = False
+        # خطای بارگذاری (اگر رخ داده باشد)؛ در این حالت هیچ تغییری ذخیره نمی‌شود
+        # تا فایل کاربر با لیست ناقص بازنویسی نشود
+        self.load_error = None
+        if load:
+            self._load_tasks()
+        # پاکسازی کارهای قدیمی با run_cleanup و به صورت دوره‌ای (توسط رابط کاربری) انجام می‌شود
+
+    @property
+    def tasks(self):
+        """لیست کارها به ترتیب افزودن.
+
+        این لیست از روی ایندکس شناسه‌ها ساخته و تا تغییر بعدی نگه داشته می‌شود؛
+        برای تغییر کارها باید از متدهای ToDoList استفاده کرد.
+        """
+        if self._tasks_view is None:
+            self._tasks_view = list(self._tasks_by_id.values())
+        return self._tasks_view
+
+    @tasks.setter
+    def tasks(self, tasks):
+        self._tasks_by_id = {}
+        self._tasks_view = None
+        self._reset_indexes()
+        for task in tasks:
+            self._register(task)
+
+    def _register(self, task):
+        """یک کار را به ایندکس شناسه‌ها اضافه می‌کند."""
+        existing = self._tasks_by_id.get(task.task_id)
+        if existing is not None and existing is not task:
+            # شناسه تکراری (مثلاً وارد کردن دوباره یک فایل)؛ شناسه تازه می‌گیرد
+            task.task_id = task._generate_task_id()
+        self._tasks_by_id[task.task_id] = task
+        if self._tasks_view is not None:
+            self._tasks_view.append(task)
+        self._index_add(task)
+
+    # ---------- ایندکس‌های ثانویه ----------
+
+    def _reset_indexes(self):
+        """ایندکس‌ها را کنار می‌گذارد؛ در استفاده بعدی از نو ساخته می‌شوند."""
+        self._indexes = []
+        self._search_index = None
+        self._task_indexes = None
+        self._tag_index = None
+        self._smart_lists = None
+        self._cleanup_index = None
+        self._recurrence_index = None
+        self._reminder_queue = None
+        self._stats = None
+
+    def _index_add(self, task):
+        for index in self._indexes:
+            index.add(task)
+
+    def _index_remove(self, task):
+        for index in self._indexes:
+            index.remove(task)
+
+    def _index_update(self, old_task, new_task):
+        """پس از ویرایش یا تغییر درجای یک کار صدا زده می‌شود."""
+        for index in self._indexes:
+            index.update(old_task, new_task)
+
+    @property
+    def indexes(self):
+        """ایندکس‌های دسته‌بندی، اولویت، وضعیت و سررسید (در اولین فیلتر ساخته می‌شوند)."""
+        if self._task_indexes is None:
+            self._task_indexes = TaskIndexes(self.tasks)
+            self._indexes.append(self._task_indexes)
+        return self._task_indexes
+
+    @property
+    def search_index(self):
+        """ایندکس جستجوی متن کامل (در اولین جستجو ساخته می‌شود)."""
+        if self._search_index is None:
+            self._search_index = SearchIndex(self.tasks)
+            self._indexes.append(self._search_index)
+        return self._search_index
+
+    @property
+    def tag_index(self):
+        """ایندکس bitmap برچسب‌ها (در اولین استفاده ساخته می‌شود)."""
+        if self._tag_index is None:
+            self._tag_index = TagIndex(self.tasks)
+            self._indexes.append(self._tag_index)
+        return self._tag_index
+
+    @property
+    def smart_lists(self):
+        """لیست‌های هوشمند ذخیره شده که با هر تغییر کارها به‌روز می‌شوند."""
+        if self._smart_lists is None:
+            definitions = load_definitions(definitions_path(self.filename))
+            self._smart_lists = SmartLists(definitions, self.tasks)
+            self._indexes.append(self._smart_lists)
+        return self._smart_lists
+
+    def save_smart_list(self, definition):
+        """یک لیست هوشمند را تعریف (یا جایگزین) و در فایل تعریف‌ها ذخیره می‌کند."""
+        smart_list = self.smart_lists.define(definition, self.tasks)
+        save_definitions(definitions_path(self.filename), self.smart_lists.definitions())
+        return smart_list
+
+    def delete_smart_list(self, name):
+        if self.smart_lists.remove_list(name):
+            save_definitions(definitions_path(self.filename), self.smart_lists.definitions())
+            return True
+        return False
+
+    def refresh_smart_lists(self, today=None):
+        """پس از عوض شدن روز فقط لیست‌های وابسته به تاریخ را دوباره ارزیابی می‌کند."""
+        if self._smart_lists is None:
+            return []
+        return self._smart_lists.refresh_day(self.tasks, today)
+
+    @property
+    def recurrence_index(self):
+        """سری‌های کارهای تکرارشونده (در اولین استفاده ساخته می‌شود)."""
+        if self._recurrence_index is None:
+            self._recurrence_index = RecurrenceIndex(self.tasks)
+            self._indexes.append(self._recurrence_index)
+        return self._recurrence_index
+
+    @property
+    def reminder_queue(self):
+        """صف زمان یادآوری کارهای دارای سررسید (در اولین استفاده ساخته می‌شود)."""
+        if self._reminder_queue is None:
+            self._reminder_queue = ReminderQueue(self.tasks)
+            self._indexes.append(self._reminder_queue)
+        return self._reminder_queue
+
+    @property
+    def stats(self):
+        """شمارنده‌های آماری کارها (در اولین باز شدن پنجره آمار ساخته می‌شوند)."""
+        if self._stats is None:
+            self._stats = TaskStats(self.tasks)
+            self._indexes.append(self._stats)
+        return self._stats
+
+    def get_all_tags(self):
+        """برچسب‌های به کار رفته، مرتب شده."""
+        return sorted(self.tag_index.tags())
+
+    def search(self, query):
+        """کارهایی که همه واژه‌های query را (به صورت پیشوندی) در نام، توضیحات یا یادداشت دارند."""
+        ids = self.search_index.search(query)
+        if ids is None:
+            return self.tasks
+        return [task for task in self.tasks if task.task_id in ids]
+
+    def filter_tasks(self, category=None, priority=None, status=None,
+                     due_from=None, due_to=None, has_due=None, query=None, tags=None,
+                     smart_list=None):
+        """کارهای منطبق بر همه شرط‌ها را به ترتیب لیست برمی‌گرداند.
+
+        category، priority و status می‌توانند یک مقدار یا مجموعه‌ای از مقادیر
+        باشند؛ due_from و due_to (از نوع date) بازه سررسید را مشخص می‌کنند،
+        has_due=False فقط کارهای بدون سررسید را نگه می‌دارد، query جستجوی
+        متنی است، tags یک عبارت برچسب (مثلاً «فوری & !خانه») و smart_list
+        نام یکی از لیست‌های هوشمند. عبارت برچسب نامعتبر ValueError ایجاد
+        می‌کند. شرط‌های None نادیده گرفته می‌شوند. هزینه با اندازه نتیجه
+        متناسب است، نه با تعداد کل کارها.
+        """
+        ids = self.indexes.query(category, priority, status, due_from, due_to, has_due)
+        if smart_list is not None:
+            matches = self.smart_lists.ids(smart_list)
+            ids = set(matches) if ids is None else ids & matches
+        if tags and tags.strip():
+            matches = self.tag_index.query(tags)
+            ids = matches if ids is None else ids & matches
+        if query and query.strip():
+            matches = self.search_index.search(query)
+            if matches is not None:
+                ids = matches if ids is None else ids & matches
+        if ids is None:
+            return self.tasks
+        return [self._tasks_by_id[task_id] for task_id in self.indexes.order(ids)]
+
+    def get_task(self, task_id):
+        """کار با شناسه داده شده را برمی‌گرداند (یا None)."""
+        return self._tasks_by_id.get(task_id)
 
     def _load_tasks(self):
-        """کارها را از فایل CSV اصلی برنامه بارگذاری می‌کند."""
-        if not os.path.exists(self.filename):
-            return
+        """کارها را از فایل CSV اصلی برنامه (یکجا) بارگذاری می‌کند."""
+        for _ in self.load_steps(batch_size=None):
+            pass
+
+    def load_steps(self, batch_size=2000):
+        """کارها را به تدریج بارگذاری می‌کند؛ پس از خواندن فایل و پس از هر batch_size
+        کار، تعداد کارهای بارگذاری شده را yield می‌کند.
+
+        ساختار زیرکارها همزمان با افزودن کارها ساخته می‌شود تا بخش بارگذاری
+        شده لیست در هر مرحله قابل نمایش باشد. تغییراتی که پیش از پایان
+        بارگذاری انجام شوند (مثلاً کاری که کاربر در همین حین اضافه کرده) با
+        یک ذخیره کامل در پایان ذخیره می‌شوند تا فایل با لیست نیمه‌کاره
+        بازنویسی نشود. اگر خواندن فایل با خطا متوقف شود، خطا در load_error
+        نگه داشته می‌شود و ذخیره‌سازی برای بقیه این اجرا غیرفعال می‌ماند.
+        """
         try:
-            with open(self.filename, mode="r", newline="", encoding="utf-8") as file:
-                reader = csv.reader(file)
-                header = next(reader, None)
-
-                for row in reader:
-                    if not row:
-                        continue
-
-                    # پشتیبانی از فرمت جدید (16 ستون)
-                    if len(row) >= 16:
-                        # رمزگشایی notes از base64
-                        notes = ""
-                        if row[15]:
-                            try:
-                                notes = base64.b64decode(row[15]).decode('utf-8')
-                            except Exception:
-                                notes = ""
-
-                        # ساخت recurrence_pattern از ستون‌های CSV
-                        recurrence_pattern = None
-                        is_recurring = row[10].lower() == "true"
-                        if is_recurring and row[11]:
-                            recurrence_pattern = {
-                                "type": row[11],
-                                "interval": int(row[12]) if row[12] else 1,
-                                "weekdays": [int(d) for d in row[13].split(",")] if row[13] else [],
-                                "end_date": row[14] if row[14] else None
-                            }
-
-                        task = Task(
-                            task_id=row[0],
-                            name=row[1],
-                            description=row[2],
-                            priority=row[3],
-                            status=row[4],
-                            completion_date=row[5] if row[5] else None,
-                            due_date=row[6] if row[6] else None,
-                            category=row[7] if row[7] else "بدون دسته",
-                            parent_id=row[8] if row[8] else None,
-                            subtask_order=int(row[9]) if row[9] else None,
-                            is_recurring=is_recurring,
-                            recurrence_pattern=recurrence_pattern,
-                            notes=notes
-                        )
-
-                        # افزودن دسته‌بندی به لیست دسته‌بندی‌ها
-                        if task.category:
-                            self.categories.add(task.category)
-
-                        self.tasks.append(task)
-
-                    # پشتیبانی از فرمت قدیمی (5 ستون)
-                    elif len(row) == 5:
-                        completion_date = row[4] if row[4] else None
-                        task = Task(
-                            name=row[0],
-                            description=row[1],
-                            priority=row[2],
-                            status=row[3],
-                            completion_date=completion_date,
-                        )
-                        self.tasks.append(task)
-
-                    # پشتیبانی از فرمت قدیمی‌تر (4 ستون)
-                    elif len(row) == 4:
-                        task = Task(
-                            name=row[0],
-                            description=row[1],
-                            priority=row[2],
-                            status=row[3],
-                        )
-                        self.tasks.append(task)
-
-                # ساخت ساختار زیرکار بر اساس parent_id
-                self._build_subtask_hierarchy()
+            rows = self.storage.iter_rows()
+            yield 0
+            decode = RowDecoder(self.storage.header).decode
+            task_dict = self._tasks_by_id
+            # زیرکارهایی که والدشان هنوز بارگذاری نشده است
+            orphans = []
+            parents = set()
+            for count, row in enumerate(rows, start=1):
+                if batch_size and count % batch_size == 0:
+                    yield len(task_dict)
+                try:
+                    task = decode(row)
+                except (IndexError, ValueError):
+                    # ردیف ناقص یا خراب؛ بقیه فایل بارگذاری می‌شود
+                    continue
+                if task is None:
+                    continue
+
+                # افزودن دسته‌بندی به لیست دسته‌بندی‌ها
+                if task.category:
+                    self.categories.add(task.category)
+                    self._sorted_categories = None
+
+                self._register(task)
+                if task.parent_id:
+                    parent = task_dict.get(task.parent_id)
+                    if parent is None:
+                        orphans.append(task)
+                    else:
+                        parent.add_subtask(task)
+                        parents.add(parent.task_id)
+
+            for task in orphans:
+                parent = task_dict.get(task.parent_id)
+                if parent is not None:
+                    parent.add_subtask(task)
+                    parents.add(parent.task_id)
+            # مرتب‌سازی زیرکارها بر اساس subtask_order
+            for parent_id in parents:
+                parent = task_dict.get(parent_id)
+                if parent is not None:
+                    parent.subtasks.sort(key=lambda st: st.subtask_order if st.subtask_order is not None else 0)
+
+            self.loaded = True
+            # اگر ذخیره‌سازی نیاز به snapshot تازه دارد (مثلاً ژورنال نیمه‌کاره)
+            # یا در حین بارگذاری تغییری ذخیره نشده است
+            if self.storage.requires_snapshot or self._save_after_load:
+                self._save_after_load = False
+                self._save_tasks()
 
         except Exception as e:
+            self.load_error = e
             print(f"خطا در بارگذاری فایل: {e}")
+        finally:
+            self.loaded = True
 
     def _save_tasks(self):
         """کل لیست کارها را در فایل CSV اصلی برنامه ذخیره می‌کند."""
+        if not self.loaded:
+            self._save_after_load = True
+            return
+        if self.load_error is not None:
+            return
         try:
-            with open(self.filename, mode="w", newline="", encoding="utf-8-sig") as file:
-                writer = csv.writer(file)
-                # نوشتن هدر جدید با تمام ستون‌ها
-                writer.writerow([
-                    "TaskID", "Name", "Description", "Priority", "Status",
-                    "CompletionDate", "DueDate", "Category", "ParentID", "SubtaskOrder",
-                    "IsRecurring", "RecurrenceType", "RecurrenceInterval",
-                    "RecurrenceWeekdays", "RecurrenceEndDate", "Notes"
-                ])
-
-                # ذخیره کارهای والد ابتدا، سپس زیرکارها
-                def write_task_and_subtasks(task):
-                    writer.writerow(task.to_list())
-                    for subtask in task.subtasks:
-                        write_task_and_subtasks(subtask)
-
-                # نوشتن فقط کارهای ریشه (بدون parent)
-                for task in self.tasks:
-                    if not task.parent_id:
-                        write_task_and_subtasks(task)
-
+            self.storage.save(self._snapshot_rows())
         except Exception as e:
             print(f"خطا در ذخیره فایل: {e}")
 
-    def _build_subtask_hierarchy(self):
-        """ساختار زیرکارها را بر اساس parent_id می‌سازد."""
-        # ایجاد دیکشنری برای دسترسی سریع به کارها بر اساس task_id
-        task_dict = {task.task_id: task for task in self.tasks}
-
-        # پیدا کردن زیرکارها و افزودن به والدشان
-        for task in self.tasks:
-            if task.parent_id and task.parent_id in task_dict:
-                parent = task_dict[task.parent_id]
-                parent.subtasks.append(task)
+    def _snapshot(self):
+        """کارها را به ترتیب ذخیره‌سازی برمی‌گرداند: هر کار والد و سپس زیرکارهایش.
+
+        ترتیب (پیمایش لیست کارها و زیرکارهای هر کار) همین‌جا ساخته می‌شود تا
+        تغییرات بعدی لیست روی آن اثر نگذارد.
+        """
+        ordered = []
+        # فقط کارهای ریشه (بدون parent)؛ زیرکارها از طریق والدشان اضافه می‌شوند
+        stack = [task for task in reversed(list(self._tasks_by_id.values())) if not task.parent_id]
+        while stack:
+            task = stack.pop()
+            ordered.append(task)
+            if task.has_subtasks():
+                stack.extend(reversed(task.subtasks))
+        return ordered
+
+    def _snapshot_rows(self):
+        """ردیف‌های CSV همه کارها به ترتیب ذخیره‌سازی.
+
+        ردیف‌ها در رشته فراخوان (رشته Tk) ساخته می‌شوند؛ ذخیره‌سازی‌ها (از جمله
+        نویسنده‌های پس‌زمینه) فقط همین ردیف‌ها را می‌گیرند و به کارها دست نمی‌زنند.
+        """
+        return [task.to_list() for task in self._snapshot()]
+
+    def _persist(self, changed=(), removed=()):
+        """تغییرات را ذخیره می‌کند؛ در حالت ژورنال فقط رکورد تغییرات اضافه می‌شود."""
+        if not self.loaded:
+            # بارگذاری تدریجی تمام نشده؛ پس از آن یکجا ذخیره می‌شود
+            self._save_after_load = True
+            return
+        if self.load_error is not None:
+            return
+        if not self.storage.incremental:
+            self._save_tasks()
+            return
+        try:
+            if self.storage.record([task.to_list() for task in changed], removed):
+                self.storage.compact_async(self._snapshot_rows())
+        except Exception as e:
+            print(f"خطا در ذخیره فایل: {e}")
 
-        # مرتب‌سازی زیرکارها بر اساس subtask_order
-        for task in self.tasks:
-            if task.subtasks:
-                task.subtasks.sort(key=lambda st: st.subtask_order if st.subtask_order is not None else 0)
+    def close(self):
+        """تغییرات در انتظار را نوشته و منابع ذخیره‌سازی را آزاد می‌کند."""
+        try:
+            self.storage.close()
+        except Exception as e:
+            print(f"خطا در بستن فایل: {e}")
 
     def get_all_categories(self):
-        """لیست مرتب شده از تمام دسته‌بندی‌ها را برمی‌گرداند."""
-        return sorted(list(self.categories))
+        """لیست مرتب شده از تمام دسته‌بندی‌ها را برمی‌گرداند.
+
+        لیست مرتب تا افزودن دسته‌بندی بعدی نگه داشته می‌شود.
+        """
+        if self._sorted_categories is None or len(self._sorted_categories) != len(self.categories):
+            self._sorted_categories = sorted(self.categories)
+        return list(self._sorted_categories)
 
     def add_category(self, category_name):
         """یک دسته‌بندی جدید اضافه می‌کند."""
         if category_name and category_name.strip():
-            self.categories.add(category_name.strip())
+            category_name = category_name.strip()
+            if category_name not in self.categories:
+                self.categories.add(category_name)
+                self._sorted_categories = None
 
     def update_task(self, index, updated_task):
-        """یک کار را به‌روز می‌کند."""
+        """یک کار را بر اساس جایگاهش در لیست به‌روز می‌کند."""
         if 0 <= index < len(self.tasks):
-            # حفظ task_id اصلی
-            original_task_id = self.tasks[index].task_id
-            updated_task.task_id = original_task_id
-
-            # جایگزینی کار
-            self.tasks[index] = updated_task
+            return self.edit_task(self.tasks[index].task_id, updated_task)
+        return False
 
-            # افزودن دسته‌بندی جدید اگر وجود ندارد
-            if updated_task.category:
-                self.add_category(updated_task.category)
+    def edit_task(self, task_id, updated_task):
+        """کار با شناسه داده شده را با updated_task جایگزین می‌کند."""
+        original = self._tasks_by_id.get(task_id)
+        if original is None:
+            return False
 
-            self._save_tasks()
-            return True
-        return False
+        # حفظ شناسه، جایگاه در سلسله‌مراتب و زیرکارهای کار اصلی
+        updated_task.task_id = task_id
+        if updated_task.parent_id is None:
+            updated_task.parent_id = original.parent_id
+            updated_task.subtask_order = original.subtask_order
+        updated_task.subtasks = original.subtasks
+        self._start_series(updated_task, original)
+
+        # جایگزینی کار (ترتیب دیکشنری برای کلید موجود حفظ می‌شود)
+        self._tasks_by_id[task_id] = updated_task
+        self._tasks_view = None
+        self._index_update(original, updated_task)
+        parent = self._tasks_by_id.get(original.parent_id) if original.parent_id else None
+        if parent is not None and original in parent.subtasks:
+            parent.subtasks[parent.subtasks.index(original)] = updated_task
+
+        # افزودن دسته‌بندی جدید اگر وجود ندارد
+        if updated_task.category:
+            self.add_category(updated_task.category)
+
+        self._persist(changed=[updated_task])
+        return True
+
+    @property
+    def cleanup_config(self):
+        """تنظیمات پاکسازی ذخیره شده در cleanup.json (یا مقادیر پیش‌فرض)."""
+        if self._cleanup_config is None:
+            self._cleanup_config = load_config(config_path(self.filename))
+        return self._cleanup_config
+
+    def set_cleanup_config(self, config):
+        """تنظیمات پاکسازی را ذخیره کرده و صف پاکسازی را کنار می‌گذارد."""
+        self._cleanup_config = dict(config)
+        save_config(config_path(self.filename), self._cleanup_config)
+        if self._cleanup_index is not None:
+            self._indexes.remove(self._cleanup_index)
+            self._cleanup_index = None
+
+    @property
+    def cleanup_index(self):
+        """صف کارهای انجام شده بر اساس زمان انجام (در اولین پاکسازی ساخته می‌شود)."""
+        if self._cleanup_index is None:
+            self._cleanup_index = CleanupIndex(self.cleanup_config, self.tasks)
+            self._indexes.append(self._cleanup_index)
+        return self._cleanup_index
+
+    def next_cleanup_delay(self, now=None):
+        """ثانیه‌های باقی‌مانده تا اجرای بعدی پاکسازی یا None اگر غیرفعال باشد.
+
+        اجرای بعدی در موعد منقضی شدن اولین کار است، اما حداکثر پس از
+        interval_minutes تا تغییرات ساعت سیستم هم پوشش داده شوند.
+        """
+        config = self.cleanup_config
+        if not config.get("enabled", False):
+            return None
+        delay = config.get("interval_minutes", 60) * 60
+        expiry = self.cleanup_index.next_expiry()
+        if expiry is not None:
+            delay = min(delay, max(0.0, expiry - (now or time.time())))
+        return delay
+
+    def run_cleanup(self, now=None):
+        """کارهای منقضی شده طبق تنظیمات ذخیره شده را حذف کرده و آن‌ها را برمی‌گرداند."""
+        if not self.cleanup_config.get("enabled", False):
+            return []
+        return self._cleanup_expired(self.cleanup_index, now)
 
     def _cleanup_old_tasks(self, config=None):
-        """کارهای قدیمی را بر اساس تنظیمات پاکسازی حذف می‌کند."""
-        if config is None:
-            # استفاده از تنظیمات پیش‌فرض (رفتار قدیمی)
-            config = {
-                "enabled": True,
-                "days_old": 1,
-                "status_filter": "completed",
-                "priority_filter": [],
-                "exclude_categories": []
-            }
+        """کارهای قدیمی را بر اساس تنظیمات پاکسازی حذف می‌کند.
 
+        بدون config از تنظیمات ذخیره شده استفاده می‌شود؛ با config یک صف موقت
+        برای همین اجرا ساخته می‌شود.
+        """
+        if config is None:
+            return self.run_cleanup()
         if not config.get("enabled", False):
             return []
+        return self._cleanup_expired(CleanupIndex(config, self.tasks))
 
-        now = datetime.now()
-        days_old = config.get("days_old", 1)
-        status_filter = config.get("status_filter", "completed")
-        priority_filter = config.get("priority_filter", [])
-        exclude_cats = config.get("exclude_categories", [])
-        cutoff_date = now - timedelta(days=days_old)
-
-        tasks_to_keep = []
-        tasks_cleaned = []
+    def _cleanup_expired(self, index, now=None):
+        """کارهای منقضی شده صف index را (همراه با زیرکارهایشان) یکجا حذف می‌کند.
 
-        for task in self.tasks:
-            should_cleanup = False
+        کاری که زیرکار انجام نشده دارد حذف نمی‌شود و در صف می‌ماند تا پس از
+        انجام زیرکارهایش پاک شود؛ زیرکارهای کار حذف شده همراه آن حذف می‌شوند
+        تا کار بدون والد باقی نماند. همه حذف‌ها با یک ذخیره‌سازی ثبت می‌شوند.
+        """
+        expired = index.pop_expired(now)
+        if not expired:
+            return []
 
-            # بررسی دسته‌بندی استثنا شده
-            if task.category in exclude_cats:
-                tasks_to_keep.append(task)
-                continue
+        def iter_tree(task):
+            yield task
+            for subtask in task.subtasks:
+                yield from iter_tree(subtask)
 
-            # بررسی فیلتر وضعیت
-            if status_filter == "completed" and task.status != "انجام شده":
-                tasks_to_keep.append(task)
+        cleaned = {}
+        deferred = []
+        for entry in expired:
+            task = self._tasks_by_id.get(entry[1])
+            if task is None or task.task_id in cleaned:
                 continue
-            if status_filter == "incomplete" and task.status == "انجام شده":
-                tasks_to_keep.append(task)
+            tree = list(iter_tree(task))
+            if not all(item.is_completed() for item in tree):
+                deferred.append(entry)
                 continue
+            for item in tree:
+                cleaned[item.task_id] = item
+        index.defer(deferred)
 
-            # بررسی فیلتر اولویت
-            if priority_filter and task.priority not in priority_filter:
-                tasks_to_keep.append(task)
-                continue
-
-            # بررسی سن کار
-            if status_filter == "completed" and task.completion_date:
-                try:
-                    completion_time = datetime.fromisoformat(task.completion_date)
-                    if completion_time < cutoff_date:
-                        should_cleanup = True
-                except (ValueError, TypeError):
-                    pass
-
-            if should_cleanup:
-                tasks_cleaned.append(task)
-            else:
-                tasks_to_keep.append(task)
-
-        # به‌روزرسانی لیست کارها
-        if tasks_cleaned:
-            self.tasks = tasks_to_keep
-            self._save_tasks()
-
-        return tasks_cleaned
+        if cleaned:
+            self.delete_tasks(list(cleaned))
+        return list(cleaned.values())
 
     def add_task(self, task):
         """یک کار جدید اضافه می‌کند."""
-        self.tasks.append(task)
+        self._start_series(task)
+        self._register(task)
+        parent = self._tasks_by_id.get(task.parent_id) if task.parent_id else None
+        if parent is not None:
+            parent.add_subtask(task)
         # افزودن دسته‌بندی به لیست اگر وجود ندارد
         if task.category:
             self.add_category(task.category)
-        self._save_tasks()
+        self._persist(changed=[task])
 
     def delete_multiple_tasks(self, indices):
-        """چندین کار را با هم حذف می‌کند."""
-        for index in sorted(indices, reverse=True):
-            if 0 <= index < len(self.tasks):
-                del self.tasks[index]
-        self._save_tasks()
+        """چندین کار را بر اساس جایگاهشان در لیست حذف می‌کند."""
+        tasks = self.tasks
+        self.delete_tasks([tasks[i].task_id for i in indices if 0 <= i < len(tasks)])
+
+    def delete_tasks(self, task_ids):
+        """کارهای با شناسه‌های داده شده را همراه با زیرکارهایشان حذف می‌کند."""
+        removed = []
+        pending = list(task_ids)
+        while pending:
+            task = self._tasks_by_id.pop(pending.pop(), None)
+            if task is None:
+                continue
+            self._index_remove(task)
+            removed.append(task.task_id)
+            pending.extend(subtask.task_id for subtask in task.subtasks)
+            parent = self._tasks_by_id.get(task.parent_id) if task.parent_id else None
+            if parent is not None and task in parent.subtasks:
+                parent.subtasks.remove(task)
+
+        if removed:
+            self._tasks_view = None
+            self._persist(removed=removed)
+        return removed
 
     def toggle_task_status(self, task_index):
-        """وضعیت یک کار را تغییر داده و تاریخ انجام را ثبت یا حذف می‌کند."""
+        """وضعیت یک کار را بر اساس جایگاهش در لیست تغییر می‌دهد."""
         if 0 <= task_index < len(self.tasks):
-            task = self.tasks[task_index]
-            if task.status == "انجام نشده":
-                task.status = "انجام شده"
-                task.completion_date = datetime.now().isoformat()
-                # اگر کار تکرارشونده است، یک نمونه جدید ایجاد کن
-                if task.is_recurring:
-                    self._create_recurring_instance(task)
-            else:
-                task.status = "انجام نشده"
-                task.completion_date = None
-            self._save_tasks()
+            self.toggle_task(self.tasks[task_index].task_id)
 
-    def _create_recurring_instance(self, completed_task):
-        """یک نمونه جدید از کار تکرارشونده ایجاد می‌کند."""
-        if not completed_task.is_recurring or not completed_task.recurrence_pattern:
+    def toggle_task(self, task_id):
+        """وضعیت یک کار را تغییر داده و تاریخ انجام را ثبت یا حذف می‌کند."""
+        task = self._tasks_by_id.get(task_id)
+        if task is None:
             return
-
-        pattern = completed_task.recurrence_pattern
-        next_due_date = self._calculate_next_due_date(completed_task.due_date, pattern)
-
-        # بررسی end_date
-        if pattern.get("end_date"):
-            try:
-                end_date = datetime.fromisoformat(pattern["end_date"]).date()
-                if next_due_date and datetime.fromisoformat(next_due_date).date() > end_date:
-                    return  # تکرار به پایان رسیده
-            except (ValueError, TypeError):
-                pass
-
-        # ایجاد کار جدید
-        new_task = Task(
-            name=completed_task.name,
-            description=completed_task.description,
-            priority=completed_task.priority,
+        changed = [task]
+        if task.status == "انجام نشده":
+            task.status = "انجام شده"
+            task.completion_date = datetime.now().isoformat()
+        else:
+            task.status = "انجام نشده"
+            task.completion_date = None
+        self._index_update(task, task)
+        # اگر کار تکرارشونده است، یک نمونه جدید ایجاد کن
+        if task.status == "انجام شده" and task.is_recurring:
+            new_task = self._create_recurring_instance(task)
+            if new_task:
+                changed.append(new_task)
+        self._persist(changed=changed)
+
+    def update_notes(self, task_id, notes):
+        """یادداشت‌های یک کار را تغییر داده و ذخیره می‌کند؛ False اگر کار وجود نداشته باشد."""
+        task = self._tasks_by_id.get(task_id)
+        if task is None:
+            return False
+        if task.notes == notes:
+            return True
+        task.notes = notes
+        self._index_update(task, task)
+        self._persist(changed=[task])
+        return True
+
+    def _recurring_copy(self, task, due_date):
+        """نمونه جدید (انجام نشده) از سری تکرارشونده task با سررسید due_date."""
+        return Task(
+            name=task.name,
+            description=task.description,
+            priority=task.priority,
             status="انجام نشده",
             completion_date=None,
-            due_date=next_due_date,
-            category=completed_task.category,
+            due_date=due_date,
+            category=task.category,
             is_recurring=True,
-            recurrence_pattern=completed_task.recurrence_pattern,
-            notes=completed_task.notes
+            recurrence_pattern=task.recurrence_pattern,
+            notes=task.notes,
+            tags=task.tags,
+            series_id=task.series_id,
+            series_start=task.series_start
         )
-        self.tasks.append(new_task)
+
+    def _start_series(self, task, original=None):
+        """شناسه و تاریخ شروع سری را برای کار تکرارشونده تازه (یا ویرایش شده) تعیین می‌کند.
+
+        کار ویرایش شده سری کار اصلی را ادامه می‌دهد؛ اگر سررسیدش تغییر کرده
+        باشد، سری از سررسید تازه شروع می‌شود. کار تازه سری خودش را می‌سازد.
+        """
+        if not task.is_recurring or task.series_id is not None:
+            return
+        if original is not None and original.is_recurring:
+            task.series_id = original.series_id
+            task.series_start = (
+                original.series_start if task.due_date == original.due_date else task.due_date
+            )
+            return
+        task.series_id = task.task_id
+        task.series_start = task.due_date
+
+    def _create_recurring_instance(self, completed_task):
+        """یک نمونه جدید از کار تکرارشونده ایجاد می‌کند.
+
+        اگر سری از قبل نمونه‌ای با همان سررسید داشته باشد (مثلاً ساخته شده
+        توسط materialize_recurring) نمونه تکراری ساخته نمی‌شود.
+        """
+        if not completed_task.is_recurring or not completed_task.recurrence_pattern:
+            return
+
+        if completed_task.due is None:
+            # بدون سررسید؛ فقط یک نمونه تازه
+            new_task = self._recurring_copy(completed_task, None)
+        else:
+            rule = rule_for(completed_task.recurrence_pattern)
+            if rule is None:
+                return
+            anchor = completed_task.series_anchor.toordinal()
+            ordinal = rule.next_after(anchor, completed_task.due.toordinal())
+            if ordinal is None or self.recurrence_index.has(completed_task, ordinal):
+                return  # تکرار به پایان رسیده یا نمونه بعدی موجود است
+            new_task = self._recurring_copy(completed_task, date.fromordinal(ordinal).isoformat())
+        self._register(new_task)
+        return new_task
 
     def _calculate_next_due_date(self, current_due_date, pattern):
         """تاریخ سررسید بعدی را بر اساس الگوی تکرار محاسبه می‌کند."""
         if not current_due_date:
             return None
-
-        try:
-            current_date = datetime.fromisoformat(current_due_date).date()
-            pattern_type = pattern.get("type", "daily")
-            interval = pattern.get("interval", 1)
-
-            if pattern_type == "daily":
-                next_date = current_date + timedelta(days=interval)
-            elif pattern_type == "weekly":
-                next_date = current_date + timedelta(weeks=interval)
-            elif pattern_type == "monthly":
-                # محاسبه ماه بعدی
-                month = current_date.month + interval
-                year = current_date.year
-                while month > 12:
-                    month -= 12
-                    year += 1
-                try:
-                    next_date = current_date.replace(year=year, month=month)
-                except ValueError:
-                    # اگر روز معتبر نیست (مثلاً 31 فوریه)، از آخرین روز ماه استفاده کن
-                    import calendar
-                    last_day = calendar.monthrange(year, month)[1]
-                    next_date = current_date.replace(year=year, month=month, day=last_day)
-            else:
-                return None
-
-            return next_date.isoformat()
-        except (ValueError, TypeError):
+        rule = rule_for(pattern)
+        due = _parse_due(current_due_date)
+        if rule is None or due is None:
             return None
+        ordinal = rule.next_after(due.toordinal(), due.toordinal())
+        return date.fromordinal(ordinal).isoformat() if ordinal is not None else None
+
+    def recurring_occurrences(self, start, end):
+        """نمونه‌های آینده هر سری تکرارشونده بین start و end (date) را به صورت تنبل تولید می‌کند.
+
+        خروجی (آخرین نمونه سری، تاریخ) است؛ هر سری از تاریخ شروعش و پس از
+        سررسید آخرین نمونه‌اش گسترش داده می‌شود. هیچ کاری ساخته نمی‌شود.
+        """
+        low, high = start.toordinal(), end.toordinal()
+        for task_id, last in self.recurrence_index.heads():
+            task = self._tasks_by_id[task_id]
+            rule = rule_for(task.recurrence_pattern)
+            if rule is None:
+                continue
+            anchor = task.series_anchor.toordinal()
+            for ordinal in rule.expand(anchor, max(low, last + 1), high):
+                yield task, date.fromordinal(ordinal)
+
+    def materialize_recurring(self, today=None, horizon_days=0, limit=MAX_CATCH_UP):
+        """نمونه‌های جامانده (و تا horizon_days روز آینده) همه سری‌ها را یکجا می‌سازد.
+
+        برای وقتی که برنامه مدتی بسته بوده است: برای هر سری، نمونه‌های پس از
+        آخرین نمونه موجود تا امروز ساخته و همه با یک ذخیره‌سازی ثبت می‌شوند.
+        اگر آخرین نمونه انجام شده باشد، همه نمونه‌های جامانده (حداکثر limit نمونه
+        آخر) ساخته می‌شوند؛ اگر هنوز باز باشد فقط آخرین نمونه جامانده ساخته
+        می‌شود تا کارهای باز انباشته نشوند. کارهای ساخته شده را برمی‌گرداند.
+        """
+        end = (today or date.today()) + timedelta(days=horizon_days)
+        missed = {}
+        for task, day in self.recurring_occurrences(date.min, end):
+            missed.setdefault(task.task_id, (task, []))[1].append(day)
+
+        new_tasks = []
+        for task, days in missed.values():
+            # از هر سری فقط limit نمونه آخر، یا فقط آخرین نمونه اگر نمونه قبلی باز است
+            count = limit if task.is_completed() else 1
+            new_tasks.extend(self._recurring_copy(task, day.isoformat()) for day in days[-count:])
+        self.add_tasks(new_tasks)
+        return new_tasks
+
+    def add_tasks(self, tasks, persist=True, id_map=None):
+        """چند کار را یکجا اضافه کرده و فقط یک بار ذخیره می‌کند.
+
+        id_map (برای وارد کردن) شناسه‌های تکراری را که شناسه تازه گرفته‌اند به
+        شناسه جدید نگاشت می‌کند تا parent_id زیرکارهای بعدی (در همین دسته یا
+        دسته‌های بعدی همان فایل) به کار وارد شده اشاره کند نه کار موجود؛
+        شناسه سری تکرار (شناسه اولین نمونه) هم به همین ترتیب نگاشت می‌شود.
+        """
+        for task in tasks:
+            if id_map is not None:
+                if task.parent_id in id_map:
+                    task.parent_id = id_map[task.parent_id]
+                if task.series_id in id_map:
+                    task.series_id = id_map[task.series_id]
+                original_id = task.task_id
+                self._register(task)
+                if task.task_id != original_id:
+                    id_map[original_id] = task.task_id
+                    if task.series_id == original_id:
+                        task.series_id = task.task_id
+            else:
+                self._register(task)
+            parent = self._tasks_by_id.get(task.parent_id) if task.parent_id else None
+            if parent is not None:
+                parent.add_subtask(task)
+            if task.category:
+                self.add_category(task.category)
+        if persist and tasks:
+            self._persist(changed=tasks)
 
     def import_from_csv(self, filepath):
         """کارها را از یک فایل CSV خارجی وارد می‌کند."""
-        try:
-            with open(filepath, mode="r", newline="", encoding="utf-8") as file:
-                reader = csv.reader(file)
-                header = next(reader, None)
-
-                if not header:
-                    return False, "فایل CSV خالی است."
-
-                imported_count = 0
-
-                for row in reader:
-                    if not row:
-                        continue
-
-                    # پشتیبانی از فرمت جدید (16 ستون)
-                    if len(row) >= 16:
-                        notes = ""
-                        if row[15]:
-                            try:
-                                notes = base64.b64decode(row[15]).decode('utf-8')
-                            except Exception:
-                                notes = ""
-
-                        recurrence_pattern = None
-                        is_recurring = row[10].lower() == "true"
-                        if is_recurring and row[11]:
-                            recurrence_pattern = {
-                                "type": row[11],
-                                "interval": int(row[12]) if row[12] else 1,
-                                "weekdays": [int(d) for d in row[13].split(",")] if row[13] else [],
-                                "end_date": row[14] if row[14] else None
-                            }
-
-                        task = Task(
-                            task_id=row[0],
-                            name=row[1],
-                            description=row[2],
-                            priority=row[3],
-                            status=row[4],
-                            completion_date=row[5] if row[5] else None,
-                            due_date=row[6] if row[6] else None,
-                            category=row[7] if row[7] else "بدون دسته",
-                            parent_id=row[8] if row[8] else None,
-                            subtask_order=int(row[9]) if row[9] else None,
-                            is_recurring=is_recurring,
-                            recurrence_pattern=recurrence_pattern,
-                            notes=notes
-                        )
-                        self.tasks.append(task)
-                        if task.category:
-                            self.add_category(task.category)
-                        imported_count += 1
-
-                    # پشتیبانی از فرمت قدیمی (5 ستون)
-                    elif len(row) >= 4:
-                        completion_date = row[4] if len(row) > 4 and row[4] else None
-                        task = Task(
-                            name=row[0],
-                            description=row[1],
-                            priority=row[2],
-                            status=row[3],
-                            completion_date=completion_date,
-                        )
-                        self.tasks.append(task)
-                        imported_count += 1
+        from .importer import ImportJob
 
-            self._save_tasks()
-            return True, f"{imported_count} کار با موفقیت وارد شد."
-        except Exception as e:
-            return False, f"خطا در پردازش فایل CSV: {e}"
+        job = ImportJob(self, filepath)
+        job.run()
+        return job.success, job.summary()
+
+    def import_from_xlsx(self, filepath):
+        """کارها را از یک فایل اکسل (XLSX) با همان اعتبارسنجی وارد کردن CSV وارد می‌کند."""
+        from .excel import XlsxImportJob
+
+        job = XlsxImportJob(self, filepath)
+        job.run()
+        return job.success, job.summary()
+
+    def export_to_xlsx(self, filepath):
+        """کارها (همراه با سلسله‌مراتب زیرکارها، تکرار و یادداشت‌ها) را در یک فایل اکسل ذخیره می‌کند."""
+        from .excel import ExportJob
+
+        job = ExportJob(self, filepath)
+        job.run()
+        return job.success, job.summary()
@@ -0,0 +1,79 @@
+# notes.py
+
+import hashlib
+import html
+import re
+from collections import OrderedDict
+
+# افزونه‌های markdown2 برای نمایش یادداشت‌ها
+MARKDOWN_EXTRAS = ("fenced-code-blocks", "tables", "strike", "task_list", "cuddled-lists")
+
+# tkhtmlview تصاویر را در رشته اصلی (و گاهی از شبکه) بارگذاری می‌کند؛ به جای آن‌ها متن جایگزین نمایش داده می‌شود
+_IMAGE_RE = re.compile(r"<img\b[^>]*>", re.IGNORECASE)
+_ALT_RE = re.compile(r'\balt="([^"]*)"')
+
+
+def content_key(text):
+    """کلید cache متن (هش محتوا)؛ خود متن‌های طولانی در cache نگه داشته نمی‌شوند."""
+    return hashlib.blake2b(text.encode("utf-8"), digest_size=16).digest()
+
+
+def _image_alt(match):
+    alt = _ALT_RE.search(match.group(0))
+    return alt.group(1) if alt else ""
+
+
+def _plain_html(text):
+    return f"<pre>{html.escape(text)}</pre>"
+
+
+class NotesRenderer:
+    """تبدیل یادداشت‌های Markdown به HTML با cache محدود LRU.
+
+    کلید cache هش محتوای یادداشت است، بنابراین جابجایی بین کارها (یا کارهایی
+    با یادداشت یکسان، مثل نمونه‌های یک سری تکرارشونده) تبدیل را تکرار نمی‌کند.
+    markdown2 در اولین تبدیل import می‌شود؛ اگر نصب نباشد متن ساده نمایش داده می‌شود.
+    """
+
+    def __init__(self, maxsize=256):
+        self.maxsize = maxsize
+        self._cache = OrderedDict()
+        self._convert = None
+        self.hits = 0
+        self.misses = 0
+
+    def __len__(self):
+        return len(self._cache)
+
+    def _converter(self):
+        if self._convert is None:
+            try:
+                import markdown2
+            except ImportError as e:
+                print(f"خطا در بارگذاری markdown2 (یادداشت‌ها به صورت متن ساده نمایش داده می‌شوند): {e}")
+                self._convert = _plain_html
+            else:
+                markdowner = markdown2.Markdown(extras=list(MARKDOWN_EXTRAS), safe_mode="escape")
+                self._convert = markdowner.convert
+        return self._convert
+
+    def render(self, text):
+        """HTML یادداشت text (از cache در صورت وجود)."""
+        if not text.strip():
+            return ""
+        key = content_key(text)
+        cache = self._cache
+        rendered = cache.get(key)
+        if rendered is not None:
+            cache.move_to_end(key)
+            self.hits += 1
+            return rendered
+        self.misses += 1
+        rendered = _IMAGE_RE.sub(_image_alt, str(self._converter()(text)))
+        cache[key] = rendered
+        if len(cache) > self.maxsize:
+            cache.popitem(last=False)
+        return rendered
+
+    def clear(self):
+        self._cache.clear()
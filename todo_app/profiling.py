@@ -0,0 +1,256 @@
+# profiling.py
+
+import atexit
+import inspect
+import os
+import sys
+import threading
+import time
+from collections import deque
+
+# با مقدار 1 (یا true) زمان‌گیری فعال می‌شود؛ معادل گزینه --profile در run.py
+ENV_VAR = "TODO_PROFILE"
+# زمان‌گیری مراحل راه‌اندازی: 1 (خروجی خطا) یا مسیر فایل گزارش؛ معادل --profile-startup
+STARTUP_ENV_VAR = "TODO_PROFILE_STARTUP"
+
+# متدهای کلاس‌هایی که زمان‌گیری می‌شوند؛ None یعنی همه متدهای معمولی کلاس
+# به جز EXCLUDED
+TARGETS = {
+    "todo_app.logic": {"ToDoList": None},
+    "todo_app.storage": {
+        "CsvStorage": ("load_rows", "save"),
+        "JournalStorage": ("load_rows", "record", "save", "_compact"),
+        "SqliteStorage": ("load_rows", "save", "record"),
+    },
+    "todo_app.app": {
+        "TaskListFrame": ("refresh", "_build_rows", "_reconcile", "_rebuild", "_render_window"),
+        "TodoApp": (
+            "add_task",
+            "handle_tree_click",
+            "handle_delete_key",
+            "delete_task_with_button",
+            "delete_tasks_by_ids",
+            "refresh_task_list",
+            "apply_search",
+            "edit_task_dialog",
+            "import_dialog",
+            "export_dialog",
+            "open_stats",
+            "_load_step",
+            "finish_loading",
+            "finish_import",
+            "toggle_theme",
+            "run_cleanup",
+            "materialize_recurring",
+        ),
+    },
+}
+
+
+# متدهایی که به ازای هر کار صدا زده می‌شوند؛ زمان‌گیری آن‌ها نتیجه را مخدوش می‌کند
+EXCLUDED = {
+    "ToDoList": ("_register", "get_task", "_index_add", "_index_remove", "_index_update"),
+}
+
+
+def env_enabled():
+    """بررسی متغیر محیطی TODO_PROFILE."""
+    return os.environ.get(ENV_VAR, "").lower() in ("1", "true", "yes", "on")
+
+
+def startup_env():
+    """مقدار TODO_PROFILE_STARTUP: None (غیرفعال)، "" (خروجی خطا) یا مسیر فایل گزارش."""
+    value = os.environ.get(STARTUP_ENV_VAR, "").strip()
+    if value.lower() in ("", "0", "false", "no", "off"):
+        return None
+    if value.lower() in ("1", "true", "yes", "on"):
+        return ""
+    return value
+
+
+class OperationStats:
+    """تعداد فراخوانی، زمان کل و آخرین زمان‌های یک عملیات (برای صدک‌های غلتان)."""
+
+    def __init__(self, window=1000):
+        self.count = 0
+        self.total = 0.0
+        self.maximum = 0.0
+        self.recent = deque(maxlen=window)
+
+    def add(self, elapsed):
+        self.count += 1
+        self.total += elapsed
+        if elapsed > self.maximum:
+            self.maximum = elapsed
+        self.recent.append(elapsed)
+
+    def percentile(self, p):
+        """صدک p (۰ تا ۱۰۰) از آخرین نمونه‌ها، به ثانیه."""
+        if not self.recent:
+            return 0.0
+        samples = sorted(self.recent)
+        return samples[min(len(samples) - 1, int(len(samples) * p / 100))]
+
+
+class Profiler:
+    """زمان اجرای متدهای انتخاب شده را با جایگزینی آن‌ها در کلاس ثبت می‌کند.
+
+    تا وقتی instrument صدا زده نشود هیچ کدی تغییر نمی‌کند، بنابراین در حالت
+    غیرفعال هیچ سربار اضافه‌ای وجود ندارد.
+    """
+
+    def __init__(self, window=1000):
+        self.window = window
+        self.stats = {}
+        self._lock = threading.Lock()
+        self._originals = []
+
+    def record(self, name, elapsed):
+        with self._lock:
+            stats = self.stats.get(name)
+            if stats is None:
+                stats = self.stats[name] = OperationStats(self.window)
+            stats.add(elapsed)
+
+    def wrap(self, name, func):
+        """تابعی برمی‌گرداند که func را اجرا و زمانش را با نام name ثبت می‌کند."""
+        record = self.record
+        clock = time.perf_counter
+
+        def timed(*args, **kwargs):
+            start = clock()
+            try:
+                return func(*args, **kwargs)
+            finally:
+                record(name, clock() - start)
+
+        timed.__name__ = func.__name__
+        timed.__qualname__ = func.__qualname__
+        timed.__doc__ = func.__doc__
+        timed.__wrapped__ = func
+        return timed
+
+    def instrument(self, cls, names=None, exclude=()):
+        """متدهای names از کلاس cls (یا همه متدهای معمولی آن به جز exclude) را زمان‌گیری می‌کند.
+
+        متدهای generator کنار گذاشته می‌شوند؛ فراخوانی آن‌ها فقط generator را
+        می‌سازد و زمان اندازه‌گیری شده کار واقعی را نشان نمی‌دهد.
+        """
+        if names is None:
+            names = [
+                name for name, value in vars(cls).items()
+                if callable(value) and not isinstance(value, (staticmethod, classmethod, type))
+                and not (name.startswith("__") and name.endswith("__"))
+                and name not in exclude
+            ]
+        names = [name for name in names if not inspect.isgeneratorfunction(vars(cls).get(name))]
+        for name in names:
+            func = vars(cls).get(name)
+            if func is None or hasattr(func, "__wrapped__"):
+                continue
+            self._originals.append((cls, name, func))
+            setattr(cls, name, self.wrap(f"{cls.__name__}.{name}", func))
+
+    def restore(self):
+        """متدهای اصلی را به کلاس‌ها برمی‌گرداند."""
+        for cls, name, func in reversed(self._originals):
+            setattr(cls, name, func)
+        self._originals.clear()
+
+    def summary(self):
+        """جدول خلاصه عملیات به ترتیب زمان کل (زمان‌ها به میلی‌ثانیه)."""
+        with self._lock:
+            items = sorted(self.stats.items(), key=lambda item: item[1].total, reverse=True)
+            lines = [
+                f"{'operation':<36} {'calls':>7} {'total':>10} {'p50':>8} {'p95':>8} {'p99':>8} {'max':>8}"
+            ]
+            for name, stats in items:
+                lines.append(
+                    f"{name:<36} {stats.count:>7} {stats.total * 1000:>10.1f} "
+                    f"{stats.percentile(50) * 1000:>8.2f} {stats.percentile(95) * 1000:>8.2f} "
+                    f"{stats.percentile(99) * 1000:>8.2f} {stats.maximum * 1000:>8.2f}"
+                )
+        return "\n".join(lines)
+
+    def dump(self, stream=None):
+        """خلاصه را در stream (پیش‌فرض stderr) چاپ می‌کند."""
+        stream = stream or sys.stderr
+        print(self.summary(), file=stream)
+        stream.flush()
+
+
+_profiler = None
+
+
+def get_profiler():
+    """Profiler فعال یا None اگر زمان‌گیری فعال نشده باشد."""
+    return _profiler
+
+
+def enable(window=1000, dump_at_exit=True):
+    """زمان‌گیری را برای TARGETS فعال می‌کند.
+
+    باید پیش از ساخت ToDoList و TodoApp صدا زده شود تا متدهایی که هنگام ساخت
+    به دکمه‌ها و رویدادها متصل می‌شوند هم زمان‌گیری شوند.
+    """
+    global _profiler
+    if _profiler is not None:
+        return _profiler
+
+    import importlib
+
+    _profiler = Profiler(window)
+    for module_name, classes in TARGETS.items():
+        try:
+            module = importlib.import_module(module_name)
+        except ImportError as e:
+            print(f"خطا در فعال‌سازی زمان‌گیری برای {module_name}: {e}")
+            continue
+        for class_name, names in classes.items():
+            cls = getattr(module, class_name, None)
+            if cls is not None:
+                _profiler.instrument(cls, names, EXCLUDED.get(class_name, ()))
+    if dump_at_exit:
+        atexit.register(_profiler.dump)
+    return _profiler
+
+
+class StartupProfile:
+    """زمان‌گیری مراحل راه‌اندازی برنامه (گزینه --profile-startup).
+
+    هر mark مدت زمان از mark قبلی را با نام مرحله ثبت می‌کند؛ اولین مرحله از
+    origin (پیش‌فرض زمان import بسته todo_app) اندازه‌گیری می‌شود.
+    """
+
+    def __init__(self, origin=None, path=None):
+        if origin is None:
+            from . import STARTED as origin
+        self.origin = origin
+        self.path = path
+        self.phases = []
+        self._last = origin
+
+    def mark(self, name):
+        now = time.perf_counter()
+        self.phases.append((name, now - self._last, now - self.origin))
+        self._last = now
+
+    def summary(self):
+        """جدول مراحل با مدت هر مرحله و زمان سپری شده از شروع (میلی‌ثانیه)."""
+        lines = [f"{'phase':<36} {'ms':>9} {'since start':>12}"]
+        for name, elapsed, total in self.phases:
+            lines.append(f"{name:<36} {elapsed * 1000:>9.1f} {total * 1000:>12.1f}")
+        return "\n".join(lines)
+
+    def dump(self):
+        """خلاصه را در فایل path (در صورت تعیین) یا خروجی خطا چاپ می‌کند.
+
+        فایل اجرایی ساخته شده با cx_Freeze (Win32GUI) خروجی خطا ندارد؛ در آن
+        حالت باید مسیر فایل داده شود.
+        """
+        if self.path:
+            with open(self.path, "a", encoding="utf-8") as file:
+                print(self.summary(), file=file)
+        elif sys.stderr is not None:
+            print(self.summary(), file=sys.stderr)
+            sys.stderr.flush()
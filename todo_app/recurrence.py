@@ -0,0 +1,262 @@
+# recurrence.py
+
+import calendar
+from datetime import date
+from functools import lru_cache
+
+# نوع‌های تکرار پشتیبانی شده
+RECURRENCE_TYPES = ("daily", "weekly", "monthly", "yearly")
+
+# حداکثر تعداد نمونه‌هایی که برای یک سری در یک بار جبران ساخته می‌شود
+MAX_CATCH_UP = 31
+
+
+def _weekday(ordinal):
+    """روز هفته یک ordinal (۰ = دوشنبه، مثل date.weekday)."""
+    return (ordinal - 1) % 7
+
+
+def _month_ordinal(month_index, day):
+    """ordinal روز day از ماه month_index (سال * ۱۲ + ماه - ۱)؛ روز به آخر ماه محدود می‌شود."""
+    year, month = divmod(month_index, 12)
+    month += 1
+    day = min(day, calendar.monthrange(year, month)[1])
+    return date(year, month, day).toordinal()
+
+
+def _nth_weekday(month_index, n, weekday):
+    """ordinal n-امین weekday ماه (n=-1 یعنی آخرین)؛ None اگر آن ماه چنین روزی نداشته باشد."""
+    year, month = divmod(month_index, 12)
+    month += 1
+    days = calendar.monthrange(year, month)[1]
+    if n > 0:
+        first = date(year, month, 1).toordinal()
+        ordinal = first + (weekday - _weekday(first)) % 7 + 7 * (n - 1)
+        return ordinal if ordinal < first + days else None
+    last = date(year, month, days).toordinal()
+    ordinal = last - (_weekday(last) - weekday) % 7 - 7 * (-n - 1)
+    return ordinal if ordinal > last - days else None
+
+
+def parse_weekdays(value):
+    """ستون RecurrenceWeekdays را به (روزهای هفته، [(n، روز هفته)]) تبدیل می‌کند.
+
+    هر مورد یک روز هفته (۰ = دوشنبه) یا برای تکرار ماهانه «n:روز» است، مثلاً
+    «2:1» یعنی دومین سه‌شنبه و «-1:4» یعنی آخرین جمعه ماه.
+    """
+    weekdays = []
+    nth = []
+    for item in value.split(",") if value else ():
+        item = item.strip()
+        if not item:
+            continue
+        if ":" in item:
+            n, weekday = item.split(":", 1)
+            nth.append((int(n), int(weekday)))
+        else:
+            weekdays.append(int(item))
+    return weekdays, nth
+
+
+def format_weekdays(pattern):
+    items = [str(weekday) for weekday in pattern.get("weekdays") or ()]
+    items.extend(f"{n}:{weekday}" for n, weekday in pattern.get("nth") or ())
+    return ",".join(items)
+
+
+class Rule:
+    """یک الگوی تکرار کامپایل شده.
+
+    محاسبات روی ordinal تاریخ‌ها انجام می‌شود و هر سری با تاریخ شروع (anchor،
+    معمولاً سررسید کار) مشخص می‌شود؛ بنابراین یک Rule بین همه کارهای دارای
+    الگوی یکسان مشترک است.
+    """
+
+    __slots__ = ("type", "interval", "weekdays", "nth", "end")
+
+    def __init__(self, recurrence_type, interval=1, weekdays=(), nth=(), end=None):
+        if recurrence_type not in RECURRENCE_TYPES:
+            raise ValueError(f"نوع تکرار نامعتبر: {recurrence_type}")
+        if interval < 1:
+            raise ValueError(f"فاصله تکرار نامعتبر: {interval}")
+        for weekday in list(weekdays) + [weekday for _, weekday in nth]:
+            if not 0 <= weekday <= 6:
+                raise ValueError(f"روز هفته نامعتبر: {weekday}")
+        for n, _ in nth:
+            if n == 0 or not -5 <= n <= 5:
+                raise ValueError(f"شماره هفته نامعتبر: {n}")
+        self.type = recurrence_type
+        self.interval = interval
+        self.weekdays = tuple(sorted(set(weekdays)))
+        self.nth = tuple(sorted(set(nth)))
+        self.end = end
+
+    def expand(self, anchor, start, end):
+        """ordinal همه نمونه‌های سری شروع شده از anchor که بین start و end (شامل) هستند."""
+        if self.end is not None:
+            end = min(end, self.end)
+        start = max(start, anchor)
+        if start > end:
+            return []
+        interval = self.interval
+
+        if self.type == "daily" or (self.type == "weekly" and not self.weekdays):
+            step = interval if self.type == "daily" else 7 * interval
+            first = anchor + -(-(start - anchor) // step) * step
+            return list(range(first, end + 1, step))
+
+        if self.type == "weekly":
+            step = 7 * interval
+            monday = anchor - _weekday(anchor)
+            week = monday + max(0, (start - monday) // step) * step
+            result = []
+            while week <= end:
+                for weekday in self.weekdays:
+                    ordinal = week + weekday
+                    if start <= ordinal <= end:
+                        result.append(ordinal)
+                week += step
+            return result
+
+        anchor_date = date.fromordinal(anchor)
+        step = 12 * interval if self.type == "yearly" else interval
+        first_month = anchor_date.year * 12 + anchor_date.month - 1
+        start_date = date.fromordinal(start)
+        month = start_date.year * 12 + start_date.month - 1
+        # از یک ماه فعال قبل از ماه start شروع می‌شود
+        month = first_month + max(0, (month - first_month) // step - 1) * step
+        result = []
+        while True:
+            if self.type == "monthly" and self.nth:
+                ordinals = sorted({
+                    ordinal for ordinal in (_nth_weekday(month, n, weekday) for n, weekday in self.nth)
+                    if ordinal is not None
+                })
+                if not ordinals and _month_ordinal(month, 1) > end:
+                    break
+            else:
+                ordinals = [_month_ordinal(month, anchor_date.day)]
+            if ordinals and ordinals[0] > end:
+                break
+            result.extend(ordinal for ordinal in ordinals if start <= ordinal <= end)
+            month += step
+        return result
+
+    def next_after(self, anchor, day):
+        """اولین نمونه سری پس از روز day (ordinal) یا None اگر سری تمام شده باشد."""
+        # پنجره جستجو به تدریج بزرگ می‌شود؛ برای بیشتر الگوها همان پنجره اول کافی است
+        span = 31 * self.interval * (12 if self.type == "yearly" else 1) + 7
+        start = day + 1
+        while self.end is None or start <= self.end:
+            found = self.expand(anchor, start, start + span)
+            if found:
+                return found[0]
+            start += span + 1
+            span *= 2
+            if span > 400 * 366:
+                return None
+        return None
+
+    def occurrences(self, anchor, after=None):
+        """نمونه‌های سری (date) را به ترتیب و به صورت تنبل تولید می‌کند."""
+        day = (after.toordinal() if after is not None else anchor - 1)
+        while True:
+            ordinal = self.next_after(anchor, day)
+            if ordinal is None:
+                return
+            yield date.fromordinal(ordinal)
+            day = ordinal
+
+
+@lru_cache(maxsize=1024)
+def compile_rule(recurrence_type, interval, weekdays, nth, end_date):
+    end = date.fromisoformat(end_date).toordinal() if end_date else None
+    return Rule(recurrence_type, interval, weekdays, nth, end)
+
+
+def rule_for(pattern):
+    """Rule کامپایل شده برای یک الگوی تکرار (dict) یا None اگر الگو نامعتبر باشد.
+
+    الگوهای یکسان فقط یک بار کامپایل می‌شوند.
+    """
+    if not pattern:
+        return None
+    try:
+        return compile_rule(
+            pattern.get("type", "daily"),
+            int(pattern.get("interval") or 1),
+            tuple(pattern.get("weekdays") or ()),
+            tuple(tuple(item) for item in pattern.get("nth") or ()),
+            pattern.get("end_date") or None,
+        )
+    except (TypeError, ValueError):
+        return None
+
+
+def series_key(task):
+    """کلید سری یک کار تکرارشونده: شناسه سری آن.
+
+    کارهای ذخیره شده با نسخه‌های قبلی شناسه سری ندارند؛ سری آن‌ها با نام،
+    دسته‌بندی و الگوی تکرار مشخص می‌شود.
+    """
+    if task.series_id:
+        return task.series_id
+    pattern = task.recurrence_pattern or {}
+    return (
+        task.name,
+        task.category,
+        pattern.get("type"),
+        pattern.get("interval"),
+        tuple(pattern.get("weekdays") or ()),
+        tuple(tuple(item) for item in pattern.get("nth") or ()),
+    )
+
+
+class RecurrenceIndex:
+    """سری‌های کارهای تکرارشونده: کلید سری -> {ordinal سررسید: شناسه کار}.
+
+    برای جلوگیری از ساخت نمونه تکراری و پیدا کردن آخرین نمونه هر سری بدون
+    پیمایش همه کارها. مثل بقیه ایندکس‌ها با add، remove و update همگام است.
+    """
+
+    def __init__(self, tasks=()):
+        self._series = {}
+        self._keys = {}
+        for task in tasks:
+            self.add(task)
+
+    def __len__(self):
+        return len(self._series)
+
+    def add(self, task):
+        if not task.is_recurring or task.due is None:
+            return
+        key = series_key(task)
+        ordinal = task.due.toordinal()
+        self._series.setdefault(key, {})[ordinal] = task.task_id
+        self._keys[task.task_id] = (key, ordinal)
+
+    def remove(self, task):
+        entry = self._keys.pop(task.task_id, None)
+        if entry is None:
+            return
+        key, ordinal = entry
+        instances = self._series[key]
+        if instances.get(ordinal) == task.task_id:
+            del instances[ordinal]
+            if not instances:
+                del self._series[key]
+
+    def update(self, old_task, new_task):
+        self.remove(old_task)
+        self.add(new_task)
+
+    def has(self, task, ordinal):
+        """آیا سری task نمونه‌ای با سررسید ordinal دارد."""
+        return ordinal in self._series.get(series_key(task), ())
+
+    def heads(self):
+        """(شناسه آخرین نمونه هر سری، ordinal سررسید آن)."""
+        for instances in self._series.values():
+            ordinal = max(instances)
+            yield instances[ordinal], ordinal
@@ -0,0 +1,243 @@
+# reminders.py
+
+import heapq
+import os
+import time
+from datetime import datetime, time as day_time
+
+# نوع اعلان: plyer (پیش‌فرض)، console یا none
+ENV_VAR = "TODO_NOTIFIER"
+# ساعت یادآوری در روز سررسید (مثلاً 9 یا 9:30)
+REMIND_AT_ENV_VAR = "TODO_REMIND_AT"
+
+APP_NAME = "مدیریت لیست کارها"
+
+
+def remind_at():
+    """ساعت یادآوری روز سررسید از TODO_REMIND_AT (پیش‌فرض ۹ صبح)."""
+    value = os.environ.get(REMIND_AT_ENV_VAR, "").strip()
+    try:
+        hour, _, minute = value.partition(":")
+        return day_time(int(hour), int(minute or 0))
+    except ValueError:
+        return day_time(9, 0)
+
+
+# ---------- اعلان‌دهنده‌ها ----------
+
+class PlyerNotifier:
+    """اعلان دسکتاپ با plyer؛ اگر plyer یا سرویس اعلان در دسترس نباشد در خروجی چاپ می‌شود.
+
+    plyer فقط هنگام اولین اعلان import می‌شود تا راه‌اندازی برنامه کند نشود.
+    """
+
+    def __init__(self, timeout=10):
+        self.timeout = timeout
+        self._notification = None
+        self._loaded = False
+
+    def _load(self):
+        if not self._loaded:
+            self._loaded = True
+            try:
+                from plyer import notification
+            except ImportError:
+                notification = None
+            self._notification = notification
+        return self._notification
+
+    def notify(self, title, message):
+        if self._load() is not None:
+            try:
+                self._notification.notify(
+                    title=title, message=message, app_name=APP_NAME, timeout=self.timeout
+                )
+                return
+            except Exception as e:
+                print(f"خطا در نمایش اعلان: {e}")
+        ConsoleNotifier().notify(title, message)
+
+
+class ConsoleNotifier:
+    """نمایش اعلان‌ها در خروجی استاندارد."""
+
+    def notify(self, title, message):
+        print(f"[{title}] {message}")
+
+
+class RecordingNotifier:
+    """اعلان‌ها را فقط نگه می‌دارد (برای آزمایش بدون دسکتاپ)."""
+
+    def __init__(self):
+        self.notifications = []
+
+    def notify(self, title, message):
+        self.notifications.append((title, message))
+
+
+class NullNotifier:
+    def notify(self, title, message):
+        pass
+
+
+def create_notifier(kind=None):
+    """اعلان‌دهنده را بر اساس نام یا متغیر محیطی TODO_NOTIFIER می‌سازد."""
+    kind = (kind or os.environ.get(ENV_VAR) or "plyer").lower()
+    if kind == "console":
+        return ConsoleNotifier()
+    if kind in ("none", "off", "0"):
+        return NullNotifier()
+    return PlyerNotifier()
+
+
+# ---------- صف یادآوری ----------
+
+class ReminderQueue:
+    """صف اولویت (min-heap) زمان یادآوری کارهای انجام نشده دارای سررسید.
+
+    زمان یادآوری هر کار ساعت remind_at روز سررسید است. مثل بقیه ایندکس‌های
+    ToDoList با add، remove و update همگام نگه داشته می‌شود؛ حذف از heap
+    تنبل است. یادآوری هر کار فقط یک بار اعلام می‌شود مگر اینکه سررسیدش
+    تغییر کند. اگر زودترین موعد صف زودتر شود، listener صدا زده می‌شود تا
+    زمان‌بندی دوباره تنظیم شود.
+    """
+
+    def __init__(self, tasks=(), at=None):
+        self.at = at or remind_at()
+        self.listener = None
+        self._times = {}
+        self._fired = {}
+        self._heap = []
+        for task in tasks:
+            when = self._when(task)
+            if when is not None:
+                self._times[task.task_id] = when
+                self._heap.append((when, task.task_id))
+        heapq.heapify(self._heap)
+
+    def __len__(self):
+        return len(self._times)
+
+    def _when(self, task):
+        if task.due is None or task.is_completed():
+            return None
+        return datetime.combine(task.due, self.at).timestamp()
+
+    def add(self, task):
+        when = self._when(task)
+        if when is None or self._fired.get(task.task_id) == when:
+            return
+        self._times[task.task_id] = when
+        head = self.next_time()
+        heapq.heappush(self._heap, (when, task.task_id))
+        if self.listener is not None and (head is None or when < head):
+            self.listener()
+
+    def remove(self, task):
+        self._times.pop(task.task_id, None)
+        self._fired.pop(task.task_id, None)
+
+    def update(self, old_task, new_task):
+        self._times.pop(old_task.task_id, None)
+        if new_task.due is None or new_task.is_completed():
+            # کار انجام شده اگر دوباره باز شود دوباره یادآوری می‌شود
+            self._fired.pop(old_task.task_id, None)
+        self.add(new_task)
+
+    def _valid(self, entry):
+        return self._times.get(entry[1]) == entry[0]
+
+    def next_time(self):
+        """زمان (timestamp) زودترین یادآوری یا None."""
+        heap = self._heap
+        while heap and not self._valid(heap[0]):
+            heapq.heappop(heap)
+        return heap[0][0] if heap else None
+
+    def pop_due(self, now=None):
+        """شناسه کارهایی که زمان یادآوری‌شان رسیده است (به ترتیب زمان)."""
+        now = now or time.time()
+        heap = self._heap
+        due = []
+        while heap and heap[0][0] <= now:
+            when, task_id = heapq.heappop(heap)
+            if self._times.get(task_id) == when:
+                del self._times[task_id]
+                self._fired[task_id] = when
+                due.append(task_id)
+        return due
+
+
+class ReminderScheduler:
+    """اعلام یادآوری‌ها با after() در حلقه رویداد Tk.
+
+    به جای بررسی دوره‌ای همه کارها، فقط تا زودترین موعد صف (و حداکثر
+    max_sleep ثانیه برای پوشش خواب سیستم و تغییر ساعت) صبر می‌کند؛ وقتی
+    چیزی سررسید نیست هیچ کاری انجام نمی‌شود.
+    """
+
+    # اگر چند کار هم‌زمان سررسید شوند یک اعلان خلاصه نمایش داده می‌شود
+    MAX_INDIVIDUAL = 3
+
+    def __init__(self, root, todo_list, notifier=None, max_sleep=3600):
+        self.root = root
+        self.todo_list = todo_list
+        self.notifier = notifier or create_notifier()
+        self.max_sleep = max_sleep
+        self._after_id = None
+        self._deadline = None
+        self._queue = None
+
+    def start(self):
+        self._run()
+
+    def stop(self):
+        if self._after_id is not None:
+            self.root.after_cancel(self._after_id)
+            self._after_id = None
+        if self._queue is not None:
+            self._queue.listener = None
+
+    def _on_queue_change(self):
+        # موعد جدید زودتر از زمان‌بندی فعلی است؛ اگر اجرایی همین حالا در راه
+        # است (مثلاً هنگام وارد کردن کارهای گذشته از موعد) نیازی به تغییر نیست
+        now = time.time()
+        if self._deadline is not None and self._deadline <= now:
+            return
+        next_time = self._queue.next_time()
+        if next_time is not None and (self._deadline is None or next_time < self._deadline):
+            self._schedule()
+
+    def _schedule(self):
+        if self._after_id is not None:
+            self.root.after_cancel(self._after_id)
+        next_time = self._queue.next_time()
+        delay = self.max_sleep
+        if next_time is not None:
+            delay = min(delay, max(0.0, next_time - time.time()))
+        self._deadline = time.time() + delay
+        self._after_id = self.root.after(int(delay * 1000) + 1, self._run)
+
+    def _run(self):
+        self._after_id = None
+        # صف ممکن است پس از جایگزینی لیست کارها (مثلاً پاکسازی) از نو ساخته شده باشد
+        self._queue = self.todo_list.reminder_queue
+        self._queue.listener = self._on_queue_change
+        self.fire(self._queue.pop_due())
+        self._schedule()
+
+    def fire(self, task_ids):
+        tasks = [task for task in map(self.todo_list.get_task, task_ids) if task is not None]
+        if not tasks:
+            return
+        today = datetime.now().date()
+        if len(tasks) > self.MAX_INDIVIDUAL:
+            overdue = sum(1 for task in tasks if task.due < today)
+            message = f"{len(tasks)} کار سررسید شده است"
+            if overdue:
+                message += f" ({overdue} کار گذشته از موعد)"
+            self.notifier.notify("یادآوری کارها", message)
+            return
+        for task in tasks:
+            title = "گذشته از موعد" if task.due < today else "سررسید امروز"
+            self.notifier.notify(title, task.name)
@@ -0,0 +1,166 @@
+# search.py
+
+import bisect
+import re
+
+# یکسان‌سازی نویسه‌های عربی و فارسی، ارقام و حذف اعراب
+_TRANSLATION = {
+    ord("\u064a"): "ی",  # ي
+    ord("\u0649"): "ی",  # ى
+    ord("\u0643"): "ک",  # ك
+    ord("\u06c0"): "ه",  # ۀ
+    ord("\u0629"): "ه",  # ة
+    ord("\u0623"): "ا",  # أ
+    ord("\u0625"): "ا",  # إ
+    ord("\u0622"): "ا",  # آ
+    ord("\u200c"): " ",  # نیم‌فاصله
+    ord("\u200d"): None,
+    ord("\u0640"): None,  # کشیده
+}
+_TRANSLATION.update({ord(c): None for c in map(chr, range(0x064B, 0x0653))})  # اعراب
+_TRANSLATION[0x0670] = None
+_TRANSLATION.update({0x06F0 + i: str(i) for i in range(10)})  # ارقام فارسی
+_TRANSLATION.update({0x0660 + i: str(i) for i in range(10)})  # ارقام عربی
+
+_TOKEN_RE = re.compile(r"\w+")
+
+
+def normalize(text):
+    """متن را برای جستجو یکسان‌سازی می‌کند (ی/ک عربی، نیم‌فاصله، اعراب، ارقام)."""
+    return text.translate(_TRANSLATION).lower() if text else ""
+
+
+def tokenize(text):
+    """واژه‌های یکسان‌سازی شده متن را برمی‌گرداند."""
+    return _TOKEN_RE.findall(normalize(text))
+
+
+def task_tokens(task):
+    """مجموعه واژه‌های نام، توضیحات و یادداشت‌های یک کار."""
+    tokens = set(tokenize(task.name))
+    tokens.update(tokenize(task.description))
+    tokens.update(tokenize(task.notes))
+    return tokens
+
+
+class SearchIndex:
+    """ایندکس معکوس واژه‌ها به شناسه کارها با جستجوی پیشوندی.
+
+    واژگان به صورت مرتب نگه داشته می‌شود تا همه واژه‌های دارای یک پیشوند با
+    دو جستجوی دودویی پیدا شوند. ToDoList با add و remove ایندکس را همگام
+    نگه می‌دارد.
+
+    ساخت اولیه تدریجی است: کارهای داده شده ابتدا فقط در صف انتظار قرار
+    می‌گیرند و با build_step در دسته‌های کوچک (مثلاً با after در رابط کاربری)
+    ایندکس می‌شوند. search در صورت نیاز بقیه صف را همان لحظه ایندکس می‌کند.
+    """
+
+    def __init__(self, tasks=()):
+        self._postings = {}
+        self._tokens_by_id = {}
+        self._vocabulary = []
+        # واژه‌های تازه‌ای که هنوز در واژگان مرتب ادغام نشده‌اند
+        self._new_tokens = []
+        self._queue = list(tasks)
+        self._position = 0
+        self._pending = {task.task_id: task for task in self._queue}
+
+    def __len__(self):
+        return len(self._tokens_by_id) + len(self._pending)
+
+    @property
+    def ready(self):
+        """True اگر همه کارها ایندکس شده باشند."""
+        return not self._pending
+
+    def build_step(self, limit=1000):
+        """حداکثر limit کار از صف انتظار را ایندکس می‌کند؛ True یعنی ساخت تمام شده است."""
+        pending = self._pending
+        queue = self._queue
+        while limit > 0 and pending:
+            task = queue[self._position]
+            self._position += 1
+            # کارهایی که در این فاصله حذف یا جایگزین شده‌اند رد می‌شوند
+            if pending.get(task.task_id) is task:
+                del pending[task.task_id]
+                self._index(task)
+                limit -= 1
+        if not pending:
+            self._queue = []
+            self._position = 0
+        return not pending
+
+    def _index(self, task):
+        tokens = task_tokens(task)
+        self._tokens_by_id[task.task_id] = tokens
+        for token in tokens:
+            ids = self._postings.get(token)
+            if ids is None:
+                self._postings[token] = {task.task_id}
+                self._new_tokens.append(token)
+            else:
+                ids.add(task.task_id)
+
+    def _merge_new_tokens(self):
+        new_tokens = self._new_tokens
+        if not new_tokens:
+            return
+        if len(new_tokens) < 64:
+            for token in new_tokens:
+                bisect.insort(self._vocabulary, token)
+        else:
+            self._vocabulary.extend(new_tokens)
+            self._vocabulary.sort()
+        self._new_tokens = []
+
+    def add(self, task):
+        self._pending.pop(task.task_id, None)
+        self._index(task)
+
+    def remove(self, task):
+        if self._pending.pop(task.task_id, None) is not None:
+            return
+        tokens = self._tokens_by_id.pop(task.task_id, ())
+        for token in tokens:
+            ids = self._postings[token]
+            ids.discard(task.task_id)
+            if not ids:
+                del self._postings[token]
+                self._merge_new_tokens()
+                i = bisect.bisect_left(self._vocabulary, token)
+                del self._vocabulary[i]
+
+    def update(self, old_task, new_task):
+        self.remove(old_task)
+        self.add(new_task)
+
+    def _prefix_ids(self, prefix):
+        """شناسه کارهایی که واژه‌ای با پیشوند prefix دارند."""
+        vocabulary = self._vocabulary
+        start = bisect.bisect_left(vocabulary, prefix)
+        end = bisect.bisect_left(vocabulary, prefix + "\U0010ffff", start)
+        if end - start == 1:
+            return self._postings[vocabulary[start]]
+        ids = set()
+        for token in vocabulary[start:end]:
+            ids.update(self._postings[token])
+        return ids
+
+    def search(self, query):
+        """شناسه کارهایی که همه واژه‌های query (به عنوان پیشوند) را دارند.
+
+        برای پرس‌وجوی خالی None برمی‌گرداند (یعنی بدون فیلتر).
+        """
+        terms = sorted(set(tokenize(query)), key=len, reverse=True)
+        if not terms:
+            return None
+        self.build_step(len(self._pending))
+        self._merge_new_tokens()
+        # واژه‌های بلندتر معمولاً نتیجه کمتری دارند؛ اشتراک از آن‌ها شروع می‌شود
+        result = None
+        for term in terms:
+            ids = self._prefix_ids(term)
+            result = set(ids) if result is None else result & ids
+            if not result:
+                break
+        return result
@@ -0,0 +1,224 @@
+# smartlists.py
+
+import json
+import os
+from datetime import date, datetime, timedelta
+
+from .tags import TagQuery
+
+# نام فایل تعریف لیست‌های هوشمند (کنار فایل کارها)
+SMART_LISTS_FILE = "smart_lists.json"
+
+# شرط‌های نسبی سررسید؛ این لیست‌ها با عوض شدن روز دوباره ارزیابی می‌شوند
+DUE_RULES = ("overdue", "today", "week", "none", "any")
+
+DEFAULT_SMART_LISTS = [
+    {"name": "گذشته از موعد", "due": "overdue"},
+    {"name": "سررسید امروز", "due": "today", "status": "انجام نشده"},
+    {"name": "فوری کاری", "priority": "بالا", "category": "کاری", "status": "انجام نشده"},
+    {"name": "تکرارشونده", "recurring": True},
+]
+
+
+def _as_set(value):
+    if value is None or value == "":
+        return None
+    return {value} if isinstance(value, str) else set(value)
+
+
+class SmartList:
+    """یک لیست هوشمند: تعریف ذخیره شده و مجموعه شناسه کارهای منطبق.
+
+    کلیدهای تعریف: name، category، priority، status (یک مقدار یا لیست)،
+    due (یکی از DUE_RULES)، recurring (True/False) و tags (عبارت برچسب).
+    """
+
+    def __init__(self, definition):
+        self.definition = dict(definition)
+        self.name = self.definition["name"]
+        due = self.definition.get("due")
+        if due is not None and due not in DUE_RULES:
+            raise ValueError(f"شرط سررسید نامعتبر: {due}")
+        self.date_dependent = due in ("overdue", "today", "week")
+        self.ids = set()
+        self._fields = [
+            (field, values)
+            for field, values in (
+                ("category", _as_set(self.definition.get("category"))),
+                ("priority", _as_set(self.definition.get("priority"))),
+                ("status", _as_set(self.definition.get("status"))),
+            )
+            if values is not None
+        ]
+        self._recurring = self.definition.get("recurring")
+        tags = self.definition.get("tags")
+        self._tag_query = TagQuery(tags) if tags and tags.strip() else None
+        self._due = due
+        self._range = None
+
+    def set_today(self, today):
+        """بازه ordinal سررسید را برای شرط‌های نسبی از روی today محاسبه می‌کند."""
+        ordinal = today.toordinal()
+        if self._due == "overdue":
+            self._range = (None, ordinal - 1)
+        elif self._due == "today":
+            self._range = (ordinal, ordinal)
+        elif self._due == "week":
+            self._range = (ordinal, ordinal + 6)
+
+    def matches(self, task):
+        for field, values in self._fields:
+            if getattr(task, field) not in values:
+                return False
+        if self._recurring is not None and bool(task.is_recurring) != self._recurring:
+            return False
+        due = self._due
+        if due == "none":
+            if task.due is not None:
+                return False
+        elif due is not None:
+            if task.due is None:
+                return False
+            if self._range is not None:
+                if due == "overdue" and task.is_completed():
+                    return False
+                low, high = self._range
+                ordinal = task.due.toordinal()
+                if (low is not None and ordinal < low) or ordinal > high:
+                    return False
+        if self._tag_query is not None and not self._tag_query.matches(task.tags):
+            return False
+        return True
+
+
+class SmartLists:
+    """لیست‌های هوشمند به صورت نماهای مادی (materialized view).
+
+    نتیجه هر لیست یک بار ساخته و سپس مثل بقیه ایندکس‌ها با add، remove و
+    update همگام نگه داشته می‌شود؛ بنابراین باز کردن یک لیست یا خواندن
+    تعداد کارهای آن نیازی به پیمایش همه کارها ندارد. با عوض شدن روز
+    (refresh_day) فقط لیست‌هایی که شرط سررسید نسبی دارند دوباره ساخته می‌شوند.
+    """
+
+    def __init__(self, definitions, tasks=(), today=None):
+        self.today = today or date.today()
+        self._lists = {}
+        for definition in definitions:
+            try:
+                self._add_list(SmartList(definition))
+            except (KeyError, ValueError) as e:
+                print(f"خطا در تعریف لیست هوشمند: {e}")
+        self._rebuild(self._lists.values(), tasks)
+
+    def __iter__(self):
+        return iter(self._lists.values())
+
+    def __contains__(self, name):
+        return name in self._lists
+
+    def _add_list(self, smart_list):
+        smart_list.set_today(self.today)
+        self._lists[smart_list.name] = smart_list
+
+    @staticmethod
+    def _rebuild(smart_lists, tasks):
+        smart_lists = list(smart_lists)
+        for smart_list in smart_lists:
+            smart_list.ids = set()
+        # یک پیمایش برای همه لیست‌ها
+        for task in tasks:
+            for smart_list in smart_lists:
+                if smart_list.matches(task):
+                    smart_list.ids.add(task.task_id)
+
+    # ---------- نگهداری ----------
+
+    def add(self, task):
+        for smart_list in self._lists.values():
+            if smart_list.matches(task):
+                smart_list.ids.add(task.task_id)
+
+    def remove(self, task):
+        for smart_list in self._lists.values():
+            smart_list.ids.discard(task.task_id)
+
+    def update(self, old_task, new_task):
+        for smart_list in self._lists.values():
+            if smart_list.matches(new_task):
+                smart_list.ids.add(new_task.task_id)
+            else:
+                smart_list.ids.discard(old_task.task_id)
+
+    def refresh_day(self, tasks, today=None):
+        """پس از عوض شدن روز لیست‌های وابسته به تاریخ را دوباره می‌سازد.
+
+        نام لیست‌های بازسازی شده را برمی‌گرداند (خالی اگر روز عوض نشده باشد).
+        """
+        today = today or date.today()
+        if today == self.today:
+            return []
+        self.today = today
+        stale = [smart_list for smart_list in self._lists.values() if smart_list.date_dependent]
+        for smart_list in stale:
+            smart_list.set_today(today)
+        self._rebuild(stale, tasks)
+        return [smart_list.name for smart_list in stale]
+
+    # ---------- تعریف‌ها ----------
+
+    def define(self, definition, tasks):
+        """یک لیست هوشمند را اضافه یا جایگزین کرده و نتیجه‌اش را می‌سازد."""
+        smart_list = SmartList(definition)
+        self._add_list(smart_list)
+        self._rebuild([smart_list], tasks)
+        return smart_list
+
+    def remove_list(self, name):
+        return self._lists.pop(name, None) is not None
+
+    def definitions(self):
+        return [smart_list.definition for smart_list in self._lists.values()]
+
+    # ---------- پرس‌وجو ----------
+
+    def names(self):
+        return list(self._lists)
+
+    def ids(self, name):
+        return self._lists[name].ids
+
+    def counts(self):
+        """تعداد کارهای هر لیست (بدون پیمایش کارها)."""
+        return {name: len(smart_list.ids) for name, smart_list in self._lists.items()}
+
+
+def definitions_path(tasks_filename):
+    return os.path.join(os.path.dirname(os.path.abspath(tasks_filename)), SMART_LISTS_FILE)
+
+
+def load_definitions(path):
+    """تعریف‌های ذخیره شده یا لیست‌های پیش‌فرض اگر فایلی وجود نداشته باشد."""
+    if not os.path.exists(path):
+        return [dict(definition) for definition in DEFAULT_SMART_LISTS]
+    try:
+        with open(path, encoding="utf-8") as file:
+            definitions = json.load(file)
+        return [definition for definition in definitions if definition.get("name")]
+    except (OSError, ValueError, AttributeError) as e:
+        print(f"خطا در خواندن لیست‌های هوشمند: {e}")
+        return [dict(definition) for definition in DEFAULT_SMART_LISTS]
+
+
+def save_definitions(path, definitions):
+    try:
+        with open(path, mode="w", encoding="utf-8") as file:
+            json.dump(definitions, file, ensure_ascii=False, indent=2)
+    except OSError as e:
+        print(f"خطا در ذخیره لیست‌های هوشمند: {e}")
+
+
+def seconds_until_tomorrow(now=None):
+    """ثانیه‌های باقی‌مانده تا آغاز روز بعد (برای زمان‌بندی refresh_day)."""
+    now = now or datetime.now()
+    midnight = datetime.combine(now.date() + timedelta(days=1), datetime.min.time())
+    return (midnight - now).total_seconds()
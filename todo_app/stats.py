@@ -0,0 +1,172 @@
+# stats.py
+
+from collections import Counter
+from datetime import date
+
+# نتیجه نمونه‌های کارهای تکرارشونده
+ON_TIME = "on_time"
+LATE = "late"
+OPEN = "open"
+
+
+def _completion_day(task):
+    """ordinal روز انجام کار یا None (انجام نشده یا بدون تاریخ انجام)."""
+    if not task.is_completed() or task.completed_at is None:
+        return None
+    return task.completed_at.date().toordinal()
+
+
+def _month_index(ordinal):
+    day = date.fromordinal(ordinal)
+    return day.year * 12 + day.month - 1
+
+
+class TaskStats:
+    """شمارنده‌های آماری کارها که با هر تغییر به‌روز می‌شوند.
+
+    سهم هر کار (کلیدهایی که در شمارنده‌ها یک واحد به آن‌ها اضافه کرده) به
+    ازای شناسه‌اش نگه داشته می‌شود؛ بنابراین update و remove فقط همان کلیدها
+    را کم می‌کنند، حتی وقتی کار در جا تغییر کرده باشد (toggle_task). پرس‌وجوها
+    روی کلیدهای شمارنده‌ها (روزها، دسته‌بندی‌ها) انجام می‌شوند نه روی کارها.
+    آمار فقط کارهای موجود در لیست را در بر می‌گیرد؛ کارهای پاکسازی شده حذف می‌شوند.
+
+    شمارنده‌ها:
+      done: ordinal روز انجام -> تعداد کارهای انجام شده در آن روز
+      open: (دسته‌بندی، اولویت) -> تعداد کارهای انجام نشده
+      overdue: ordinal -> تغییر تعداد کارهای گذشته از موعد از آن روز (+۱ روز بعد از
+               سررسید، -۱ روز انجام)؛ مجموع پیشوندی، تعداد پایان هر روز است
+      recurring: (ordinal سررسید، نتیجه) -> تعداد نمونه‌های کارهای تکرارشونده
+    """
+
+    KINDS = ("done", "open", "overdue", "recurring")
+
+    def __init__(self, tasks=()):
+        self._counters = {kind: Counter() for kind in self.KINDS}
+        self._contributions = {}
+        # با هر تغییر زیاد می‌شود (برای نامعتبر کردن نتیجه‌های نگهداری شده)
+        self.version = 0
+        for task in tasks:
+            self.add(task)
+
+    def __len__(self):
+        return len(self._contributions)
+
+    @staticmethod
+    def _keys(task):
+        keys = []
+        done = _completion_day(task)
+        due = task.due.toordinal() if task.due is not None else None
+        if done is not None:
+            keys.append(("done", done))
+        if not task.is_completed():
+            keys.append(("open", (task.category, task.priority)))
+        if due is not None:
+            # در پایان روز D گذشته از موعد است اگر due < D و تا پایان D انجام نشده باشد
+            if done is None and not task.is_completed():
+                keys.append(("overdue", (due + 1, 1)))
+            elif done is not None and done > due + 1:
+                keys.append(("overdue", (due + 1, 1)))
+                keys.append(("overdue", (done, -1)))
+            if task.is_recurring:
+                if not task.is_completed():
+                    outcome = OPEN
+                elif done is None or done <= due:
+                    outcome = ON_TIME
+                else:
+                    outcome = LATE
+                keys.append(("recurring", (due, outcome)))
+        return tuple(keys)
+
+    def add(self, task):
+        if task.task_id in self._contributions:
+            self.remove(task)
+        keys = self._keys(task)
+        self._contributions[task.task_id] = keys
+        counters = self._counters
+        for kind, key in keys:
+            counters[kind][key] += 1
+        self.version += 1
+
+    def remove(self, task):
+        keys = self._contributions.pop(task.task_id, None)
+        if keys is None:
+            return
+        counters = self._counters
+        for kind, key in keys:
+            counter = counters[kind]
+            counter[key] -= 1
+            if not counter[key]:
+                del counter[key]
+        self.version += 1
+
+    def update(self, old_task, new_task):
+        self.remove(old_task)
+        self.add(new_task)
+
+    # ---------- پرس‌وجو ----------
+
+    def completion_series(self, start, end):
+        """تعداد کارهای انجام شده در هر روز از start تا end (date، شامل)."""
+        done = self._counters["done"]
+        return [done.get(ordinal, 0) for ordinal in range(start.toordinal(), end.toordinal() + 1)]
+
+    def open_by_category(self):
+        """{دسته‌بندی: {اولویت: تعداد کارهای انجام نشده}}"""
+        result = {}
+        for (category, priority), count in self._counters["open"].items():
+            result.setdefault(category, {})[priority] = count
+        return result
+
+    def overdue_series(self, start, end):
+        """تعداد کارهای گذشته از موعد در پایان هر روز از start تا end (شامل)."""
+        first, last = start.toordinal(), end.toordinal()
+        deltas = Counter()
+        level = 0
+        for (ordinal, delta), count in self._counters["overdue"].items():
+            if ordinal <= first:
+                level += delta * count
+            elif ordinal <= last:
+                deltas[ordinal] += delta * count
+        series = []
+        for ordinal in range(first, last + 1):
+            if ordinal != first:
+                level += deltas.get(ordinal, 0)
+            series.append(level)
+        return series
+
+    def recurring_adherence(self, today, months=6):
+        """[(ماه به صورت (سال، ماه)، به موقع، با تأخیر، از دست رفته)] برای months ماه اخیر.
+
+        نمونه‌های انجام نشده‌ای که سررسیدشان گذشته «از دست رفته» حساب می‌شوند و
+        نمونه‌های آینده در نظر گرفته نمی‌شوند.
+        """
+        current = today.year * 12 + today.month - 1
+        first = current - months + 1
+        today_ordinal = today.toordinal()
+        rows = {month: [0, 0, 0] for month in range(first, current + 1)}
+        for (due, outcome), count in self._counters["recurring"].items():
+            row = rows.get(_month_index(due))
+            if row is None:
+                continue
+            if outcome == ON_TIME:
+                row[0] += count
+            elif outcome == LATE:
+                row[1] += count
+            elif due < today_ordinal:
+                row[2] += count
+        result = []
+        for month, row in sorted(rows.items()):
+            year, month = divmod(month, 12)
+            result.append(((year, month + 1), *row))
+        return result
+
+    def summary(self, today):
+        """تعداد کل، انجام نشده، انجام شده و گذشته از موعد (امروز)."""
+        open_count = sum(self._counters["open"].values())
+        overdue = self.overdue_series(today, today)[0]
+        return {
+            "total": len(self._contributions),
+            "open": open_count,
+            "completed": len(self._contributions) - open_count,
+            "overdue": overdue,
+        }
@@ -0,0 +1,589 @@
+# storage.py
+
+import atexit
+import csv
+import os
+import json
+import sqlite3
+import threading
+import time
+
+
+# ستون‌های فرمت کامل فایل CSV (فرمت snapshot)
+CSV_HEADER = [
+    "TaskID", "Name", "Description", "Priority", "Status",
+    "CompletionDate", "DueDate", "Category", "ParentID", "SubtaskOrder",
+    "IsRecurring", "RecurrenceType", "RecurrenceInterval",
+    "RecurrenceWeekdays", "RecurrenceEndDate", "Notes", "Tags",
+    "SeriesID", "SeriesStart",
+]
+
+# تعداد ستون‌های ثابت فرمت کامل؛ ستون‌های بعدی (Tags و ستون‌های سری تکرار) بعداً اضافه شده‌اند
+# و در فایل‌های قدیمی‌تر وجود ندارند
+BASE_COLUMNS = 16
+
+
+def _write_rows_atomic(filename, rows):
+    """ردیف‌ها را ابتدا در یک فایل موقت نوشته و سپس آن را جایگزین فایل اصلی می‌کند."""
+    temp_path = filename + ".tmp"
+    with open(temp_path, mode="w", newline="", encoding="utf-8-sig") as file:
+        writer = csv.writer(file)
+        writer.writerow(CSV_HEADER)
+        writer.writerows(rows)
+        file.flush()
+        os.fsync(file.fileno())
+    os.replace(temp_path, filename)
+
+
+class CsvStorage:
+    """ذخیره‌سازی کل لیست کارها در یک فایل CSV؛ هر تغییر کل فایل را بازنویسی می‌کند."""
+
+    # این نوع ذخیره‌سازی تغییرات تکی را ثبت نمی‌کند و همیشه کل لیست را می‌نویسد
+    incremental = False
+
+    def __init__(self, filename):
+        self.filename = filename
+        # اگر True باشد، پس از بارگذاری باید یک snapshot کامل نوشته شود
+        self.requires_snapshot = False
+        # هدر فایل خوانده شده در load_rows (None یعنی ترتیب ستون‌ها معلوم نیست)
+        self.header = None
+
+    def load_rows(self):
+        """ردیف‌های داده فایل CSV (بدون هدر) را برمی‌گرداند و هدر را در self.header نگه می‌دارد."""
+        self.header = None
+        if not os.path.exists(self.filename):
+            return []
+        with open(self.filename, mode="r", newline="", encoding="utf-8-sig") as file:
+            reader = csv.reader(file)
+            self.header = next(reader, None)
+            return [row for row in reader if row]
+
+    def iter_rows(self):
+        """مثل load_rows اما ردیف‌ها را به صورت جریانی (برای بارگذاری تدریجی) برمی‌گرداند.
+
+        هدر پیش از بازگشت خوانده می‌شود؛ فایل با پایان پیمایش بسته می‌شود.
+        """
+        self.header = None
+        if not os.path.exists(self.filename):
+            return iter(())
+        file = open(self.filename, mode="r", newline="", encoding="utf-8-sig")
+        reader = csv.reader(file)
+        self.header = next(reader, None)
+
+        def rows():
+            with file:
+                for row in reader:
+                    if row:
+                        yield row
+
+        return rows()
+
+    def save(self, rows):
+        """ردیف همه کارها (خروجی Task.to_list، به ترتیب داده شده) را در فایل CSV می‌نویسد.
+
+        ذخیره‌سازی‌ها ردیف می‌گیرند نه خود کارها: ردیف‌ها در رشته‌ای که کارها را
+        تغییر می‌دهد ساخته می‌شوند و رشته‌های پس‌زمینه به کارهای زنده دست نمی‌زنند.
+        """
+        _write_rows_atomic(self.filename, rows)
+
+    def record(self, changed=(), removed=()):
+        """این نوع ذخیره‌سازی تغییرات تکی را ثبت نمی‌کند (incremental = False)؛ هر تغییر
+        با save ذخیره می‌شود. False یعنی فشرده‌سازی لازم نیست."""
+        return False
+
+    def compact_async(self, rows):
+        """فشرده‌سازی برای این نوع ذخیره‌سازی معنایی ندارد."""
+
+    def flush(self):
+        """تغییرات در انتظار را روی دیسک می‌نویسد."""
+
+    def close(self):
+        """منابع باز را آزاد می‌کند."""
+
+
+class JournalStorage(CsvStorage):
+    """ذخیره‌سازی ژورنالی: هر تغییر به انتهای یک فایل لاگ اضافه می‌شود.
+
+    فایل CSV اصلی نقش snapshot را دارد و در زمان بارگذاری، رکوردهای ژورنال
+    روی آن اعمال می‌شوند. وقتی حجم ژورنال از آستانه گذشت، یک snapshot تازه
+    در پس‌زمینه نوشته و ژورنال کوتاه می‌شود.
+    """
+
+    incremental = True
+
+    def __init__(self, filename, compact_threshold=1024 * 1024, fsync=True):
+        super().__init__(filename)
+        self.journal_path = filename + ".journal"
+        self.old_journal_path = self.journal_path + ".old"
+        self.compact_threshold = compact_threshold
+        self.fsync = fsync
+        self._lock = threading.Lock()
+        self._journal = None
+        self._journal_size = 0
+        self._compactor = None
+
+    # ---------- بارگذاری ----------
+
+    def iter_rows(self):
+        # ژورنال‌ها باید روی کل snapshot اعمال شوند
+        return iter(self.load_rows())
+
+    def load_rows(self):
+        """snapshot را خوانده و ژورنال‌ها را به ترتیب روی آن اعمال می‌کند."""
+        rows = super().load_rows()
+
+        # ردیف‌های فرمت قدیمی شناسه ندارند؛ باید با شناسه‌های تازه بازنویسی شوند
+        if any(len(row) < BASE_COLUMNS for row in rows):
+            self.requires_snapshot = True
+
+        positions = {
+            row[0]: i for i, row in enumerate(rows) if len(row) >= BASE_COLUMNS
+        }
+        replayed = False
+        for path in (self.old_journal_path, self.journal_path):
+            for record in self._read_journal(path):
+                replayed = True
+                if record.get("op") == "put":
+                    row = record["row"]
+                    position = positions.get(row[0])
+                    if position is None:
+                        positions[row[0]] = len(rows)
+                        rows.append(row)
+                    else:
+                        rows[position] = row
+                elif record.get("op") == "del":
+                    for task_id in record["ids"]:
+                        position = positions.pop(task_id, None)
+                        if position is not None:
+                            rows[position] = None
+
+        # ژورنال قدیمی یعنی فشرده‌سازی قبلی کامل نشده است
+        if os.path.exists(self.old_journal_path):
+            self.requires_snapshot = True
+
+        # ردیف‌های ژورنال همیشه به ترتیب CSV_HEADER هستند؛ اگر snapshot ترتیب
+        # دیگری داشته باشد، فرمت هر ردیف باید جداگانه تشخیص داده شود
+        if replayed:
+            self.header = CSV_HEADER if self.header in (None, CSV_HEADER) else None
+
+        self._journal_size = (
+            os.path.getsize(self.journal_path) if os.path.exists(self.journal_path) else 0
+        )
+        return [row for row in rows if row is not None]
+
+    def _read_journal(self, path):
+        """رکوردهای سالم یک فایل ژورنال را تولید می‌کند."""
+        if not os.path.exists(path):
+            return
+        with open(path, mode="r", encoding="utf-8") as file:
+            for line in file:
+                try:
+                    yield json.loads(line)
+                except ValueError:
+                    # خط ناقص (مثلاً به دلیل قطع برق هنگام نوشتن) نادیده گرفته می‌شود
+                    continue
+
+    # ---------- ثبت تغییرات ----------
+
+    def record(self, changed=(), removed=()):
+        """ردیف‌های تغییر یافته (changed) و شناسه‌های حذف شده را به ژورنال اضافه می‌کند
+        و اعلام می‌کند آیا فشرده‌سازی لازم است."""
+        lines = [
+            json.dumps({"op": "put", "row": row}, ensure_ascii=False)
+            for row in changed
+        ]
+        if removed:
+            lines.append(json.dumps({"op": "del", "ids": list(removed)}, ensure_ascii=False))
+        if not lines:
+            return False
+
+        data = "".join(line + "\n" for line in lines)
+        with self._lock:
+            if self._journal is None:
+                self._journal = open(self.journal_path, mode="a", encoding="utf-8")
+            self._journal.write(data)
+            self._journal.flush()
+            if self.fsync:
+                os.fsync(self._journal.fileno())
+            self._journal_size += len(data.encode("utf-8"))
+            return self._journal_size >= self.compact_threshold
+
+    # ---------- فشرده‌سازی ----------
+
+    def compact_async(self, rows):
+        """ژورنال فعلی را کنار گذاشته و snapshot تازه (rows) را در پس‌زمینه می‌نویسد."""
+        if self._compactor is not None and self._compactor.is_alive():
+            return
+        with self._lock:
+            self._close_journal()
+            if os.path.exists(self.old_journal_path):
+                # فشرده‌سازی قبلی ناموفق بوده؛ ژورنال قدیمی پیش از ژورنال فعلی قرار
+                # می‌گیرد و snapshot دوباره نوشته می‌شود
+                try:
+                    self._merge_into_old_journal()
+                except OSError as e:
+                    print(f"خطا در فشرده‌سازی ژورنال: {e}")
+                    return
+            if os.path.exists(self.journal_path):
+                os.replace(self.journal_path, self.old_journal_path)
+            self._journal_size = 0
+
+        # نوشتن CSV و fsync در پس‌زمینه انجام می‌شود
+        self._compactor = threading.Thread(
+            target=self._compact, args=(rows,), name="journal-compactor"
+        )
+        self._compactor.start()
+
+    def _merge_into_old_journal(self):
+        """رکوردهای ژورنال فعلی را به انتهای ژورنال قدیمی منتقل می‌کند.
+
+        اگر پیش از حذف ژورنال فعلی قطع شود، رکوردهایش دو بار بازخوانی می‌شوند
+        که چون آخرین رکورد هر کار همان رکورد تازه است، نتیجه را تغییر نمی‌دهد.
+        """
+        if not os.path.exists(self.journal_path):
+            return
+        with open(self.old_journal_path, mode="ab") as old, open(self.journal_path, mode="rb") as current:
+            old.write(current.read())
+            old.flush()
+            if self.fsync:
+                os.fsync(old.fileno())
+        os.remove(self.journal_path)
+
+    def _compact(self, rows):
+        try:
+            _write_rows_atomic(self.filename, rows)
+            os.remove(self.old_journal_path)
+        except Exception as e:
+            print(f"خطا در فشرده‌سازی ژورنال: {e}")
+
+    def save(self, rows):
+        """یک snapshot کامل را همزمان می‌نویسد و ژورنال‌ها را پاک می‌کند."""
+        self._wait_for_compactor()
+        with self._lock:
+            self._close_journal()
+            super().save(rows)
+            for path in (self.journal_path, self.old_journal_path):
+                if os.path.exists(path):
+                    os.remove(path)
+            self._journal_size = 0
+            self.requires_snapshot = False
+
+    def _wait_for_compactor(self):
+        if self._compactor is not None:
+            self._compactor.join()
+            self._compactor = None
+
+    def _close_journal(self):
+        if self._journal is not None:
+            self._journal.close()
+            self._journal = None
+
+    def close(self):
+        self._wait_for_compactor()
+        with self._lock:
+            self._close_journal()
+
+
+class SqliteStorage:
+    """ذخیره‌سازی در پایگاه داده SQLite با ایندکس روی ستون‌های پرکاربرد.
+
+    هر تغییر فقط ردیف‌های مربوط به همان کار را به‌روز می‌کند. در اولین اجرا،
+    فایل CSV موجود (با هر فرمتی) در یک تراکنش به پایگاه داده منتقل می‌شود.
+    """
+
+    incremental = True
+
+    # ستون‌هایی که جستجو و فیلتر بر اساس آن‌ها انجام می‌شود
+    INDEXED_COLUMNS = ("Status", "DueDate", "Category", "ParentID", "CompletionDate")
+
+    def __init__(self, filename, db_path=None):
+        self.filename = filename
+        self.db_path = db_path or os.path.splitext(filename)[0] + ".db"
+        self.requires_snapshot = False
+        self.header = CSV_HEADER
+        self._lock = threading.Lock()
+        self._conn = sqlite3.connect(self.db_path, check_same_thread=False)
+        self._conn.execute("PRAGMA journal_mode=WAL")
+        self._conn.execute("PRAGMA synchronous=NORMAL")
+        self._create_schema()
+
+        columns = ", ".join(f'"{name}"' for name in CSV_HEADER)
+        placeholders = ", ".join("?" for _ in CSV_HEADER)
+        updates = ", ".join(f'"{name}" = excluded."{name}"' for name in CSV_HEADER[1:])
+        self._select_sql = f"SELECT {columns} FROM tasks ORDER BY rowid"
+        self._insert_sql = f"INSERT INTO tasks ({columns}) VALUES ({placeholders})"
+        self._upsert_sql = (
+            f"{self._insert_sql} ON CONFLICT(\"TaskID\") DO UPDATE SET {updates}"
+        )
+
+    def _create_schema(self):
+        """جدول و ایندکس‌ها را در صورت نبود ایجاد می‌کند."""
+        with self._conn:
+            columns = ", ".join(
+                f'"{name}" TEXT PRIMARY KEY' if name == "TaskID" else f'"{name}" TEXT'
+                for name in CSV_HEADER
+            )
+            self._conn.execute(f"CREATE TABLE IF NOT EXISTS tasks ({columns})")
+            # پایگاه‌های داده ساخته شده با نسخه‌های قبلی ستون‌های جدیدتر را ندارند
+            existing = {row[1] for row in self._conn.execute("PRAGMA table_info(tasks)")}
+            for name in CSV_HEADER:
+                if name not in existing:
+                    self._conn.execute(f'ALTER TABLE tasks ADD COLUMN "{name}" TEXT DEFAULT \'\'')
+            for name in self.INDEXED_COLUMNS:
+                self._conn.execute(
+                    f'CREATE INDEX IF NOT EXISTS idx_tasks_{name.lower()} ON tasks ("{name}")'
+                )
+
+    def _user_version(self):
+        return self._conn.execute("PRAGMA user_version").fetchone()[0]
+
+    def iter_rows(self):
+        return iter(self.load_rows())
+
+    def load_rows(self):
+        """ردیف‌ها را از پایگاه داده (یا در اولین اجرا از فایل CSV) برمی‌گرداند."""
+        if self._user_version() == 0:
+            # اولین اجرا: داده‌ها از CSV خوانده و پس از ساخت کارها یکجا منتقل می‌شوند
+            csv_storage = CsvStorage(self.filename)
+            rows = csv_storage.load_rows()
+            self.header = csv_storage.header
+            if rows:
+                self.requires_snapshot = True
+            else:
+                with self._conn:
+                    self._conn.execute("PRAGMA user_version = 1")
+            return rows
+        self.header = CSV_HEADER
+        with self._lock:
+            return [list(row) for row in self._conn.execute(self._select_sql)]
+
+    def save(self, rows):
+        """ردیف همه کارها را در یک تراکنش جایگزین محتوای پایگاه داده می‌کند."""
+        with self._lock, self._conn:
+            self._conn.execute("DELETE FROM tasks")
+            self._conn.executemany(self._insert_sql, rows)
+            self._conn.execute("PRAGMA user_version = 1")
+        self.requires_snapshot = False
+
+    def record(self, changed=(), removed=()):
+        """فقط ردیف‌های تغییر یافته یا حذف شده را به‌روز می‌کند."""
+        with self._lock, self._conn:
+            if changed:
+                self._conn.executemany(self._upsert_sql, changed)
+            if removed:
+                self._conn.executemany(
+                    'DELETE FROM tasks WHERE "TaskID" = ?',
+                    [(task_id,) for task_id in removed],
+                )
+        return False
+
+    def compact_async(self, rows):
+        """پایگاه داده نیازی به فشرده‌سازی دستی ندارد."""
+
+    def flush(self):
+        """تغییرات بلافاصله commit می‌شوند؛ کاری برای انجام نیست."""
+
+    def close(self):
+        with self._lock:
+            self._conn.close()
+
+
+class DebouncedStorage:
+    """ذخیره‌سازی با تأخیر: درخواست‌های پشت سر هم در یک نوشتن ادغام می‌شوند.
+
+    تغییرات فقط علامت‌گذاری می‌شوند و یک رشته پس‌زمینه پس از یک دوره سکون
+    (delay ثانیه بدون تغییر جدید) آن‌ها را با ذخیره‌سازی داخلی می‌نویسد.
+    هنگام بستن برنامه و خروج مفسر، تغییرات در انتظار حتماً نوشته می‌شوند.
+    """
+
+    # فاصله تلاش دوباره پس از نوشتن ناموفق (ثانیه)
+    RETRY_DELAY = 5.0
+
+    def __init__(self, inner, delay=0.5):
+        self.inner = inner
+        self.delay = delay
+        self.incremental = inner.incremental
+
+        # آمار: تعداد درخواست‌ها، نوشتن‌های واقعی و درخواست‌های ادغام شده
+        self.requests = 0
+        self.writes = 0
+        self.coalesced = 0
+
+        self._cond = threading.Condition()
+        self._write_lock = threading.Lock()
+        self._pending_snapshot = None
+        self._pending_changed = {}
+        self._pending_removed = set()
+        self._last_request = 0.0
+        # پس از نوشتن ناموفق، تلاش دوباره تا این زمان (monotonic) عقب می‌افتد
+        self._retry_at = 0.0
+        self._needs_compaction = False
+        self._closed = False
+
+        self._thread = threading.Thread(
+            target=self._run, name="debounced-writer", daemon=True
+        )
+        self._thread.start()
+        atexit.register(self.flush)
+
+    @property
+    def requires_snapshot(self):
+        return self.inner.requires_snapshot
+
+    def __getattr__(self, name):
+        # بقیه متدهای ذخیره‌سازی داخلی پس از نوشتن تغییرات در انتظار اجرا
+        # می‌شوند تا وضعیت قدیمی را نبینند
+        attr = getattr(self.inner, name)
+        if not callable(attr):
+            return attr
+
+        def call(*args, **kwargs):
+            self.flush()
+            return attr(*args, **kwargs)
+
+        return call
+
+    def load_rows(self):
+        return self.inner.load_rows()
+
+    def iter_rows(self):
+        return self.inner.iter_rows()
+
+    # ---------- ثبت درخواست‌ها ----------
+
+    def _has_pending(self):
+        return (
+            self._pending_snapshot is not None
+            or bool(self._pending_changed)
+            or bool(self._pending_removed)
+        )
+
+    def _mark_dirty(self):
+        """باید با در اختیار داشتن self._cond صدا زده شود."""
+        self.requests += 1
+        if self._has_pending():
+            self.coalesced += 1
+        self._last_request = time.monotonic()
+
+    def save(self, rows):
+        """یک snapshot کامل را برای نوشتن بعدی علامت‌گذاری می‌کند."""
+        with self._cond:
+            self._mark_dirty()
+            # snapshot کامل همه تغییرات جزئی قبلی را پوشش می‌دهد
+            self._pending_snapshot = rows
+            self._pending_changed.clear()
+            self._pending_removed.clear()
+            self._cond.notify()
+
+    def record(self, changed=(), removed=()):
+        """تغییرات را با تغییرات در انتظار ادغام می‌کند (آخرین وضعیت هر کار)."""
+        with self._cond:
+            self._mark_dirty()
+            # ردیف‌ها وضعیت لحظه درخواست‌اند؛ تغییرات پس از یک snapshot در انتظار
+            # هم نگه داشته شده و بعد از آن نوشته می‌شوند
+            for row in changed:
+                self._pending_changed[row[0]] = row
+                self._pending_removed.discard(row[0])
+            for task_id in removed:
+                self._pending_changed.pop(task_id, None)
+                self._pending_removed.add(task_id)
+            self._cond.notify()
+            needs_compaction = self._needs_compaction
+            self._needs_compaction = False
+            return needs_compaction
+
+    def compact_async(self, rows):
+        self.inner.compact_async(rows)
+
+    # ---------- نوشتن ----------
+
+    def _run(self):
+        while True:
+            with self._cond:
+                while not self._has_pending() and not self._closed:
+                    self._cond.wait()
+                if self._closed:
+                    return
+                # صبر تا زمانی که در delay ثانیه هیچ درخواست جدیدی نیاید
+                while not self._closed:
+                    remaining = (
+                        max(self._last_request + self.delay, self._retry_at) - time.monotonic()
+                    )
+                    if remaining <= 0:
+                        break
+                    self._cond.wait(remaining)
+            self.flush()
+
+    def flush(self):
+        """تغییرات در انتظار را همین حالا و در رشته فراخوان می‌نویسد.
+
+        اگر نوشتن ناموفق باشد، تغییرات دوباره در صف قرار می‌گیرند (زیر تغییرات
+        تازه‌تری که در این فاصله رسیده‌اند) و پس از RETRY_DELAY ثانیه دوباره
+        نوشته می‌شوند.
+        """
+        with self._write_lock:
+            with self._cond:
+                snapshot = self._pending_snapshot
+                changed = list(self._pending_changed.values())
+                removed = list(self._pending_removed)
+                self._pending_snapshot = None
+                self._pending_changed.clear()
+                self._pending_removed.clear()
+            if snapshot is None and not changed and not removed:
+                return
+
+            try:
+                if snapshot is not None:
+                    self.inner.save(snapshot)
+                    snapshot = None
+                if (changed or removed) and self.inner.record(changed, removed):
+                    with self._cond:
+                        self._needs_compaction = True
+                self.writes += 1
+            except Exception as e:
+                print(f"خطا در ذخیره فایل: {e}")
+                self._requeue(snapshot, changed, removed)
+
+    def _requeue(self, snapshot, changed, removed):
+        """تغییرات نوشته نشده را به صف برمی‌گرداند مگر snapshot تازه‌تری آن‌ها را پوشش دهد."""
+        with self._cond:
+            if snapshot is not None and self._pending_snapshot is None:
+                self._pending_snapshot = snapshot
+            elif snapshot is not None:
+                return
+            for row in changed:
+                if row[0] not in self._pending_changed and row[0] not in self._pending_removed:
+                    self._pending_changed[row[0]] = row
+            for task_id in removed:
+                if task_id not in self._pending_changed:
+                    self._pending_removed.add(task_id)
+            self._retry_at = time.monotonic() + self.RETRY_DELAY
+            self._cond.notify()
+
+    def close(self):
+        with self._cond:
+            self._closed = True
+            self._cond.notify()
+        self._thread.join()
+        self.flush()
+        atexit.unregister(self.flush)
+        self.inner.close()
+
+
+def create_storage(filename, kind=None, save_delay=None):
+    """نوع ذخیره‌سازی را بر اساس نام یا متغیرهای محیطی TODO_STORAGE و TODO_SAVE_DELAY می‌سازد."""
+    kind = (kind or os.environ.get("TODO_STORAGE") or "csv").lower()
+    if kind == "journal":
+        storage = JournalStorage(filename)
+    elif kind == "sqlite":
+        storage = SqliteStorage(filename)
+    elif kind == "csv":
+        storage = CsvStorage(filename)
+    else:
+        raise ValueError(f"نوع ذخیره‌سازی نامعتبر: {kind}")
+
+    if save_delay is None:
+        save_delay = float(os.environ.get("TODO_SAVE_DELAY") or 0)
+    if save_delay > 0:
+        storage = DebouncedStorage(storage, delay=save_delay)
+    return storage
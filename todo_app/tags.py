@@ -0,0 +1,232 @@
+# tags.py
+
+import re
+import sys
+
+# جداکننده‌های برچسب در ورودی کاربر و در ستون Tags فایل
+_SEPARATORS = re.compile(r"[,،]")
+
+
+def parse_tags(value):
+    """برچسب‌ها را از رشته (جدا شده با کاما) یا یک مجموعه به tuple یکتا تبدیل می‌کند.
+
+    ترتیب ورود حفظ می‌شود و رشته‌ها intern می‌شوند تا بین کارها مشترک باشند.
+    """
+    if not value:
+        return ()
+    items = _SEPARATORS.split(value) if isinstance(value, str) else value
+    tags = []
+    for item in items:
+        tag = item.strip()
+        if tag and tag not in tags:
+            tags.append(sys.intern(tag))
+    return tuple(tags)
+
+
+def format_tags(tags):
+    """نمایش برچسب‌ها برای ستون Tags فایل."""
+    return ",".join(tags)
+
+
+class TagIndex:
+    """ایندکس bitmap برچسب‌ها.
+
+    هر کار یک شماره ترتیبی فشرده (ordinal) می‌گیرد و هر برچسب یک عدد صحیح
+    Python است که بیت ordinal کارهای دارای آن برچسب در آن روشن است. ordinal
+    کارهای حذف شده دوباره استفاده می‌شود تا bitmapها کوچک بمانند؛ بنابراین
+    AND، OR و NOT روی برچسب‌ها به چند عملیات بیتی روی اعداد تبدیل می‌شوند.
+    """
+
+    def __init__(self, tasks=()):
+        self._ordinals = {}
+        self._ids = []
+        self._free = []
+        self._bitmaps = {}
+        self._tags_by_id = {}
+        # bitmap همه کارهای موجود (برای NOT)
+        self.universe = 0
+        for task in tasks:
+            self.add(task)
+
+    def __len__(self):
+        return len(self._ordinals)
+
+    def add(self, task):
+        task_id = task.task_id
+        ordinal = self._ordinals.get(task_id)
+        if ordinal is None:
+            if self._free:
+                ordinal = self._free.pop()
+                self._ids[ordinal] = task_id
+            else:
+                ordinal = len(self._ids)
+                self._ids.append(task_id)
+            self._ordinals[task_id] = ordinal
+            self.universe |= 1 << ordinal
+        bit = 1 << ordinal
+        self._tags_by_id[task_id] = task.tags
+        for tag in task.tags:
+            self._bitmaps[tag] = self._bitmaps.get(tag, 0) | bit
+
+    def _clear_tags(self, task_id, bit):
+        for tag in self._tags_by_id.pop(task_id, ()):
+            bitmap = self._bitmaps[tag] & ~bit
+            if bitmap:
+                self._bitmaps[tag] = bitmap
+            else:
+                del self._bitmaps[tag]
+
+    def remove(self, task):
+        ordinal = self._ordinals.pop(task.task_id, None)
+        if ordinal is None:
+            return
+        bit = 1 << ordinal
+        self._clear_tags(task.task_id, bit)
+        self.universe &= ~bit
+        self._ids[ordinal] = None
+        self._free.append(ordinal)
+
+    def update(self, old_task, new_task):
+        """برچسب‌های کار را با همان ordinal به‌روز می‌کند."""
+        ordinal = self._ordinals.get(old_task.task_id)
+        if ordinal is None:
+            self.add(new_task)
+            return
+        self._clear_tags(old_task.task_id, 1 << ordinal)
+        self.add(new_task)
+
+    # ---------- پرس‌وجو ----------
+
+    def tags(self):
+        """برچسب‌های موجود همراه با تعداد کارها."""
+        return {tag: bin(bitmap).count("1") for tag, bitmap in self._bitmaps.items()}
+
+    def bitmap(self, tag):
+        return self._bitmaps.get(tag, 0)
+
+    def ids(self, bitmap):
+        """شناسه کارهای متناظر با بیت‌های روشن bitmap."""
+        ids = self._ids
+        bits = bin(bitmap)[:1:-1]
+        result = set()
+        position = bits.find("1")
+        while position != -1:
+            result.add(ids[position])
+            position = bits.find("1", position + 1)
+        return result
+
+    def query(self, expression):
+        """شناسه کارهای منطبق بر یک عبارت برچسب (مثلاً «فوری & !خانه | (کار و مهم)»)."""
+        return self.ids(TagQuery(expression).evaluate(self))
+
+
+class TagQuery:
+    """تجزیه عبارت‌های بولی برچسب.
+
+    عملگرها: «&» یا «and» یا «و» (پیش‌فرض بین دو برچسب پشت سر هم)،
+    «|» یا «or» یا «یا»، «!» یا «-» یا «not» یا «نه»، و پرانتز. برچسب‌های
+    دارای فاصله را می‌توان داخل گیومه ("...") نوشت.
+    """
+
+    _TOKEN_RE = re.compile(r'\s*(?:"([^"]*)"|(\(|\)|&|\||!|-(?=\S))|([^\s()&|!"]+))')
+    AND_WORDS = ("and", "و")
+    OR_WORDS = ("or", "یا")
+    NOT_WORDS = ("not", "نه")
+
+    def __init__(self, expression):
+        self.tokens = self._tokenize(expression)
+        self._pos = 0
+        self.tree = self._parse_or() if self.tokens else ("all",)
+        if self._pos != len(self.tokens):
+            raise ValueError(f"عبارت برچسب نامعتبر نزدیک «{self.tokens[self._pos][1]}»")
+
+    def _tokenize(self, expression):
+        tokens = []
+        position = 0
+        expression = expression.strip()
+        while position < len(expression):
+            match = self._TOKEN_RE.match(expression, position)
+            if match is None or match.end() == position:
+                raise ValueError(f"عبارت برچسب نامعتبر: {expression}")
+            quoted, operator, word = match.groups()
+            if quoted is not None:
+                tokens.append(("tag", quoted.strip()))
+            elif operator is not None:
+                tokens.append(("op", "!" if operator == "-" else operator))
+            elif word.lower() in self.AND_WORDS:
+                tokens.append(("op", "&"))
+            elif word.lower() in self.OR_WORDS:
+                tokens.append(("op", "|"))
+            elif word.lower() in self.NOT_WORDS:
+                tokens.append(("op", "!"))
+            else:
+                tokens.append(("tag", word))
+            position = match.end()
+            while position < len(expression) and expression[position].isspace():
+                position += 1
+        return tokens
+
+    def _peek(self):
+        return self.tokens[self._pos] if self._pos < len(self.tokens) else (None, None)
+
+    def _parse_or(self):
+        node = self._parse_and()
+        while self._peek() == ("op", "|"):
+            self._pos += 1
+            node = ("or", node, self._parse_and())
+        return node
+
+    def _parse_and(self):
+        node = self._parse_not()
+        while True:
+            kind, value = self._peek()
+            if (kind, value) == ("op", "&"):
+                self._pos += 1
+            elif not (kind == "tag" or value in ("!", "(")):
+                return node
+            node = ("and", node, self._parse_not())
+
+    def _parse_not(self):
+        kind, value = self._peek()
+        if (kind, value) == ("op", "!"):
+            self._pos += 1
+            return ("not", self._parse_not())
+        if (kind, value) == ("op", "("):
+            self._pos += 1
+            node = self._parse_or()
+            if self._peek() != ("op", ")"):
+                raise ValueError("پرانتز بسته نشده است")
+            self._pos += 1
+            return node
+        if kind == "tag":
+            self._pos += 1
+            return ("tag", value)
+        raise ValueError(f"عبارت برچسب ناقص است ({value or 'پایان عبارت'})")
+
+    def matches(self, tags, node=None):
+        """آیا مجموعه برچسب‌های یک کار با عبارت منطبق است (بدون ایندکس)."""
+        node = node or self.tree
+        kind = node[0]
+        if kind == "tag":
+            return node[1] in tags
+        if kind == "not":
+            return not self.matches(tags, node[1])
+        if kind == "and":
+            return self.matches(tags, node[1]) and self.matches(tags, node[2])
+        if kind == "or":
+            return self.matches(tags, node[1]) or self.matches(tags, node[2])
+        return True
+
+    def evaluate(self, index, node=None):
+        """bitmap نتیجه عبارت روی TagIndex."""
+        node = node or self.tree
+        kind = node[0]
+        if kind == "tag":
+            return index.bitmap(node[1])
+        if kind == "not":
+            return index.universe & ~self.evaluate(index, node[1])
+        if kind == "and":
+            return self.evaluate(index, node[1]) & self.evaluate(index, node[2])
+        if kind == "or":
+            return self.evaluate(index, node[1]) | self.evaluate(index, node[2])
+        return index.universe
@@ -0,0 +1,167 @@
+# watchdog.py
+
+import logging
+import os
+import sys
+import threading
+import time
+import tkinter
+import traceback
+from collections import Counter
+
+# با مقدار 1 فعال می‌شود؛ یک عدد بزرگ‌تر از 1 آستانه کندی بر حسب میلی‌ثانیه است
+ENV_VAR = "TODO_WATCHDOG"
+# مسیر فایل لاگ (پیش‌فرض: خروجی خطا)
+LOG_ENV_VAR = "TODO_WATCHDOG_LOG"
+
+logger = logging.getLogger("todo_app.watchdog")
+
+PACKAGE_DIR = os.path.dirname(os.path.abspath(__file__))
+TKINTER_DIR = os.path.dirname(os.path.abspath(tkinter.__file__))
+
+
+def env_threshold():
+    """آستانه تعیین شده با TODO_WATCHDOG (ثانیه) یا None اگر غیرفعال باشد."""
+    value = os.environ.get(ENV_VAR, "").strip().lower()
+    if value in ("", "0", "false", "no", "off"):
+        return None
+    try:
+        number = float(value)
+    except ValueError:
+        return Watchdog.DEFAULT_THRESHOLD
+    return number / 1000 if number > 1 else Watchdog.DEFAULT_THRESHOLD
+
+
+def configure_logging(path=None):
+    """لاگ‌های watchdog را (با زمان) در فایل path یا خروجی خطا می‌نویسد."""
+    path = path or os.environ.get(LOG_ENV_VAR)
+    handler = logging.FileHandler(path, encoding="utf-8") if path else logging.StreamHandler()
+    handler.setFormatter(logging.Formatter("%(asctime)s %(levelname)s %(message)s"))
+    logger.addHandler(handler)
+    logger.setLevel(logging.INFO)
+    logger.propagate = False
+
+
+class Watchdog:
+    """پایش تأخیر حلقه رویداد Tk.
+
+    هر interval ثانیه یک ضربان با after() زمان‌بندی می‌شود. اگر ضربانی بیش از
+    threshold دیرتر از موعد اجرا شود، رشته اصلی در یک callback گیر کرده بوده
+    است. یک رشته کمکی در همین مدت از پشته رشته اصلی نمونه می‌گیرد تا
+    callback مقصر (تابعی که Tk صدا زده) و نقطه داغ آن همراه با تعداد کارها در لاگ
+    ثبت شوند.
+    """
+
+    DEFAULT_THRESHOLD = 0.2
+
+    def __init__(self, root, interval=0.05, threshold=DEFAULT_THRESHOLD,
+                 sample_interval=0.01, task_count=None, log=None):
+        self.root = root
+        self.interval = interval
+        self.threshold = threshold
+        self.sample_interval = sample_interval
+        self.task_count = task_count
+        self.log = log or logger
+
+        self.stalls = 0
+        self.worst = 0.0
+
+        self._main_ident = threading.main_thread().ident
+        self._lock = threading.Lock()
+        self._stop = threading.Event()
+        self._expected = None
+        self._samples = []
+        self._after_id = None
+        self._thread = None
+
+    # ---------- ضربان (رشته اصلی) ----------
+
+    def start(self):
+        self._stop.clear()
+        self._schedule()
+        self._thread = threading.Thread(target=self._sample_loop, name="ui-watchdog", daemon=True)
+        self._thread.start()
+
+    def stop(self):
+        self._stop.set()
+        if self._after_id is not None:
+            try:
+                self.root.after_cancel(self._after_id)
+            except Exception:
+                pass
+            self._after_id = None
+        if self._thread is not None:
+            self._thread.join(timeout=1)
+            self._thread = None
+
+    def _schedule(self):
+        self._expected = time.monotonic() + self.interval
+        self._after_id = self.root.after(int(self.interval * 1000), self._tick)
+
+    def _tick(self):
+        lateness = time.monotonic() - self._expected
+        with self._lock:
+            samples, self._samples = self._samples, []
+        if lateness > self.threshold:
+            self._report(lateness, samples)
+        if not self._stop.is_set():
+            self._schedule()
+
+    def _report(self, lateness, samples):
+        self.stalls += 1
+        self.worst = max(self.worst, lateness)
+        try:
+            count = self.task_count() if self.task_count else None
+        except Exception:
+            count = None
+
+        if not samples:
+            self.log.warning(
+                "کندی رابط کاربری: %.0f ms (کارها: %s) - نمونه‌ای از پشته گرفته نشد",
+                lateness * 1000, count,
+            )
+            return
+
+        callbacks = Counter(callback for callback, _, _ in samples)
+        hotspots = Counter(hotspot for _, hotspot, _ in samples)
+        callback, hits = callbacks.most_common(1)[0]
+        hotspot = hotspots.most_common(1)[0][0]
+        stack = samples[-1][2]
+        self.log.warning(
+            "کندی رابط کاربری: %.0f ms (کارها: %s) در %s [%d/%d نمونه]، نقطه داغ: %s\n%s",
+            lateness * 1000, count, callback, hits, len(samples), hotspot, stack,
+        )
+
+    # ---------- نمونه‌برداری (رشته کمکی) ----------
+
+    def _sample_loop(self):
+        while not self._stop.wait(self.sample_interval):
+            expected = self._expected
+            if expected is None or time.monotonic() - expected < self.threshold:
+                continue
+            frame = sys._current_frames().get(self._main_ident)
+            if frame is None:
+                continue
+            sample = self._describe(traceback.extract_stack(frame))
+            del frame
+            with self._lock:
+                self._samples.append(sample)
+
+    @staticmethod
+    def _describe(stack):
+        """(callback، نقطه داغ، متن پشته) را از پشته رشته اصلی استخراج می‌کند.
+
+        callback اولین فریم کد برنامه پس از آخرین CallWrapper.__call__ در
+        tkinter است (تابعی که Tk صدا زده) و نقطه داغ درونی‌ترین فریم پشته.
+        """
+        start = 0
+        for i, entry in enumerate(stack):
+            if entry.name == "__call__" and entry.filename.startswith(TKINTER_DIR):
+                start = i + 1
+        own = [entry for entry in stack[start:] if entry.filename.startswith(PACKAGE_DIR)]
+        entry = own[0] if own else stack[-1]
+        callback = f"{entry.name} ({os.path.basename(entry.filename)}:{entry.lineno})"
+        leaf = stack[-1]
+        hotspot = f"{leaf.name} ({os.path.basename(leaf.filename)}:{leaf.lineno})"
+        text = "".join(traceback.format_list(own[-8:] if own else stack[-8:])).rstrip()
+        return callback, hotspot, text